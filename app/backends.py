@@ -0,0 +1,352 @@
+"""
+Backends de almacenamiento para app/db.py
+Interfaz común con implementación MySQL (PyMySQL) y SQLite embebido
+"""
+import abc
+import os
+import sqlite3
+import threading
+import logging
+
+from utils.metrics import DB_CONNECTIONS
+
+logger = logging.getLogger(__name__)
+
+
+EMPLOYEE_COLUMNS = ('first_name', 'last_name', 'age', 'email', 'salary', 'department')
+
+
+class StorageBackend(abc.ABC):
+    """
+    Interfaz común de almacenamiento
+
+    Cada backend implementa las mismas operaciones que expone app/db.py.
+    """
+
+    name = 'base'
+
+    @abc.abstractmethod
+    def upsert_employees(self, employees):
+        """
+        Inserta o actualiza un lote de empleados (clave única: email)
+
+        Args:
+            employees (list): Lista de diccionarios con EMPLOYEE_COLUMNS
+
+        Returns:
+            int: Cantidad de registros procesados
+        """
+
+    @abc.abstractmethod
+    def insert_employee(self, first_name, last_name, age, email, salary, department):
+        """
+        Inserta o actualiza un empleado
+
+        Returns:
+            int: ID del registro insertado o actualizado
+        """
+
+    @abc.abstractmethod
+    def get_employee_by_email(self, email):
+        """
+        Returns:
+            dict: Empleado o None si no existe
+        """
+
+    @abc.abstractmethod
+    def get_all_employees(self):
+        """
+        Returns:
+            list: Empleados ordenados por id
+        """
+
+    @abc.abstractmethod
+    def test_connection(self):
+        """
+        Returns:
+            bool: True si el backend responde
+        """
+
+    def close(self):
+        """
+        Libera recursos del backend (no-op por defecto)
+        """
+
+
+class MySQLBackend(StorageBackend):
+    """
+    Backend MySQL mediante PyMySQL (una conexión por operación)
+    """
+
+    name = 'mysql'
+
+    UPSERT_QUERY = """
+        INSERT INTO employees (first_name, last_name, age, email, salary, department)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            first_name = VALUES(first_name),
+            last_name = VALUES(last_name),
+            age = VALUES(age),
+            salary = VALUES(salary),
+            department = VALUES(department)
+    """
+
+    def __init__(self):
+        import pymysql
+        self._pymysql = pymysql
+
+    def get_connection(self):
+        """
+        Crea y retorna una conexión a MySQL
+        """
+        pymysql = self._pymysql
+        try:
+            connection = pymysql.connect(
+                host=os.getenv('DB_HOST', 'localhost'),
+                port=int(os.getenv('DB_PORT', 3306)),
+                user=os.getenv('DB_USER'),
+                password=os.getenv('DB_PASSWORD'),
+                database=os.getenv('DB_NAME'),
+                charset='utf8mb4',
+                cursorclass=pymysql.cursors.DictCursor,
+                autocommit=False
+            )
+            logger.info("Conexión a MySQL establecida exitosamente")
+            return connection
+        except pymysql.Error as e:
+            logger.error(f"Error al conectar a MySQL: {e}")
+            raise
+
+    def _execute_write(self, rows):
+        connection = None
+        try:
+            connection = self.get_connection()
+            DB_CONNECTIONS.labels(self.name).inc()
+            cursor = connection.cursor()
+            if len(rows) == 1:
+                cursor.execute(self.UPSERT_QUERY, rows[0])
+            else:
+                cursor.executemany(self.UPSERT_QUERY, rows)
+            connection.commit()
+            return cursor.lastrowid
+        except self._pymysql.Error as e:
+            if connection:
+                connection.rollback()
+            logger.error(f"Error al insertar empleado: {e}")
+            raise
+        finally:
+            if connection:
+                connection.close()
+                DB_CONNECTIONS.labels(self.name).dec()
+
+    def upsert_employees(self, employees):
+        rows = [tuple(e[c] for c in EMPLOYEE_COLUMNS) for e in employees]
+        if not rows:
+            return 0
+        self._execute_write(rows)
+        return len(rows)
+
+    def insert_employee(self, first_name, last_name, age, email, salary, department):
+        return self._execute_write([(first_name, last_name, age, email, salary, department)])
+
+    def _fetch(self, query, params=(), one=False):
+        connection = None
+        try:
+            connection = self.get_connection()
+            DB_CONNECTIONS.labels(self.name).inc()
+            cursor = connection.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchone() if one else cursor.fetchall()
+        except self._pymysql.Error as e:
+            logger.error(f"Error al consultar empleados: {e}")
+            raise
+        finally:
+            if connection:
+                connection.close()
+                DB_CONNECTIONS.labels(self.name).dec()
+
+    def get_employee_by_email(self, email):
+        return self._fetch("SELECT * FROM employees WHERE email = %s", (email,), one=True)
+
+    def get_all_employees(self):
+        return self._fetch("SELECT * FROM employees ORDER BY id")
+
+    def test_connection(self):
+        return self._fetch("SELECT 1", one=True) is not None
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Backend SQLite embebido para workers ligeros y CI
+
+    Usa modo WAL, pragmas ajustados y upserts por lote con ON CONFLICT.
+    Mantiene una conexión por hilo para no reabrir el archivo en cada operación.
+    """
+
+    name = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS employees (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL,
+            age INTEGER NOT NULL,
+            email TEXT NOT NULL UNIQUE,
+            salary REAL NOT NULL,
+            department TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -16000",
+        "PRAGMA mmap_size = 134217728",
+        "PRAGMA busy_timeout = 5000",
+    )
+
+    UPSERT_QUERY = """
+        INSERT INTO employees (first_name, last_name, age, email, salary, department)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(email) DO UPDATE SET
+            first_name = excluded.first_name,
+            last_name = excluded.last_name,
+            age = excluded.age,
+            salary = excluded.salary,
+            department = excluded.department,
+            updated_at = CURRENT_TIMESTAMP
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv('SQLITE_PATH', 'automation_data.db')
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def get_connection(self):
+        """
+        Retorna la conexión SQLite del hilo actual (la crea si no existe)
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            return connection
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        for pragma in self.PRAGMAS:
+            connection.execute(pragma)
+
+        with self._lock:
+            if not self._schema_ready:
+                connection.execute(self.SCHEMA)
+                connection.commit()
+                self._schema_ready = True
+            self._connections.append(connection)
+            DB_CONNECTIONS.labels(self.name).set(len(self._connections))
+
+        self._local.connection = connection
+        logger.info(f"Conexión a SQLite establecida: {self.path}")
+        return connection
+
+    def upsert_employees(self, employees):
+        rows = [tuple(e[c] for c in EMPLOYEE_COLUMNS) for e in employees]
+        if not rows:
+            return 0
+        connection = self.get_connection()
+        try:
+            with connection:
+                connection.executemany(self.UPSERT_QUERY, rows)
+            return len(rows)
+        except sqlite3.Error as e:
+            logger.error(f"Error al insertar empleados en SQLite: {e}")
+            raise
+
+    def insert_employee(self, first_name, last_name, age, email, salary, department):
+        connection = self.get_connection()
+        try:
+            with connection:
+                connection.execute(
+                    self.UPSERT_QUERY,
+                    (first_name, last_name, age, email, salary, department)
+                )
+                row = connection.execute(
+                    "SELECT id FROM employees WHERE email = ?", (email,)
+                ).fetchone()
+            return row['id'] if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Error al insertar empleado en SQLite: {e}")
+            raise
+
+    def get_employee_by_email(self, email):
+        row = self.get_connection().execute(
+            "SELECT * FROM employees WHERE email = ?", (email,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_all_employees(self):
+        rows = self.get_connection().execute(
+            "SELECT * FROM employees ORDER BY id"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def test_connection(self):
+        return self.get_connection().execute("SELECT 1").fetchone() is not None
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections:
+                try:
+                    connection.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+            DB_CONNECTIONS.labels(self.name).set(0)
+        self._local = threading.local()
+
+
+BACKENDS = {
+    'mysql': MySQLBackend,
+    'sqlite': SQLiteBackend,
+}
+
+
+def create_backend(name=None):
+    """
+    Crea el backend indicado o el configurado en DB_BACKEND (.env)
+
+    Args:
+        name (str): 'mysql' o 'sqlite'. Por defecto os.getenv('DB_BACKEND', 'mysql')
+
+    Returns:
+        StorageBackend: Instancia del backend
+    """
+    name = (name or os.getenv('DB_BACKEND', 'mysql')).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de BD desconocido: '{name}' (opciones: {list(BACKENDS)})")
+    return BACKENDS[name]()
+
+
+def copy_employees(source, target, batch_size=500):
+    """
+    Envía los empleados de un backend a otro (p. ej. SQLite local -> MySQL)
+
+    Returns:
+        int: Cantidad de registros copiados
+    """
+    employees = source.get_all_employees()
+    copied = 0
+    for start in range(0, len(employees), batch_size):
+        batch = [
+            {c: e[c] for c in EMPLOYEE_COLUMNS}
+            for e in employees[start:start + batch_size]
+        ]
+        copied += target.upsert_employees(batch)
+    logger.info(f"Se copiaron {copied} empleados de {source.name} a {target.name}")
+    return copied
@@ -1,44 +1,61 @@
 """
-Módulo de conexión y operaciones con MySQL
-Uso de PyMySQL sin ORM con consultas parametrizadas
+Módulo de conexión y operaciones de base de datos
+Delegado a un backend intercambiable (MySQL o SQLite) elegido con DB_BACKEND
+Uso sin ORM con consultas parametrizadas
 """
-import pymysql
-import os
 from dotenv import load_dotenv
 import logging
+import time
 
-load_dotenv()
+from app.backends import create_backend
+from utils.metrics import DB_WRITE_DURATION, DB_ROWS_WRITTEN
 
 logger = logging.getLogger(__name__)
 
+_backend = None
+
+
+def get_backend():
+    """
+    Retorna el backend de almacenamiento activo (se crea en el primer uso)
+
+    Returns:
+        StorageBackend: Backend configurado en DB_BACKEND
+    """
+    global _backend
+    if _backend is None:
+        # .env se lee al crear el backend, no al importar el módulo
+        load_dotenv()
+        _backend = create_backend()
+        logger.info(f"Backend de BD: {_backend.name}")
+    return _backend
+
+
+def set_backend(backend):
+    """
+    Reemplaza el backend activo (útil para workers y CI)
+
+    Args:
+        backend (StorageBackend): Nuevo backend
+    """
+    global _backend
+    if _backend is not None and _backend is not backend:
+        _backend.close()
+    _backend = backend
+
 
 def get_connection():
     """
-    Crea y retorna una conexión a MySQL
+    Crea y retorna una conexión del backend activo
     """
-    try:
-        connection = pymysql.connect(
-            host=os.getenv('DB_HOST', 'localhost'),
-            port=int(os.getenv('DB_PORT', 3306)),
-            user=os.getenv('DB_USER'),
-            password=os.getenv('DB_PASSWORD'),
-            database=os.getenv('DB_NAME'),
-            charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor,
-            autocommit=False
-        )
-        logger.info("Conexión a MySQL establecida exitosamente")
-        return connection
-    except pymysql.Error as e:
-        logger.error(f"Error al conectar a MySQL: {e}")
-        raise
+    return get_backend().get_connection()
 
 
 def insert_employee(first_name, last_name, age, email, salary, department):
     """
     Inserta un empleado en la base de datos
-    Evita duplicados usando ON DUPLICATE KEY UPDATE
-    
+    Evita duplicados usando upsert por email
+
     Args:
         first_name (str): Nombre
         last_name (str): Apellido
@@ -46,118 +63,82 @@ def insert_employee(first_name, last_name, age, email, salary, department):
         email (str): Email (clave única)
         salary (float): Salario
         department (str): Departamento
-    
+
     Returns:
         int: ID del registro insertado o actualizado
     """
-    connection = None
-    try:
-        connection = get_connection()
-        cursor = connection.cursor()
-        
-        # Consulta parametrizada con prevención de duplicados
-        query = """
-            INSERT INTO employees (first_name, last_name, age, email, salary, department)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-                first_name = VALUES(first_name),
-                last_name = VALUES(last_name),
-                age = VALUES(age),
-                salary = VALUES(salary),
-                department = VALUES(department)
-        """
-        
-        cursor.execute(query, (first_name, last_name, age, email, salary, department))
-        connection.commit()
-        
-        employee_id = cursor.lastrowid
-        logger.info(f"Empleado insertado/actualizado - Email: {email}, ID: {employee_id}")
-        
-        return employee_id
-        
-    except pymysql.Error as e:
-        if connection:
-            connection.rollback()
-        logger.error(f"Error al insertar empleado: {e}")
-        raise
-    finally:
-        if connection:
-            connection.close()
+    backend = get_backend()
+    start = time.perf_counter()
+    employee_id = backend.insert_employee(
+        first_name, last_name, age, email, salary, department
+    )
+    DB_WRITE_DURATION.labels(backend.name, 'insert').observe(time.perf_counter() - start)
+    DB_ROWS_WRITTEN.labels(backend.name).inc()
+    logger.info("Empleado insertado/actualizado - Email: %s, ID: %s", email, employee_id)
+    return employee_id
+
+
+def insert_employees(employees):
+    """
+    Inserta o actualiza un lote de empleados en una sola transacción
+
+    Args:
+        employees (list): Lista de diccionarios con los datos de empleados
+
+    Returns:
+        int: Cantidad de registros procesados
+    """
+    backend = get_backend()
+    start = time.perf_counter()
+    count = backend.upsert_employees(employees)
+    DB_WRITE_DURATION.labels(backend.name, 'batch').observe(time.perf_counter() - start)
+    DB_ROWS_WRITTEN.labels(backend.name).inc(count)
+    logger.info(f"Lote de empleados insertado/actualizado: {count} registros")
+    return count
 
 
 def get_employee_by_email(email):
     """
     Obtiene un empleado por su email
-    
+
     Args:
         email (str): Email del empleado
-    
+
     Returns:
         dict: Datos del empleado o None si no existe
     """
-    connection = None
     try:
-        connection = get_connection()
-        cursor = connection.cursor()
-        
-        query = "SELECT * FROM employees WHERE email = %s"
-        cursor.execute(query, (email,))
-        
-        result = cursor.fetchone()
-        return result
-        
-    except pymysql.Error as e:
+        return get_backend().get_employee_by_email(email)
+    except Exception as e:
         logger.error(f"Error al consultar empleado: {e}")
         raise
-    finally:
-        if connection:
-            connection.close()
 
 
 def get_all_employees():
     """
     Obtiene todos los empleados
-    
+
     Returns:
         list: Lista de empleados
     """
-    connection = None
     try:
-        connection = get_connection()
-        cursor = connection.cursor()
-        
-        query = "SELECT * FROM employees ORDER BY id"
-        cursor.execute(query)
-        
-        results = cursor.fetchall()
+        results = get_backend().get_all_employees()
         logger.info(f"Se obtuvieron {len(results)} empleados")
         return results
-        
-    except pymysql.Error as e:
+    except Exception as e:
         logger.error(f"Error al consultar empleados: {e}")
         raise
-    finally:
-        if connection:
-            connection.close()
 
 
 def test_connection():
     """
     Prueba la conexión a la base de datos
-    
+
     Returns:
         bool: True si la conexión es exitosa
     """
-    connection = None
     try:
-        connection = get_connection()
-        cursor = connection.cursor()
-        cursor.execute("SELECT 1")
-        result = cursor.fetchone()
-        return result is not None
+        return get_backend().test_connection()
     except Exception as e:
         logger.error(f"Error en test de conexión: {e}")
         return False
-    finally:
-        if connection:
-            connection.close()
\ No newline at end of file
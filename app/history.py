@@ -0,0 +1,466 @@
+"""
+Historial de ejecuciones: metadatos, resultado por tarea y duración por paso
+Reporte CLI de regresiones de latencia frente a una línea base móvil
+
+Uso:
+    python -m app.history --report
+    python -m app.history --report --baseline 20 --threshold 3.5
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import socket
+import sqlite3
+import statistics
+import sys
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# Nombre de paso reservado para la duración total de la tarea
+TOTAL_STEP = '__total__'
+
+SQLITE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS run_history (
+        run_id TEXT PRIMARY KEY,
+        started_at REAL NOT NULL,
+        finished_at REAL,
+        command TEXT,
+        hostname TEXT,
+        metadata TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS run_task_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,
+        task TEXT NOT NULL,
+        outcome TEXT NOT NULL,
+        duration REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS run_step_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,
+        task TEXT NOT NULL,
+        step TEXT NOT NULL,
+        duration REAL NOT NULL,
+        ok INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_step_history ON run_step_history (task, step, run_id)",
+    """
+    CREATE TABLE IF NOT EXISTS run_resource_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,
+        task TEXT NOT NULL,
+        rss_peak_mb REAL NOT NULL,
+        rss_mean_mb REAL NOT NULL,
+        cpu_seconds REAL NOT NULL,
+        cpu_cores_mean REAL NOT NULL,
+        threads_peak INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS run_wait_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,
+        task TEXT NOT NULL,
+        selector TEXT NOT NULL,
+        duration REAL NOT NULL,
+        ok INTEGER NOT NULL
+    )
+    """,
+)
+
+RESOURCE_COLUMNS = ('rss_peak_mb', 'rss_mean_mb', 'cpu_seconds', 'cpu_cores_mean', 'threads_peak')
+
+
+class HistoryStore:
+    """
+    Almacén del historial sobre una conexión DB-API (SQLite local o MySQL)
+    """
+
+    def __init__(self, connect, placeholder='?', schema=SQLITE_SCHEMA):
+        self._connect = connect
+        self._ph = placeholder
+        self._schema = schema
+        self._ready = False
+
+    def _connection(self):
+        connection = self._connect()
+        if not self._ready and self._schema:
+            cursor = connection.cursor()
+            for statement in self._schema:
+                cursor.execute(statement)
+            connection.commit()
+            self._ready = True
+        return connection
+
+    def _sql(self, query):
+        return query.replace('?', self._ph)
+
+    def save_run(self, run):
+        """
+        Persiste una ejecución completa en una sola transacción
+
+        Args:
+            run (dict): Ver RunRecorder.to_dict()
+        """
+        connection = self._connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(
+                self._sql(
+                    "INSERT INTO run_history (run_id, started_at, finished_at, command, hostname, metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?)"
+                ),
+                (run['run_id'], run['started_at'], run['finished_at'], run['command'],
+                 run['hostname'], json.dumps(run['metadata']))
+            )
+            cursor.executemany(
+                self._sql("INSERT INTO run_task_history (run_id, task, outcome, duration) VALUES (?, ?, ?, ?)"),
+                [(run['run_id'], t['task'], t['outcome'], t['duration']) for t in run['tasks']]
+            )
+            cursor.executemany(
+                self._sql("INSERT INTO run_step_history (run_id, task, step, duration, ok) VALUES (?, ?, ?, ?, ?)"),
+                [
+                    (run['run_id'], t['task'], s['step'], s['duration'], int(s['ok']))
+                    for t in run['tasks'] for s in t['steps']
+                ]
+            )
+            cursor.executemany(
+                self._sql(
+                    f"INSERT INTO run_resource_history (run_id, task, {', '.join(RESOURCE_COLUMNS)}) "
+                    f"VALUES (?, ?, {', '.join(['?'] * len(RESOURCE_COLUMNS))})"
+                ),
+                [
+                    (run['run_id'], t['task'], *(t['resources'][c] for c in RESOURCE_COLUMNS))
+                    for t in run['tasks'] if t.get('resources')
+                ]
+            )
+            cursor.executemany(
+                self._sql("INSERT INTO run_wait_history (run_id, task, selector, duration, ok) VALUES (?, ?, ?, ?, ?)"),
+                [
+                    (run['run_id'], t['task'], w['selector'], w['duration'], int(w['ok']))
+                    for t in run['tasks'] for w in t.get('waits', ())
+                ]
+            )
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def recent_runs(self, limit):
+        """
+        Returns:
+            list: run_id de las últimas ejecuciones, de la más reciente a la más antigua
+        """
+        connection = self._connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(
+                self._sql("SELECT run_id FROM run_history ORDER BY started_at DESC LIMIT ?"),
+                (limit,)
+            )
+            return [row[0] if not isinstance(row, dict) else row['run_id'] for row in cursor.fetchall()]
+        finally:
+            connection.close()
+
+    def step_durations(self, run_ids):
+        """
+        Returns:
+            dict: {(task, step): {run_id: duración}} (solo pasos exitosos)
+        """
+        if not run_ids:
+            return {}
+        connection = self._connection()
+        try:
+            cursor = connection.cursor()
+            marks = ', '.join(['?'] * len(run_ids))
+            cursor.execute(
+                self._sql(
+                    f"SELECT run_id, task, step, duration FROM run_step_history "
+                    f"WHERE ok = 1 AND run_id IN ({marks})"
+                ),
+                tuple(run_ids)
+            )
+            result = {}
+            for row in cursor.fetchall():
+                if isinstance(row, dict):
+                    row = (row['run_id'], row['task'], row['step'], row['duration'])
+                run_id, task, step_name, duration = row
+                per_run = result.setdefault((task, step_name), {})
+                # Un paso puede repetirse en una ejecución: se suma
+                per_run[run_id] = per_run.get(run_id, 0.0) + float(duration)
+            return result
+        finally:
+            connection.close()
+
+    def resource_profile(self, limit=50, task=None):
+        """
+        Perfil de consumo del navegador en las últimas tareas medidas
+
+        Returns:
+            dict: samples, rss_peak_mb (máximo) y cpu_cores_mean (máximo); None sin datos
+        """
+        connection = self._connection()
+        try:
+            cursor = connection.cursor()
+            query = "SELECT rss_peak_mb, cpu_cores_mean FROM run_resource_history"
+            params = ()
+            if task:
+                query += " WHERE task = ?"
+                params = (task,)
+            cursor.execute(self._sql(query + " ORDER BY id DESC LIMIT ?"), params + (limit,))
+            rows = [
+                (row['rss_peak_mb'], row['cpu_cores_mean']) if isinstance(row, dict) else row
+                for row in cursor.fetchall()
+            ]
+        finally:
+            connection.close()
+        if not rows:
+            return None
+        return {
+            'samples': len(rows),
+            'rss_peak_mb': max(float(r[0]) for r in rows),
+            'cpu_cores_mean': max(float(r[1]) for r in rows),
+        }
+
+
+    def wait_latencies(self, limit=5000, quantile=0.99, min_samples=20, environment=None):
+        """
+        Latencia de aparición por selector en las últimas esperas exitosas
+
+        Args:
+            environment (dict): Solo esperas de ejecuciones con estos metadatos
+                (browser, http_cache, headless; None en un valor = cualquiera).
+                Una ejecución con HTTP_CACHE_MODE=replay o en otro navegador
+                no sirve para fijar plazos de una ejecución en vivo
+
+        Returns:
+            dict: {selector: cuantil en segundos} (solo selectores con min_samples)
+        """
+        connection = self._connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(
+                self._sql(
+                    "SELECT w.selector, w.duration, r.metadata FROM run_wait_history w "
+                    "LEFT JOIN run_history r ON r.run_id = w.run_id "
+                    "WHERE w.ok = 1 ORDER BY w.id DESC LIMIT ?"
+                ),
+                (limit,)
+            )
+            samples = {}
+            for row in cursor.fetchall():
+                if isinstance(row, dict):
+                    row = (row['selector'], row['duration'], row['metadata'])
+                if environment and not _same_environment(row[2], environment):
+                    continue
+                samples.setdefault(row[0], []).append(float(row[1]))
+        finally:
+            connection.close()
+        result = {}
+        for selector, durations in samples.items():
+            if len(durations) >= min_samples:
+                durations.sort()
+                # Rango más cercano: con 100 muestras el p99 es la segunda más lenta
+                result[selector] = durations[max(0, math.ceil(quantile * len(durations)) - 1)]
+        return result
+
+
+# Valores de metadatos ausentes en ejecuciones registradas antes de que existieran
+ENVIRONMENT_DEFAULTS = {'browser': 'firefox', 'http_cache': 'off'}
+
+
+def _same_environment(metadata, environment):
+    try:
+        metadata = json.loads(metadata or '{}')
+    except ValueError:
+        metadata = {}
+    return all(
+        metadata.get(key, ENVIRONMENT_DEFAULTS.get(key)) == value
+        for key, value in environment.items() if value is not None
+    )
+
+
+def _mysql_connect():
+    import pymysql
+    return pymysql.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 3306)),
+        user=os.getenv('DB_USER'),
+        password=os.getenv('DB_PASSWORD'),
+        database=os.getenv('DB_NAME'),
+        charset='utf8mb4',
+        autocommit=False
+    )
+
+
+def create_history_store(kind=None):
+    """
+    Crea el almacén configurado en RUN_HISTORY_BACKEND ('sqlite' por defecto o 'mysql')
+
+    Para MySQL las tablas se crean con scripts/schema.sql.
+    """
+    load_dotenv()
+    kind = (kind or os.getenv('RUN_HISTORY_BACKEND', 'sqlite')).strip().lower()
+    if kind == 'mysql':
+        return HistoryStore(_mysql_connect, placeholder='%s', schema=None)
+    if kind == 'sqlite':
+        path = os.getenv('RUN_HISTORY_PATH', 'run_history.db')
+        return HistoryStore(lambda: sqlite3.connect(path, timeout=10))
+    raise ValueError(f"Backend de historial desconocido: '{kind}'")
+
+
+class RunRecorder:
+    """
+    Acumula los resultados de una ejecución y los persiste al finalizar
+    """
+
+    def __init__(self, command, metadata=None, store=None):
+        self.run_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self.finished_at = None
+        self.command = command
+        self.metadata = metadata or {}
+        self.tasks = []
+        self._store = store
+
+    def record_task(self, timings, outcome):
+        """
+        Args:
+            timings (TaskTimings): Duraciones de la tarea y sus pasos (y recursos
+                del navegador si se midieron)
+            outcome (str): 'success', 'warning' o 'error'
+        """
+        steps = list(timings.steps)
+        steps.append({'step': TOTAL_STEP, 'duration': timings.duration, 'ok': outcome != 'error'})
+        self.tasks.append({
+            'task': timings.task_name,
+            'outcome': outcome,
+            'duration': timings.duration,
+            'steps': steps,
+            'resources': timings.resources,
+            'waits': list(timings.waits),
+        })
+
+    def to_dict(self):
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'command': self.command,
+            'hostname': socket.gethostname(),
+            'metadata': self.metadata,
+            'tasks': self.tasks,
+        }
+
+    def finish(self):
+        """
+        Persiste la ejecución; un fallo del historial nunca interrumpe la ejecución
+        """
+        self.finished_at = time.time()
+        try:
+            store = self._store or create_history_store()
+            store.save_run(self.to_dict())
+            logger.info(f"Historial guardado - run_id: {self.run_id}")
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el historial de ejecución: {e}")
+
+
+def detect_regressions(store, baseline_size=20, threshold=3.5, min_increase=0.2, min_samples=5):
+    """
+    Compara la última ejecución contra la línea base de las anteriores
+
+    Usa mediana y MAD (desviación absoluta mediana) para que valores atípicos
+    de la línea base no oculten regresiones. Un paso se marca si su z robusto
+    supera `threshold` y además es al menos `min_increase` más lento que la mediana.
+
+    Returns:
+        list: Diccionarios por (task, step) con latest, median, z, increase y regression
+    """
+    run_ids = store.recent_runs(baseline_size + 1)
+    if len(run_ids) < 2:
+        return []
+    latest, baseline_ids = run_ids[0], run_ids[1:]
+    durations = store.step_durations(run_ids)
+
+    report = []
+    for (task, step_name), per_run in sorted(durations.items()):
+        if latest not in per_run:
+            continue
+        samples = [per_run[r] for r in baseline_ids if r in per_run]
+        value = per_run[latest]
+        entry = {'task': task, 'step': step_name, 'latest': value, 'samples': len(samples),
+                 'median': None, 'z': None, 'increase': None, 'regression': False}
+        if len(samples) >= min_samples:
+            median = statistics.median(samples)
+            mad = statistics.median(abs(s - median) for s in samples)
+            # 1.4826 * MAD estima la desviación estándar; piso para series muy estables
+            scale = max(1.4826 * mad, median * 0.01, 1e-6)
+            z = (value - median) / scale
+            increase = (value - median) / median if median > 0 else 0.0
+            entry.update(median=median, z=z, increase=increase,
+                         regression=z > threshold and increase > min_increase)
+        report.append(entry)
+    return report
+
+
+def print_report(report):
+    """
+    Imprime el reporte de regresiones
+
+    Returns:
+        int: Cantidad de regresiones detectadas
+    """
+    if not report:
+        print("No hay suficientes ejecuciones en el historial para comparar")
+        return 0
+
+    print(f"{'Tarea':<14} {'Paso':<26} {'Última':>9} {'Mediana':>9} {'Δ%':>8} {'z':>7}  Estado")
+    regressions = 0
+    for e in report:
+        step_label = 'TOTAL' if e['step'] == TOTAL_STEP else e['step']
+        if e['median'] is None:
+            print(f"{e['task']:<14} {step_label:<26} {e['latest']:>8.2f}s {'-':>9} {'-':>8} {'-':>7}  "
+                  f"sin línea base ({e['samples']} muestras)")
+            continue
+        status = '✗ REGRESIÓN' if e['regression'] else '✓ OK'
+        regressions += e['regression']
+        print(f"{e['task']:<14} {step_label:<26} {e['latest']:>8.2f}s {e['median']:>8.2f}s "
+              f"{e['increase']:>+7.0%} {e['z']:>7.1f}  {status}")
+    print(f"\nRegresiones detectadas: {regressions}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Historial de ejecuciones y regresiones de latencia')
+    parser.add_argument('--report', action='store_true', help='Compara la última ejecución con la línea base')
+    parser.add_argument('--baseline', type=int, default=20, help='Ejecuciones previas en la línea base')
+    parser.add_argument('--threshold', type=float, default=3.5, help='Umbral de z robusto')
+    parser.add_argument('--min-increase', type=float, default=0.2, help='Incremento relativo mínimo (0.2 = 20%%)')
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default=None)
+    args = parser.parse_args(argv)
+
+    if not args.report:
+        parser.print_help()
+        return 0
+
+    store = create_history_store(args.backend)
+    report = detect_regressions(store, args.baseline, args.threshold, args.min_increase)
+    return 1 if print_report(report) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Cola de trabajos durable sobre SQLite
+Sustituto local de una cola de mensajes para el worker (worker.py)
+"""
+import json
+import logging
+import os
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """
+    Cola FIFO persistente: pending -> running -> done / failed
+
+    Un trabajo en 'running' cuyo worker murió se recupera con requeue_orphaned()
+    (worker de este host que ya no existe) o requeue_stale() (por antigüedad).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task TEXT NOT NULL,
+            payload TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker TEXT,
+            error TEXT,
+            enqueued_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        )
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv('JOB_QUEUE_PATH', 'jobs.db')
+        self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.execute(self.SCHEMA)
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id)"
+        )
+
+    def enqueue(self, task, payload=None, count=1):
+        """
+        Agrega trabajos a la cola
+
+        Returns:
+            int: Cantidad de trabajos agregados
+        """
+        now = time.time()
+        rows = [(task, json.dumps(payload or {}), now)] * count
+        with self._transaction():
+            self._connection.executemany(
+                "INSERT INTO jobs (task, payload, enqueued_at) VALUES (?, ?, ?)", rows
+            )
+        return count
+
+    def claim(self, worker_id):
+        """
+        Toma el siguiente trabajo pendiente de forma atómica
+
+        Returns:
+            dict: Trabajo (id, task, payload, attempts) o None si la cola está vacía
+        """
+        with self._transaction():
+            row = self._connection.execute(
+                "SELECT id FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, started_at = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (worker_id, time.time(), row['id'])
+            )
+            job = self._connection.execute(
+                "SELECT id, task, payload, attempts FROM jobs WHERE id = ?", (row['id'],)
+            ).fetchone()
+        return {
+            'id': job['id'],
+            'task': job['task'],
+            'payload': json.loads(job['payload'] or '{}'),
+            'attempts': job['attempts'],
+        }
+
+    def complete(self, job_id):
+        self._finish(job_id, 'done', None)
+
+    def fail(self, job_id, error, max_attempts=3):
+        """
+        Marca el trabajo como fallido o lo devuelve a la cola si quedan intentos
+        """
+        with self._transaction():
+            row = self._connection.execute(
+                "SELECT attempts FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            status = 'pending' if row and row['attempts'] < max_attempts else 'failed'
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, str(error)[:1000], time.time(), job_id)
+            )
+
+    def _finish(self, job_id, status, error):
+        with self._transaction():
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id)
+            )
+
+    def requeue_stale(self, older_than=3600):
+        """
+        Devuelve a 'pending' los trabajos 'running' abandonados
+
+        Returns:
+            int: Cantidad de trabajos recuperados
+        """
+        with self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE jobs SET status = 'pending', worker = NULL "
+                "WHERE status = 'running' AND started_at < ?",
+                (time.time() - older_than,)
+            )
+        if cursor.rowcount:
+            logger.warning(f"Trabajos recuperados de workers caídos: {cursor.rowcount}")
+        return cursor.rowcount
+
+    def requeue_orphaned(self, host, own_id=None, is_alive=None):
+        """
+        Devuelve a 'pending' los trabajos 'running' de workers de este host
+        (worker = host:pid) cuyo proceso ya no existe
+
+        Args:
+            host (str): Host de los workers a revisar
+            own_id (str): Id del worker que llama: sus trabajos 'running' son
+                de un proceso anterior con el mismo pid (p. ej. pid 1 en un contenedor)
+            is_alive (callable): pid -> bool (por defecto, señal 0 al proceso)
+
+        Returns:
+            int: Cantidad de trabajos recuperados
+        """
+        is_alive = is_alive or _pid_alive
+        with self._transaction():
+            rows = self._connection.execute(
+                "SELECT id, worker FROM jobs WHERE status = 'running' AND worker LIKE ?",
+                (f'{host}:%',)
+            ).fetchall()
+            orphaned = []
+            for row in rows:
+                worker_host, pid = row['worker'].rsplit(':', 1)
+                if worker_host != host:
+                    continue
+                if row['worker'] == own_id or (pid.isdigit() and not is_alive(int(pid))):
+                    orphaned.append((row['id'],))
+            self._connection.executemany(
+                "UPDATE jobs SET status = 'pending', worker = NULL WHERE id = ?", orphaned
+            )
+        if orphaned:
+            logger.warning(f"Trabajos recuperados de workers caídos en {host}: {len(orphaned)}")
+        return len(orphaned)
+
+    def counts(self):
+        """
+        Returns:
+            dict: {status: cantidad}
+        """
+        rows = self._connection.execute(
+            "SELECT status, COUNT(*) AS total FROM jobs GROUP BY status"
+        ).fetchall()
+        return {row['status']: row['total'] for row in rows}
+
+    def close(self):
+        self._connection.close()
+
+    def _transaction(self):
+        return _ImmediateTransaction(self._connection)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Existe pero es de otro usuario
+        return True
+    return True
+
+
+class _ImmediateTransaction:
+    """
+    BEGIN IMMEDIATE: toma el lock de escritura al inicio para que dos workers
+    no reclamen el mismo trabajo
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __enter__(self):
+        self._connection.execute("BEGIN IMMEDIATE")
+        return self._connection
+
+    def __exit__(self, exc_type, exc, tb):
+        self._connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        return False
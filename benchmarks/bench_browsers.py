@@ -0,0 +1,93 @@
+"""
+Benchmark: Firefox vs Chromium por tarea
+Ejecuta las tareas sobre las páginas locales de tests/fixtures en cada navegador
+y reporta latencia (mediana) y RSS pico del árbol driver + navegador
+
+Uso:
+    python benchmarks/bench_browsers.py --runs 5
+    python benchmarks/bench_browsers.py --browsers chromium --runs 10
+"""
+import argparse
+import os
+import pathlib
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import BROWSERS, create_driver  # noqa: E402
+from functions.buttons_task import execute_buttons_task  # noqa: E402
+from functions.droppable_task import perform_drag_and_drop  # noqa: E402
+from functions.webtables_task import extract_webtables  # noqa: E402
+from utils.procfs import ResourceSampler, driver_pid  # noqa: E402
+
+FIXTURES = pathlib.Path(__file__).parent.parent / 'tests' / 'fixtures'
+
+TASKS = {
+    'webtables': lambda driver: extract_webtables(driver, url=(FIXTURES / 'webtables.html').as_uri()),
+    'buttons': lambda driver: execute_buttons_task(driver, url=(FIXTURES / 'buttons.html').as_uri()),
+    'droppable': lambda driver: perform_drag_and_drop(driver, url=(FIXTURES / 'droppable.html').as_uri()),
+}
+
+
+def run_browser(browser, task_names, runs, headless):
+    """
+    Returns:
+        dict: {tarea: (latencias en segundos, RSS pico en MB, ejecuciones OK)}
+    """
+    results = {}
+    driver = create_driver(headless, browser=browser)
+    try:
+        for name in task_names:
+            latencies = []
+            rss_peak = 0.0
+            passed = 0
+            for _ in range(runs):
+                with ResourceSampler(lambda: driver_pid(driver), 0.1) as sampler:
+                    start = time.perf_counter()
+                    try:
+                        passed += bool(TASKS[name](driver))
+                    except Exception as e:
+                        print(f"  {browser}: {name} falló - {e}")
+                    latencies.append(time.perf_counter() - start)
+                summary = sampler.summary()
+                if summary:
+                    rss_peak = max(rss_peak, summary['rss_peak_mb'])
+            results[name] = (latencies, rss_peak, passed)
+    finally:
+        driver.quit()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latencia y memoria por tarea: Firefox vs Chromium')
+    parser.add_argument('--browsers', nargs='+', choices=BROWSERS, default=list(BROWSERS))
+    parser.add_argument('--tasks', nargs='+', choices=list(TASKS), default=list(TASKS))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--no-headless', action='store_true')
+    args = parser.parse_args()
+
+    # Páginas locales: el nivel HTTP de webtables no aplica a file://
+    os.environ['WEBTABLES_LIGHT_TIER'] = '0'
+
+    print(f"\n=== {args.runs} ejecuciones por tarea (fixtures locales) ===")
+    print(f"{'navegador':<10} {'tarea':<10} {'mediana ms':>11} {'p95 ms':>9} {'RSS pico MB':>12} {'OK':>6}")
+    for browser in args.browsers:
+        try:
+            results = run_browser(browser, args.tasks, args.runs, not args.no_headless)
+        except Exception as e:
+            print(f"{browser:<10} no disponible - {e}")
+            continue
+        for name, (latencies, rss_peak, passed) in results.items():
+            ordered = sorted(latencies)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            print(
+                f"{browser:<10} {name:<10} {statistics.median(latencies) * 1000:>11.1f} "
+                f"{p95 * 1000:>9.1f} {rss_peak:>12.1f} {passed:>3}/{args.runs}"
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
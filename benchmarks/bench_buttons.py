@@ -0,0 +1,77 @@
+"""
+Benchmark: tarea de botones secuencial vs en lote
+Cuenta los comandos WebDriver (round-trips) y el tiempo de cada modo
+
+Uso:
+    python benchmarks/bench_buttons.py --runs 5
+    python benchmarks/bench_buttons.py --url https://demoqa.com/buttons --runs 3
+"""
+import argparse
+import collections
+import os
+import pathlib
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import create_driver  # noqa: E402
+from functions.buttons_task import execute_buttons_task  # noqa: E402
+
+FIXTURE_URL = (pathlib.Path(__file__).parent.parent / 'tests' / 'fixtures' / 'buttons.html').as_uri()
+
+
+def count_commands(driver):
+    """
+    Envuelve driver.execute para contar comandos por tipo
+    """
+    counts = collections.Counter()
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        counts[driver_command] += 1
+        return original_execute(driver_command, params)
+
+    driver.execute = execute
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Botones: secuencial vs lote')
+    parser.add_argument('--url', default=FIXTURE_URL, help='Página de botones (por defecto el fixture local)')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--no-headless', action='store_true')
+    args = parser.parse_args()
+
+    driver = create_driver(headless=not args.no_headless)
+    counts = count_commands(driver)
+    summary = {}
+    try:
+        for mode in ('sequential', 'batched'):
+            os.environ['BUTTONS_MODE'] = mode
+            times, commands, passed = [], [], 0
+            for _ in range(args.runs):
+                counts.clear()
+                start = time.perf_counter()
+                passed += bool(execute_buttons_task(driver, args.url))
+                times.append(time.perf_counter() - start)
+                # driver.get no cuenta como interacción
+                commands.append(sum(counts.values()) - counts['get'])
+            summary[mode] = (times, commands, passed, dict(counts))
+    finally:
+        driver.quit()
+
+    print(f"\n=== {args.url} ({args.runs} rondas) ===")
+    for mode, (times, commands, passed, last_counts) in summary.items():
+        print(
+            f"{mode:<11} tiempo mediana={statistics.median(times):6.2f}s  "
+            f"comandos WebDriver={statistics.median(commands):4.0f}  OK={passed}/{args.runs}"
+        )
+        detail = ', '.join(f'{name}={count}' for name, count in sorted(last_counts.items()))
+        print(f"{'':<11} {detail}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
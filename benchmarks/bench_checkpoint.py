@@ -0,0 +1,110 @@
+"""
+Benchmark: caída y reanudación de un lote largo
+Simula un lote de páginas (extracción con latencia fija + upsert real en
+SQLite por lotes), lo interrumpe a mitad y compara repetir todo desde cero
+contra reanudar desde el checkpoint. Reporta también el costo de los avances.
+
+Uso:
+    python benchmarks/bench_checkpoint.py --pages 40 --rows 500 --page-ms 100 --crash-at 0.6
+    python benchmarks/bench_checkpoint.py --fsync
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.backends import SQLiteBackend  # noqa: E402
+from app.db import set_backend  # noqa: E402
+from functions.webtables_task import save_to_database  # noqa: E402
+from utils.checkpoint import CheckpointStore, use_checkpoint  # noqa: E402
+
+
+class SimulatedCrash(Exception):
+    pass
+
+
+def page_rows(page, rows):
+    return [
+        {'first_name': f'Nombre{i}', 'last_name': f'Pagina{page}', 'age': 30, 'email': f'p{page}-r{i}@example.com',
+         'salary': 1000.0 + i, 'department': 'QA'}
+        for i in range(rows)
+    ]
+
+
+def run_batch(pages, rows, page_seconds, checkpoint=None, crash_at=None):
+    """
+    Returns:
+        tuple: (segundos, páginas extraídas en esta ejecución)
+    """
+    start = time.perf_counter()
+    scraped = 0
+    with use_checkpoint(checkpoint):
+        for page in range(pages):
+            if crash_at is not None and page == crash_at:
+                raise SimulatedCrash(page)
+            key = f'page:{page}'
+            if checkpoint is not None and checkpoint.is_done(key):
+                continue
+            time.sleep(page_seconds)  # latencia de navegar y extraer la página
+            scraped += 1
+            save_to_database(page_rows(page, rows), checkpoint_key=f'rows:{page}' if checkpoint else None)
+            if checkpoint is not None:
+                checkpoint.mark_done(key)
+    return time.perf_counter() - start, scraped
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Caída a mitad de lote: reinicio vs reanudación')
+    parser.add_argument('--pages', type=int, default=40)
+    parser.add_argument('--rows', type=int, default=500, help='Filas por página')
+    parser.add_argument('--page-ms', type=float, default=100, help='Latencia simulada por página')
+    parser.add_argument('--crash-at', type=float, default=0.6, help='Fracción del lote en que ocurre la caída')
+    parser.add_argument('--fsync', action='store_true', help='fsync en cada avance')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    workdir = tempfile.mkdtemp(prefix='rpa-checkpoint-')
+    set_backend(SQLiteBackend(os.path.join(workdir, 'bench.db')))
+    page_seconds = args.page_ms / 1000
+    crash_page = int(args.pages * args.crash_at)
+
+    # Sin checkpoint: la caída obliga a repetir el lote completo
+    try:
+        run_batch(args.pages, args.rows, page_seconds, crash_at=crash_page)
+    except SimulatedCrash:
+        pass
+    restart_seconds, restart_pages = run_batch(args.pages, args.rows, page_seconds)
+
+    # Con checkpoint: la ejecución siguiente salta lo ya hecho
+    path = os.path.join(workdir, 'run.jsonl')
+    try:
+        run_batch(args.pages, args.rows, page_seconds, CheckpointStore(path, fsync=args.fsync), crash_page)
+    except SimulatedCrash:
+        pass
+    checkpoint = CheckpointStore(path, fsync=args.fsync)
+    resume_seconds, resume_pages = run_batch(args.pages, args.rows, page_seconds, checkpoint)
+    checkpoint.clear()
+
+    # Costo de un avance (append + flush [+ fsync])
+    overhead = CheckpointStore(os.path.join(workdir, 'overhead.jsonl'), fsync=args.fsync)
+    start = time.perf_counter()
+    for i in range(1000):
+        overhead.set_offset('rows:overhead', i)
+    append_us = (time.perf_counter() - start) / 1000 * 1e6
+    overhead.clear()
+
+    print(f"\n=== {args.pages} páginas x {args.rows} filas, caída en la página {crash_page} ===")
+    print(f"reinicio desde cero  {restart_seconds:7.2f}s  páginas extraídas={restart_pages}")
+    print(f"reanudación          {resume_seconds:7.2f}s  páginas extraídas={resume_pages}")
+    print(f"tiempo ahorrado      {restart_seconds - resume_seconds:7.2f}s "
+          f"({(restart_seconds - resume_seconds) / restart_seconds:.0%})")
+    print(f"costo por avance     {append_us:7.1f}µs (fsync={'sí' if args.fsync else 'no'})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Benchmark: latencia de drag & drop por estrategia
+Compara la cadena original (pausas + sleep de 1s) con las estrategias del motor
+de utils/drag.py, midiendo desde el inicio del drag hasta la confirmación del drop
+
+Uso:
+    python benchmarks/bench_drag.py --runs 10
+    python benchmarks/bench_drag.py --url https://demoqa.com/droppable --runs 5
+"""
+import argparse
+import os
+import pathlib
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.common.exceptions import TimeoutException  # noqa: E402
+from selenium.webdriver.common.by import By  # noqa: E402
+from selenium.webdriver.support import expected_conditions as EC  # noqa: E402
+
+from main import create_driver  # noqa: E402
+from utils.drag import STRATEGIES, drag_and_drop  # noqa: E402
+from utils.selectors import DROPPABLE_SELECTORS  # noqa: E402
+from utils.utils import wait_for_element  # noqa: E402
+
+FIXTURE_URL = (pathlib.Path(__file__).parent.parent / 'tests' / 'fixtures' / 'droppable.html').as_uri()
+
+
+def dropped():
+    return EC.text_to_be_present_in_element((By.CSS_SELECTOR, DROPPABLE_SELECTORS['droppable_text']), 'Dropped!')
+
+
+def original_drop(driver, source, target):
+    # Comportamiento previo de la tarea: cadena con pausas y sleep fijo
+    STRATEGIES['legacy'](driver, source, target)
+    time.sleep(1)
+    if not dropped()(driver):
+        raise TimeoutException('sin drop')
+
+
+def measure(driver, url, runs, drop):
+    latencies, failures = [], 0
+    for _ in range(runs):
+        driver.get(url)
+        source = wait_for_element(driver, DROPPABLE_SELECTORS['draggable'])
+        target = wait_for_element(driver, DROPPABLE_SELECTORS['droppable'])
+        start = time.perf_counter()
+        try:
+            drop(driver, source, target)
+            latencies.append(time.perf_counter() - start)
+        except TimeoutException:
+            failures += 1
+    return latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latencia de drag & drop por estrategia')
+    parser.add_argument('--url', default=FIXTURE_URL, help='Página droppable (por defecto el fixture local)')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--no-headless', action='store_true')
+    args = parser.parse_args()
+
+    driver = create_driver(headless=not args.no_headless)
+    # Sin espera implícita: find_element no debe sumar latencia a la confirmación
+    driver.implicitly_wait(0)
+    try:
+        browser = driver.capabilities.get('browserName')
+        candidates = {'original (pausas + sleep)': original_drop}
+        for name in STRATEGIES:
+            candidates[name] = (
+                lambda d, s, t, name=name: drag_and_drop(d, s, t, dropped(), timeout=3, strategy=name)
+            )
+        results = {label: measure(driver, args.url, args.runs, drop) for label, drop in candidates.items()}
+    finally:
+        driver.quit()
+
+    print(f"\n=== {browser}: {args.url} ({args.runs} drops por estrategia) ===")
+    for label, (latencies, failures) in results.items():
+        if latencies:
+            ordered = sorted(latencies)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            print(
+                f"{label:<26} mediana={statistics.median(latencies) * 1000:7.0f} ms  "
+                f"p95={p95 * 1000:7.0f} ms  fallos={failures}/{args.runs}"
+            )
+        else:
+            print(f"{label:<26} sin drops confirmados ({failures}/{args.runs} fallos)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Benchmark del costo de logging por fila a alto ritmo
+Compara el modo síncrono original (f-string + texto) con el logging en hilo de
+fondo, JSON y limitación de mensajes repetitivos
+
+Uso:
+    python benchmarks/bench_logging.py --rows 50000 --threads 4
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logs import configure_logging, log_context, stop_logging  # noqa: E402
+
+logger = logging.getLogger('bench.rows')
+
+
+def log_rows_eager(rows):
+    for index in range(rows):
+        email = f'user{index}@example.com'
+        logger.info(f"✓ Registro {index + 1} extraído: {email}")
+
+
+def log_rows_lazy(rows):
+    for index in range(rows):
+        logger.info("✓ Registro %d extraído: %s", index + 1, 'user@example.com')
+
+
+def run_threads(target, rows, threads):
+    """
+    Returns:
+        float: Segundos que tardan los hilos productores (sin esperar la escritura de fondo)
+    """
+    per_thread = rows // threads
+
+    def worker(index):
+        with log_context(worker=f'bench-{index}'):
+            target(per_thread)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Overhead de logging por fila')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--rate-limit', type=float, default=50)
+    args = parser.parse_args()
+
+    modes = [
+        ('síncrono texto (f-string)', log_rows_eager, dict(fmt='text')),
+        ('síncrono texto (lazy)', log_rows_lazy, dict(fmt='text')),
+        ('cola + texto', log_rows_lazy, dict(fmt='text', use_queue=True)),
+        ('cola + JSON', log_rows_lazy, dict(fmt='json', use_queue=True)),
+        ('cola + JSON + límite', log_rows_lazy, dict(fmt='json', use_queue=True, rate_limit=args.rate_limit)),
+    ]
+
+    print(f"\n=== {args.rows} mensajes, {args.threads} hilos ===")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, target, options in modes:
+            path = os.path.join(directory, 'bench.log')
+            configure_logging(filename=path, **options)
+            producer = run_threads(target, args.rows, args.threads)
+            drain_start = time.perf_counter()
+            stop_logging()
+            drain = time.perf_counter() - drain_start
+            with open(path, encoding='utf-8') as f:
+                written = sum(1 for _ in f)
+            os.remove(path)
+            print(
+                f"{label:<28} productores={producer / args.rows * 1e6:6.2f} µs/msg  "
+                f"vaciado={drain:5.2f}s  líneas escritas={written}"
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
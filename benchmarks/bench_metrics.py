@@ -0,0 +1,83 @@
+"""
+Benchmark del overhead de métricas en rutas calientes
+Mide nanosegundos por operación frente a una línea base sin instrumentar
+
+Uso:
+    python benchmarks/bench_metrics.py --ops 200000
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.metrics import Registry  # noqa: E402
+
+
+def ns_per_op(func, ops):
+    start = time.perf_counter_ns()
+    for _ in range(ops):
+        func()
+    return (time.perf_counter_ns() - start) / ops
+
+
+def threaded_ns_per_op(func, ops, threads):
+    per_thread = ops // threads
+    workers = [
+        threading.Thread(target=lambda: [func() for _ in range(per_thread)])
+        for _ in range(threads)
+    ]
+    start = time.perf_counter_ns()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter_ns() - start) / (per_thread * threads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Overhead de utils.metrics')
+    parser.add_argument('--ops', type=int, default=200000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    registry = Registry()
+    counter = registry.counter('bench_ops', 'bench', ('task',))
+    histogram = registry.histogram('bench_latency_seconds', 'bench', ('command',))
+    counter_child = counter.labels('webtables')
+    histogram_child = histogram.labels('findElement')
+
+    def baseline():
+        time.perf_counter()
+
+    def timed_observe():
+        start = time.perf_counter()
+        histogram_child.observe(time.perf_counter() - start)
+
+    cases = [
+        ('línea base (perf_counter)', baseline),
+        ('counter.inc (hijo cacheado)', counter_child.inc),
+        ('counter.labels().inc', lambda: counter.labels('webtables').inc()),
+        ('histogram.observe (hijo)', lambda: histogram_child.observe(0.01)),
+        ('histogram.labels().observe', lambda: histogram.labels('findElement').observe(0.01)),
+        ('medición + observe', timed_observe),
+    ]
+
+    print(f"=== Overhead por operación ({args.ops} ops) ===")
+    for label, func in cases:
+        print(f"{label:<32} {ns_per_op(func, args.ops):>8.0f} ns/op")
+
+    print(f"\n=== Contención con {args.threads} hilos ===")
+    for label, func in cases[1:]:
+        print(f"{label:<32} {threaded_ns_per_op(func, args.ops, args.threads):>8.0f} ns/op")
+
+    start = time.perf_counter()
+    registry.render()
+    print(f"\nrender(): {(time.perf_counter() - start) * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
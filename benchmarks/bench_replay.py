@@ -0,0 +1,87 @@
+"""
+Benchmark: caché HTTP de grabación/reproducción
+Ejecuta las tareas en modo record y luego en replay (sin red) y compara la
+tasa de aciertos del proxy y el tiempo de carga de página (driver.get)
+
+Uso:
+    python benchmarks/bench_replay.py --tasks webtables buttons droppable --runs 2
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import create_driver  # noqa: E402
+from functions.registry import get_task  # noqa: E402
+from utils.replay_proxy import get_replay_proxy, reset_replay_proxy  # noqa: E402
+
+
+def run_mode(mode, cache_dir, task_names, headless):
+    """
+    Returns:
+        tuple: (tiempos de driver.get en segundos, estadísticas del proxy, tareas OK)
+    """
+    os.environ['HTTP_CACHE_MODE'] = mode
+    os.environ['HTTP_CACHE_DIR'] = cache_dir
+    reset_replay_proxy()
+
+    page_loads = []
+    driver = create_driver(headless)
+    original_get = driver.get
+
+    def timed_get(url):
+        start = time.perf_counter()
+        try:
+            return original_get(url)
+        finally:
+            page_loads.append(time.perf_counter() - start)
+
+    driver.get = timed_get
+    passed = 0
+    try:
+        for name in task_names:
+            try:
+                passed += bool(get_task(name).load()(driver))
+            except Exception as e:
+                print(f"  {mode}: {name} falló - {e}")
+    finally:
+        driver.quit()
+    stats = get_replay_proxy().stats()
+    reset_replay_proxy()
+    return page_loads, stats, passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Caché HTTP: record vs replay')
+    parser.add_argument('--tasks', nargs='+', default=['webtables', 'buttons', 'droppable'])
+    parser.add_argument('--runs', type=int, default=2, help='Rondas de replay tras la grabación')
+    parser.add_argument('--cache-dir', default=None, help='Directorio de la caché (por defecto temporal)')
+    parser.add_argument('--no-headless', action='store_true')
+    args = parser.parse_args()
+
+    # El nivel HTTP evitaría el navegador en webtables: medir la carga en Firefox
+    os.environ['WEBTABLES_LIGHT_TIER'] = '0'
+    headless = not args.no_headless
+    cache_dir = args.cache_dir or tempfile.mkdtemp(prefix='rpa-http-cache-')
+
+    results = [('record', *run_mode('record', cache_dir, args.tasks, headless))]
+    for _ in range(args.runs):
+        results.append(('replay', *run_mode('replay', cache_dir, args.tasks, headless)))
+
+    print(f"\n=== {', '.join(args.tasks)} - caché en {cache_dir} ===")
+    for mode, page_loads, stats, passed in results:
+        median = statistics.median(page_loads) if page_loads else 0.0
+        print(
+            f"{mode:<7} carga de página mediana={median:6.2f}s  total={sum(page_loads):6.2f}s  "
+            f"aciertos={stats['hit_ratio']:6.1%}  grabadas={stats['recorded']:4d}  "
+            f"sin grabar={stats['miss']:4d}  OK={passed}/{len(args.tasks)}"
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
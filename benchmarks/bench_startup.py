@@ -0,0 +1,75 @@
+"""
+Benchmark de arranque: tiempo hasta el primer driver.get
+Compara perfil temporal nuevo vs clon de plantilla pre-sembrada
+
+Uso:
+    python benchmarks/bench_startup.py --template profiles/firefox-template --runs 5
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import create_driver  # noqa: E402
+from utils.browser_profile import build_profile_template  # noqa: E402
+
+
+def time_to_first_get(url, profile_template=None):
+    """
+    Returns:
+        float: Segundos desde create_driver hasta que termina el primer get
+    """
+    start = time.perf_counter()
+    driver = create_driver(headless=True, profile_template=profile_template)
+    try:
+        driver.get(url)
+        return time.perf_counter() - start
+    finally:
+        driver.quit()
+
+
+def summarize(label, samples):
+    print(
+        f"{label:<22} n={len(samples)}  "
+        f"media={statistics.mean(samples):.2f}s  "
+        f"mediana={statistics.median(samples):.2f}s  "
+        f"min={min(samples):.2f}s  max={max(samples):.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de arranque de Firefox')
+    parser.add_argument('--url', default='https://demoqa.com/webtables')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--template', default='profiles/firefox-template')
+    parser.add_argument('--rebuild', action='store_true', help='Recrear y calentar la plantilla')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.rebuild or not os.path.isdir(args.template):
+        print(f"Creando plantilla en {args.template}...")
+        build_profile_template(args.template, warm_urls=[args.url])
+
+    results = {'sin plantilla': [], 'con plantilla': []}
+    # Alternar modos para repartir efectos de caché del sistema operativo
+    for run in range(args.runs):
+        results['sin plantilla'].append(time_to_first_get(args.url))
+        results['con plantilla'].append(time_to_first_get(args.url, args.template))
+        print(f"Ronda {run + 1}/{args.runs} completada")
+
+    print("\n=== Tiempo hasta el primer driver.get ===")
+    for label, samples in results.items():
+        summarize(label, samples)
+
+    speedup = statistics.median(results['sin plantilla']) / statistics.median(results['con plantilla'])
+    print(f"\nMejora (mediana): {speedup:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Benchmark: pestañas en un navegador vs un navegador por tarea
+Mide tiempo total y memoria (RSS del árbol geckodriver + Firefox, vía /proc)
+
+Uso:
+    python benchmarks/bench_tabs.py --tasks buttons droppable webtables --runs 3
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import create_driver  # noqa: E402
+from functions.registry import get_task  # noqa: E402
+from utils.tabs import run_in_tabs  # noqa: E402
+from utils.procfs import tree_rss_mb, driver_pid  # noqa: E402
+
+
+class PeakSampler:
+    """
+    Muestrea el RSS total de varios árboles de procesos y guarda el pico
+    """
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.pids = []
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, sum(tree_rss_mb(pid) for pid in list(self.pids)))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_tabs_mode(task_names, headless):
+    with PeakSampler() as sampler:
+        start = time.perf_counter()
+        driver = create_driver(headless)
+        sampler.pids.append(driver_pid(driver))
+        try:
+            tasks = [(name, get_task(name).load()) for name in task_names]
+            results = run_in_tabs(driver, tasks)
+        finally:
+            driver.quit()
+        elapsed = time.perf_counter() - start
+    return elapsed, sampler.peak_mb, results
+
+
+def run_driver_per_task_mode(task_names, headless):
+    results = {}
+
+    def worker(name, sampler):
+        driver = create_driver(headless)
+        sampler.pids.append(driver_pid(driver))
+        try:
+            results[name] = get_task(name).load()(driver)
+        except Exception:
+            results[name] = False
+        finally:
+            driver.quit()
+
+    with PeakSampler() as sampler:
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=(name, sampler)) for name in task_names]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    return elapsed, sampler.peak_mb, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pestañas vs un driver por tarea')
+    parser.add_argument('--tasks', nargs='+', default=['buttons', 'droppable', 'webtables'])
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--no-headless', action='store_true')
+    args = parser.parse_args()
+
+    # El nivel HTTP evitaría el navegador en webtables: forzar Selenium para comparar
+    os.environ['WEBTABLES_LIGHT_TIER'] = '0'
+    headless = not args.no_headless
+
+    modes = {
+        'pestañas (1 navegador)': run_tabs_mode,
+        '1 navegador por tarea': run_driver_per_task_mode,
+    }
+    summary = {}
+    for label, runner in modes.items():
+        times, peaks, passed = [], [], []
+        for _ in range(args.runs):
+            elapsed, peak_mb, results = runner(args.tasks, headless)
+            times.append(elapsed)
+            peaks.append(peak_mb)
+            passed.append(sum(1 for r in results.values() if r))
+        summary[label] = (times, peaks, passed)
+
+    print(f"\n=== {len(args.tasks)} tareas: {', '.join(args.tasks)} ({args.runs} rondas) ===")
+    for label, (times, peaks, passed) in summary.items():
+        throughput = len(args.tasks) / statistics.median(times) * 60
+        print(
+            f"{label:<24} tiempo mediana={statistics.median(times):6.1f}s  "
+            f"RSS pico mediana={statistics.median(peaks):7.0f} MB  "
+            f"tareas/min={throughput:5.1f}  OK={min(passed)}/{len(args.tasks)}"
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
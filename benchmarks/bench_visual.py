@@ -0,0 +1,116 @@
+"""
+Benchmark: comparaciones visuales por segundo sobre un conjunto grande
+Genera N capturas sintéticas (UI plana con bloques y texto simulado) y sus
+líneas base, y mide cada nivel de la comparación:
+    - hash exacto (frames sin cambios, el caso común)
+    - pHash (descarte rápido de cambios grandes)
+    - diff completo vectorizado (cambios pequeños)
+    - diff en Python puro sobre una muestra (referencia)
+
+Uso:
+    python benchmarks/bench_visual.py --images 200 --width 1280 --height 800
+    python benchmarks/bench_visual.py --images 50 --python-sample 2
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.visual import VisualStore, diff_pixels  # noqa: E402
+
+
+def synthetic_frame(rng, width, height):
+    frame = np.full((height, width, 3), 245, dtype=np.uint8)
+    for _ in range(12):
+        x, y = rng.integers(0, width - 200), rng.integers(0, height - 60)
+        frame[y:y + rng.integers(20, 60), x:x + rng.integers(80, 200)] = rng.integers(0, 200, 3)
+    # Texto simulado: líneas finas de alto contraste
+    for row in range(40, height - 40, 24):
+        frame[row:row + 2, 40:rng.integers(200, width - 40)] = 30
+    return frame
+
+
+def small_change(frame, rng):
+    changed = frame.copy()
+    x, y = rng.integers(0, frame.shape[1] - 4), rng.integers(0, frame.shape[0] - 4)
+    changed[y:y + 3, x:x + 3] = 0
+    return changed
+
+
+def big_change(frame):
+    return np.ascontiguousarray(frame[::-1])
+
+
+def python_diff(actual, baseline, tolerance):
+    height, width = actual.shape[:2]
+    a, b = actual.tolist(), baseline.tolist()
+    changed = 0
+    for y in range(height):
+        for x in range(width):
+            if max(abs(p - q) for p, q in zip(a[y][x], b[y][x])) > tolerance:
+                changed += 1
+    return changed / (height * width)
+
+
+def rate(label, count, seconds):
+    print(f"{label:<24} {count / seconds:9.1f} comparaciones/s  ({seconds / count * 1000:8.2f} ms c/u)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Comparaciones visuales por segundo')
+    parser.add_argument('--images', type=int, default=200)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=800)
+    parser.add_argument('--python-sample', type=int, default=1, help='Imágenes del diff en Python puro')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    rng = np.random.default_rng(7)
+    workdir = tempfile.mkdtemp(prefix='rpa-visual-')
+    store = VisualStore(os.path.join(workdir, 'baselines'), os.path.join(workdir, 'output'))
+    frames = [synthetic_frame(rng, args.width, args.height) for _ in range(args.images)]
+
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        store.save_baseline(f'frame-{i}', frame, rects=[(0, 0, 200, 30)])
+    baseline_seconds = time.perf_counter() - start
+
+    print(f"\n=== {args.images} capturas {args.width}x{args.height} ===")
+    rate('crear línea base', args.images, baseline_seconds)
+
+    def run(label, variant):
+        variants = [variant(frame) for frame in frames]
+        start = time.perf_counter()
+        statuses = [store.compare(f'frame-{i}', pixels, rects=[(0, 0, 200, 30)])['status']
+                    for i, pixels in enumerate(variants)]
+        rate(label, len(variants), time.perf_counter() - start)
+        return statuses
+
+    run('sin cambios (hash)', lambda frame: frame)
+    run('cambio grande (pHash)', big_change)
+    run('cambio pequeño (diff)', lambda frame: small_change(frame, rng))
+
+    # Diff puro (sin E/S) para aislar el costo del cálculo
+    pairs = [(small_change(frame, rng), frame) for frame in frames]
+    start = time.perf_counter()
+    for actual, baseline in pairs:
+        diff_pixels(actual, baseline)
+    rate('diff NumPy (solo cálculo)', len(pairs), time.perf_counter() - start)
+
+    sample = pairs[:args.python_sample]
+    if sample:
+        start = time.perf_counter()
+        for actual, baseline in sample:
+            python_diff(actual, baseline, 8)
+        rate('diff Python puro', len(sample), time.perf_counter() - start)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
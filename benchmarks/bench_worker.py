@@ -0,0 +1,67 @@
+"""
+Benchmark: trabajos por hora del worker vs invocaciones one-shot de main.py
+
+Uso:
+    python benchmarks/bench_worker.py --task buttons --jobs 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.job_queue import JobQueue  # noqa: E402
+from worker import Worker  # noqa: E402
+
+
+def run_one_shot(task, jobs):
+    start = time.perf_counter()
+    failures = 0
+    for _ in range(jobs):
+        result = subprocess.run(
+            [sys.executable, os.path.join(ROOT, 'main.py'), '--task', task,
+             '--headless', '--no-history', '--force'],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        failures += result.returncode != 0
+    return time.perf_counter() - start, failures
+
+
+def run_worker(task, jobs, max_jobs_per_browser):
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(os.path.join(tmp, 'jobs.db'))
+        queue.enqueue(task, count=jobs)
+        worker = Worker(queue, headless=True, max_jobs_per_browser=max_jobs_per_browser)
+        start = time.perf_counter()
+        stats = worker.run(exit_when_empty=True)
+        elapsed = time.perf_counter() - start
+        queue.close()
+    return elapsed, stats['failed']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Worker vs CLI one-shot')
+    parser.add_argument('--task', default='buttons')
+    parser.add_argument('--jobs', type=int, default=10)
+    parser.add_argument('--max-jobs-per-browser', type=int, default=50)
+    args = parser.parse_args()
+
+    results = {
+        'CLI one-shot': run_one_shot(args.task, args.jobs),
+        'worker': run_worker(args.task, args.jobs, args.max_jobs_per_browser),
+    }
+
+    print(f"\n=== {args.jobs} trabajos '{args.task}' ===")
+    for label, (elapsed, failures) in results.items():
+        print(f"{label:<14} {elapsed:7.1f}s  {args.jobs / elapsed * 3600:7.0f} trabajos/hora  fallos={failures}")
+    speedup = results['CLI one-shot'][0] / results['worker'][0]
+    print(f"\nMejora del worker: {speedup:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
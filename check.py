@@ -1,13 +1,24 @@
 """
 Script de verificación de entorno
-Valida conexión a BD, driver de Chrome, y dependencias
+Valida conexión a BD, driver de Firefox, y dependencias
+Las verificaciones corren en paralelo, con timeout individual y caché con TTL
 """
 import sys
+import json
+import time
+import argparse
+import contextlib
+import hashlib
+import shutil
+import subprocess
+import threading
 import logging
 from selenium import webdriver
 from selenium.webdriver.firefox.service import Service
+from selenium.webdriver.chrome.service import Service as ChromeService
 from webdriver_manager.firefox import GeckoDriverManager
 from app.db import test_connection
+from utils.remote_nodes import parse_nodes, probe_node
 from dotenv import load_dotenv
 import os
 
@@ -17,6 +28,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Navegadores abiertos por las verificaciones, por hilo: si el plazo vence se
+# cierran desde fuera para no dejar Firefox/geckodriver huérfanos
+_check_drivers = {}
+_cancelled_checks = set()
+_check_drivers_lock = threading.Lock()
+
+
+class CheckCancelled(Exception):
+    """
+    La verificación superó su plazo y fue cancelada
+    """
+
+
+def _track_driver(driver):
+    """
+    Registra el navegador de la verificación del hilo actual
+
+    Raises:
+        CheckCancelled: Si el plazo venció mientras el navegador arrancaba (se cierra)
+    """
+    thread = threading.current_thread()
+    with _check_drivers_lock:
+        cancelled = thread in _cancelled_checks
+        if not cancelled:
+            _check_drivers[thread] = driver
+    if cancelled:
+        driver.quit()
+        raise CheckCancelled("navegador cerrado: la verificación superó su plazo")
+    return driver
+
+
+def _release_driver(driver):
+    """
+    Cierra el navegador salvo que ya lo haya cerrado cancel_check
+    """
+    with _check_drivers_lock:
+        owned = _check_drivers.pop(threading.current_thread(), None) is driver
+    if owned:
+        driver.quit()
+
+
+def cancel_check(thread):
+    """
+    Cancela una verificación vencida: cierra su navegador si llegó a abrirlo
+    """
+    with _check_drivers_lock:
+        _cancelled_checks.add(thread)
+        driver = _check_drivers.pop(thread, None)
+    if driver is not None:
+        try:
+            driver.quit()
+            logger.info("Navegador de la verificación vencida cerrado")
+        except Exception as e:
+            logger.warning(f"No se pudo cerrar el navegador de la verificación vencida: {e}")
+
 
 def check_environment():
     """
@@ -25,7 +91,13 @@ def check_environment():
     logger.info("=== Verificando variables de entorno ===")
     load_dotenv()
     
-    required_vars = ['DB_HOST', 'DB_USER', 'DB_PASSWORD', 'DB_NAME']
+    backend = os.getenv('DB_BACKEND', 'mysql').strip().lower()
+    logger.info(f"Backend de BD: {backend}")
+    
+    if backend == 'sqlite':
+        required_vars = []
+    else:
+        required_vars = ['DB_HOST', 'DB_USER', 'DB_PASSWORD', 'DB_NAME']
     missing_vars = []
     
     for var in required_vars:
@@ -46,45 +118,131 @@ def check_environment():
 
 def check_database_connection():
     """
-    Verifica la conexión a MySQL
+    Verifica la conexión a la base de datos (MySQL o SQLite)
     """
-    logger.info("\n=== Verificando conexión a MySQL ===")
+    logger.info("\n=== Verificando conexión a base de datos ===")
     try:
         if test_connection():
-            logger.info("✓ Conexión a MySQL exitosa")
+            logger.info("✓ Conexión a base de datos exitosa")
             return True
         else:
-            logger.error("✗ No se pudo conectar a MySQL")
+            logger.error("✗ No se pudo conectar a la base de datos")
             return False
     except Exception as e:
-        logger.error(f"✗ Error al conectar a MySQL: {e}")
+        logger.error(f"✗ Error al conectar a la base de datos: {e}")
         logger.info("Verifica que MySQL esté corriendo y las credenciales sean correctas")
         return False
 
 
-def check_firefox_driver():
+def check_firefox_driver(fast=False):
     """
     Verifica que el driver de Firefox funcione
+    
+    Args:
+        fast (bool): Si True, solo valida geckodriver y el binario de Firefox
+            sin abrir el navegador
     """
     logger.info("\n=== Verificando Firefox WebDriver ===")
+    if fast:
+        return check_firefox_binaries()
+    
     driver = None
     try:
         options = webdriver.FirefoxOptions()
         options.add_argument('--headless')
         
         service = Service(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service, options=options)
+        driver = _track_driver(webdriver.Firefox(service=service, options=options))
         
-        driver.get('https://www.google.com')
+        # Página local: valida el navegador sin depender de la red
+        driver.get('about:blank')
         logger.info("✓ Firefox WebDriver funciona correctamente")
         return True
         
     except Exception as e:
-        logger.error(f"✗ Error con Chrome WebDriver: {e}")
+        logger.error(f"✗ Error con Firefox WebDriver: {e}")
         return False
     finally:
         if driver:
-            driver.quit()
+            _release_driver(driver)
+
+
+def check_firefox_binaries():
+    """
+    Verificación rápida: geckodriver responde y Firefox está instalado
+    """
+    try:
+        driver_path = GeckoDriverManager().install()
+        result = subprocess.run(
+            [driver_path, '--version'],
+            capture_output=True, text=True, timeout=10
+        )
+        if result.returncode != 0:
+            logger.error(f"✗ geckodriver no responde: {result.stderr.strip()}")
+            return False
+        logger.info(f"✓ {result.stdout.splitlines()[0]}")
+        
+        firefox_path = shutil.which('firefox') or shutil.which('firefox-esr')
+        if not firefox_path:
+            logger.error("✗ Firefox no encontrado en el PATH")
+            return False
+        logger.info(f"✓ Firefox encontrado: {firefox_path}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"✗ Error verificando geckodriver/Firefox: {e}")
+        return False
+
+
+def check_chromium_driver(fast=False):
+    """
+    Verifica que Chromium y chromedriver funcionen (BROWSER=chromium)
+    
+    Args:
+        fast (bool): Si True, solo valida que el binario de Chromium exista
+    """
+    logger.info("\n=== Verificando Chromium WebDriver ===")
+    binary = (os.getenv('CHROME_BINARY') or shutil.which('chromium')
+              or shutil.which('chromium-browser') or shutil.which('google-chrome'))
+    if not binary:
+        logger.error("✗ Chromium no encontrado (define CHROME_BINARY)")
+        return False
+    logger.info(f"✓ Chromium encontrado: {binary}")
+    if fast:
+        return True
+    
+    driver = None
+    try:
+        options = webdriver.ChromeOptions()
+        options.add_argument('--headless=new')
+        options.binary_location = binary
+        service = ChromeService(executable_path=os.getenv('CHROMEDRIVER_PATH') or None)
+        driver = _track_driver(webdriver.Chrome(service=service, options=options))
+        driver.get('about:blank')
+        logger.info("✓ Chromium WebDriver funciona correctamente")
+        return True
+    except Exception as e:
+        logger.error(f"✗ Error con Chromium WebDriver: {e}")
+        return False
+    finally:
+        if driver:
+            _release_driver(driver)
+
+
+def check_webdriver_nodes():
+    """
+    Verifica los nodos WebDriver remotos (WEBDRIVER_NODES): basta uno sano
+    """
+    logger.info("\n=== Verificando nodos WebDriver remotos ===")
+    nodes = parse_nodes(os.getenv('WEBDRIVER_NODES', ''))
+    healthy = 0
+    for node in nodes:
+        if probe_node(node.url):
+            healthy += 1
+            logger.info(f"✓ {node.url} responde (capacidad {node.capacity})")
+        else:
+            logger.error(f"✗ {node.url} no responde")
+    return healthy > 0
 
 
 def check_python_version():
@@ -132,31 +290,271 @@ def check_dependencies():
     return True
 
 
-def main():
+CACHE_FILE = '.check_cache.json'
+DEFAULT_CACHE_TTL = 300
+
+
+def build_checks(fast=False):
+    """
+    Lista de verificaciones: (nombre, función, timeout en segundos)
+    """
+    checks = [
+        ('Python', check_python_version, 5),
+        ('Dependencias', check_dependencies, 15),
+        ('Variables de entorno', check_environment, 5),
+        ('Base de datos', check_database_connection, 10),
+    ]
+    if os.getenv('WEBDRIVER_NODES', '').strip():
+        checks.append(('Nodos WebDriver', check_webdriver_nodes, 15))
+    elif os.getenv('BROWSER', 'firefox').strip().lower() == 'chromium':
+        checks.append(('Chromium Driver', lambda: check_chromium_driver(fast=fast), 30 if fast else 60))
+    else:
+        checks.append(('Firefox Driver', lambda: check_firefox_driver(fast=fast), 30 if fast else 60))
+    return checks
+
+
+def environment_fingerprint(fast=False):
+    """
+    Huella del entorno: si cambia, la caché de verificaciones se invalida
+    """
+    load_dotenv()
+    keys = ['DB_BACKEND', 'DB_HOST', 'DB_PORT', 'DB_USER', 'DB_PASSWORD', 'DB_NAME', 'SQLITE_PATH',
+            'WEBDRIVER_NODES', 'BROWSER', 'CHROME_BINARY', 'CHROMEDRIVER_PATH']
+    data = {key: os.getenv(key) for key in keys}
+    data['python'] = sys.version
+    data['fast'] = fast
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def load_cache(path, fingerprint, ttl):
+    """
+    Carga los resultados exitosos vigentes (edad < ttl) de la caché
+
+    Returns:
+        dict: {nombre: {'ok', 'elapsed', 'checked_at'}}
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(data, dict) or data.get('fingerprint') != fingerprint:
+        return {}
+    
+    now = time.time()
+    return {
+        name: entry for name, entry in data.get('results', {}).items()
+        if entry.get('ok') and now - entry.get('checked_at', 0) < ttl
+    }
+
+
+def save_cache(path, fingerprint, results):
+    """
+    Guarda los resultados exitosos para reutilizarlos en la próxima ejecución
+    """
+    data = {
+        'fingerprint': fingerprint,
+        'results': {name: entry for name, entry in results.items() if entry['ok']},
+    }
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+    except OSError as e:
+        logger.warning(f"No se pudo guardar la caché de verificaciones: {e}")
+
+
+class CheckLogBuffer(logging.Filter):
+    """
+    Retiene los registros de cada hilo de verificación para emitirlos juntos
+
+    Se instala como filtro de los handlers del logger raíz: así las secciones
+    '=== ... ===' de verificaciones paralelas no se entremezclan.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # Por objeto Thread: el ident de un hilo terminado se reutiliza
+        self._buffers = {}
+        self._lock = threading.Lock()
+
+    def capture(self):
+        """
+        Empieza a retener los registros del hilo actual
+        """
+        with self._lock:
+            self._buffers[threading.current_thread()] = []
+
+    def filter(self, record):
+        if getattr(record, 'check_flushed', False):
+            return True
+        with self._lock:
+            # Los handlers filtran en el hilo que registra
+            buffer = self._buffers.get(threading.current_thread())
+            if buffer is None:
+                return True
+            if record not in buffer:
+                buffer.append(record)
+        return False
+
+    def flush(self, thread):
+        """
+        Emite lo retenido del hilo; lo que registre después sale sin retener
+        """
+        with self._lock:
+            records = self._buffers.pop(thread, [])
+        for record in records:
+            record.check_flushed = True
+            logging.getLogger(record.name).handle(record)
+
+    @contextlib.contextmanager
+    def installed(self):
+        handlers = list(logging.getLogger().handlers)
+        for handler in handlers:
+            handler.addFilter(self)
+        try:
+            yield self
+        finally:
+            for handler in handlers:
+                handler.removeFilter(self)
+
+
+def run_check_with_deadline(func, log_buffer=None):
+    """
+    Inicia una verificación en un hilo daemon (el plazo se aplica con join)
+    
+    Args:
+        func (callable): Verificación
+        log_buffer (CheckLogBuffer): Retiene los logs del hilo (opcional)
+    
+    Returns:
+        threading.Thread, dict: Hilo y contenedor del resultado
+    """
+    outcome = {'ok': False, 'error': None, 'elapsed': None}
+    
+    def target():
+        if log_buffer is not None:
+            log_buffer.capture()
+        start = time.perf_counter()
+        try:
+            outcome['ok'] = bool(func())
+        except Exception as e:
+            outcome['error'] = str(e)
+        finally:
+            outcome['elapsed'] = time.perf_counter() - start
+    
+    # Daemon: una verificación colgada no impide terminar el proceso
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+def run_checks(checks, cached=None):
+    """
+    Ejecuta en paralelo las verificaciones que no estén en caché
+    
+    Los logs de cada verificación se emiten juntos, en el orden declarado. Si
+    una vence su plazo, se emite lo que registró hasta entonces y se cierra el
+    navegador que haya abierto.
+    
+    Args:
+        checks (list): Lista de (nombre, función, timeout)
+        cached (dict): Resultados vigentes de la caché
+    
+    Returns:
+        dict: {nombre: {'ok', 'elapsed', 'checked_at', 'cached', 'timed_out'}}
+    """
+    cached = cached or {}
+    results = {}
+    running = {}
+    
+    with CheckLogBuffer().installed() as log_buffer:
+        for name, func, timeout in checks:
+            if name in cached:
+                results[name] = dict(cached[name], cached=True, timed_out=False)
+                continue
+            start = time.perf_counter()
+            thread, outcome = run_check_with_deadline(func, log_buffer)
+            running[name] = (thread, outcome, start, start + timeout)
+        
+        for name, (thread, outcome, start, deadline) in running.items():
+            thread.join(max(0.0, deadline - time.perf_counter()))
+            timed_out = thread.is_alive()
+            log_buffer.flush(thread)
+            if timed_out:
+                logger.error(f"✗ {name}: tiempo máximo excedido")
+                cancel_check(thread)
+            elif outcome['error']:
+                logger.error(f"✗ {name}: {outcome['error']}")
+            results[name] = {
+                'ok': outcome['ok'] and not timed_out,
+                'elapsed': time.perf_counter() - start if timed_out else outcome['elapsed'],
+                'checked_at': time.time(),
+                'cached': False,
+                'timed_out': timed_out,
+            }
+    
+    # Conservar el orden de declaración en el resumen
+    return {name: results[name] for name, _, _ in checks}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Verificación de entorno - RPA System')
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help='Verifica driver y BD sin abrir el navegador ni cargar páginas'
+    )
+    parser.add_argument(
+        '--ttl',
+        type=float,
+        default=float(os.getenv('CHECK_CACHE_TTL', DEFAULT_CACHE_TTL)),
+        help='Segundos de validez de los resultados en caché (0 desactiva la caché)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignora la caché y ejecuta todas las verificaciones'
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """
     Ejecuta todas las verificaciones
     """
+    args = parse_args(argv)
+    
     logger.info("="*60)
     logger.info("ENVIRONMENT VERIFICATION - RPA SYSTEM")
     logger.info("="*60)
     
-    checks = {
-    'Python': check_python_version(),
-    'Dependencias': check_dependencies(),
-    'Variables de entorno': check_environment(),
-    'Base de datos': check_database_connection(),
-    'Firefox Driver': check_firefox_driver()
-}
+    use_cache = not args.no_cache and args.ttl > 0
+    fingerprint = environment_fingerprint(args.fast)
+    cached = load_cache(CACHE_FILE, fingerprint, args.ttl) if use_cache else {}
+    
+    start = time.perf_counter()
+    checks = run_checks(build_checks(args.fast), cached)
+    total_elapsed = time.perf_counter() - start
+    
+    if use_cache:
+        save_cache(CACHE_FILE, fingerprint, checks)
     
     logger.info("\n" + "="*60)
     logger.info("RESUMEN DE VERIFICACIONES")
     logger.info("="*60)
     
     for check_name, result in checks.items():
-        status = "✓ OK" if result else "✗ FALLÓ"
-        logger.info(f"{check_name}: {status}")
+        if result['timed_out']:
+            status = "✗ TIMEOUT"
+        else:
+            status = "✓ OK" if result['ok'] else "✗ FALLÓ"
+        origin = " [caché]" if result['cached'] else ""
+        logger.info(f"{check_name}: {status} ({result['elapsed']:.2f}s){origin}")
+    
+    logger.info(f"Tiempo total: {total_elapsed:.2f}s")
     
-    all_passed = all(checks.values())
+    all_passed = all(result['ok'] for result in checks.values())
     
     if all_passed:
         logger.info("\n✓ ¡Todas las verificaciones pasaron exitosamente!")
@@ -171,4 +569,4 @@ def main():
 
 if __name__ == '__main__':
     exit_code = main()
-    sys.exit(exit_code)
\ No newline at end of file
+    sys.exit(exit_code)
@@ -4,15 +4,59 @@ URL: https://demoqa.com/buttons
 Ejecutar Double Click, Right Click y Dynamic Click
 """
 import logging
+import os
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver import ActionChains
 from utils.selectors import BUTTON_SELECTORS
 from utils.utils import wait_for_element, wait_for_clickable, take_screenshot
-import time
+from utils.timing import timed_step
+from utils.timeouts import record_wait, wait_timeout
+from utils.locators import candidates_for, record_resolution
+from utils.clock import get_clock, wait_until
 
 logger = logging.getLogger(__name__)
 
+BUTTONS_URL = 'https://demoqa.com/buttons'
 
+# Interacción -> (selector del botón, selector del mensaje, texto esperado)
+INTERACTIONS = {
+    'double_click': ('double_click', 'double_click_message', "You have done a double click"),
+    'right_click': ('right_click', 'right_click_message', "You have done a right click"),
+    'dynamic_click': ('dynamic_click', 'dynamic_click_message', "You have done a dynamic click"),
+}
+
+# Localiza los tres botones en una llamada (CSS o XPath según el selector,
+# primer candidato que exista de cada uno, ver utils/locators.py) y los lleva
+# al viewport: las acciones W3C no hacen scroll por sí solas
+LOCATE_BUTTONS_SCRIPT = """
+const find = (selector) => /^[(.]?\\//.test(selector)
+    ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(selector);
+const found = [];
+const used = [];
+for (const candidates of arguments[0]) {
+    const index = candidates.findIndex((selector) => find(selector));
+    if (index < 0) {
+        return null;
+    }
+    found.push(find(candidates[index]));
+    used.push(index);
+}
+found[0].scrollIntoView({block: 'center'});
+return {found: found, used: used, fingerprint: location.host + location.pathname};
+"""
+
+# Lee los tres mensajes en una llamada (null si aún no aparecieron)
+READ_MESSAGES_SCRIPT = """
+return arguments[0].map((selector) => {
+    const el = document.querySelector(selector);
+    return el ? el.textContent : null;
+});
+"""
+
+
+@timed_step()
 def perform_double_click(driver):
     """
     Ejecuta doble click en el botón correspondiente
@@ -31,7 +75,7 @@ def perform_double_click(driver):
         actions.double_click(button).perform()
         
         logger.info("Doble click ejecutado")
-        time.sleep(0.5)
+        get_clock().sleep(0.5)
         
         # Validar mensaje
         message = wait_for_element(driver, BUTTON_SELECTORS['double_click_message'])
@@ -50,6 +94,7 @@ def perform_double_click(driver):
         raise
 
 
+@timed_step()
 def perform_right_click(driver):
     """
     Ejecuta click derecho en el botón correspondiente
@@ -66,10 +111,10 @@ def perform_right_click(driver):
         # Realizar click derecho
         actions = ActionChains(driver)
         actions.context_click(button).perform()
-        time.sleep(1.5)  # Agregar espera
+        get_clock().sleep(1.5)  # Agregar espera
         
         logger.info("Click derecho ejecutado")
-        time.sleep(0.5)
+        get_clock().sleep(0.5)
         
         # Validar mensaje
         message = wait_for_element(driver, BUTTON_SELECTORS['right_click_message'])
@@ -88,6 +133,7 @@ def perform_right_click(driver):
         raise
 
 
+@timed_step()
 def perform_dynamic_click(driver):
     """
     Ejecuta click en el botón dinámico
@@ -110,7 +156,7 @@ def perform_dynamic_click(driver):
         button.click()
         
         logger.info("Click dinámico ejecutado")
-        time.sleep(0.5)
+        get_clock().sleep(0.5)
         
         # Validar mensaje
         message = wait_for_element(driver, BUTTON_SELECTORS['dynamic_click_message'])
@@ -129,24 +175,104 @@ def perform_dynamic_click(driver):
         raise
 
 
-def execute_buttons_task(driver):
+@timed_step()
+def perform_batched_clicks(driver, timeout=None):
+    """
+    Ejecuta las tres interacciones en un solo request de acciones W3C y valida
+    los tres mensajes con un solo execute_script
+    
+    Args:
+        driver: WebDriver instance
+        timeout (int): Espera máxima de botones y mensajes (por defecto el plazo
+            del presupuesto de la tarea)
+    
+    Returns:
+        dict: {interacción: bool} con el resultado de cada validación
+    """
+    names = list(INTERACTIONS)
+    button_selectors = [BUTTON_SELECTORS[INTERACTIONS[name][0]] for name in names]
+    message_selectors = [BUTTON_SELECTORS[INTERACTIONS[name][1]] for name in names]
+    
+    # Grupo de selectores como clave del plazo aprendido
+    buttons_key = ', '.join(button_selectors)
+    messages_key = ', '.join(message_selectors)
+    
+    clock = get_clock()
+    start = clock.monotonic()
+    located = wait_until(
+        driver, lambda d: d.execute_script(LOCATE_BUTTONS_SCRIPT, [candidates_for(s) for s in button_selectors]),
+        timeout or wait_timeout(buttons_key), poll_frequency=0.1
+    )
+    record_wait(buttons_key, clock.monotonic() - start, ok=True)
+    for selector, index in zip(button_selectors, located['used']):
+        record_resolution(selector, located['fingerprint'], index)
+    double_button, right_button, dynamic_button = located['found']
+    
+    # Las tres secuencias de puntero viajan en un único perform()
+    ActionChains(driver, duration=0) \
+        .double_click(double_button) \
+        .context_click(right_button) \
+        .click(dynamic_button) \
+        .perform()
+    logger.info("Doble click, click derecho y click dinámico ejecutados (lote)")
+    
+    # Esperar hasta que los tres mensajes existan; normalmente basta una lectura
+    def all_messages(d):
+        texts = d.execute_script(READ_MESSAGES_SCRIPT, message_selectors)
+        return texts if all(texts) else False
+    
+    start = clock.monotonic()
+    try:
+        messages = wait_until(driver, all_messages, timeout or wait_timeout(messages_key), poll_frequency=0.1)
+        record_wait(messages_key, clock.monotonic() - start, ok=True)
+    except TimeoutException:
+        record_wait(messages_key, clock.monotonic() - start, ok=False)
+        messages = driver.execute_script(READ_MESSAGES_SCRIPT, message_selectors)
+    
+    results = {}
+    for name, message in zip(names, messages):
+        expected_text = INTERACTIONS[name][2]
+        results[name] = bool(message) and expected_text in message
+        if results[name]:
+            logger.info(f"✓ Mensaje de {name} validado: '{message}'")
+        else:
+            logger.warning(f"✗ Mensaje incorrecto en {name}: '{message}'")
+            take_screenshot(driver, f'{name}_error.png')
+    return results
+
+
+def execute_buttons_task(driver, url=BUTTONS_URL):
     """
     Ejecuta la tarea completa de botones
     
+    BUTTONS_MODE='batched' (por defecto) agrupa las interacciones en un request
+    de acciones; si el lote falla por un error de WebDriver se repite con el
+    flujo secuencial. BUTTONS_MODE='sequential' usa siempre el flujo original.
+    
     Args:
         driver: WebDriver instance
+        url (str): URL de la página (permite usar fixtures locales)
     """
     logger.info("=== Iniciando tarea: BUTTONS ===")
     
-    driver.get('https://demoqa.com/buttons')
+    driver.get(url)
     logger.info("Navegando a Buttons")
     
-    # Ejecutar las tres interacciones
-    results = {
-        'double_click': perform_double_click(driver),
-        'right_click': perform_right_click(driver),
-        'dynamic_click': perform_dynamic_click(driver)
-    }
+    results = None
+    if os.getenv('BUTTONS_MODE', 'batched').strip().lower() == 'batched':
+        try:
+            results = perform_batched_clicks(driver)
+        except WebDriverException as e:
+            logger.warning(f"Lote de interacciones falló, se usa el flujo secuencial: {e}")
+            driver.get(url)
+    
+    if results is None:
+        # Ejecutar las tres interacciones
+        results = {
+            'double_click': perform_double_click(driver),
+            'right_click': perform_right_click(driver),
+            'dynamic_click': perform_dynamic_click(driver)
+        }
     
     # Verificar resultados
     all_passed = all(results.values())
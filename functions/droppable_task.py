@@ -4,26 +4,34 @@ URL: https://demoqa.com/droppable
 Arrastrar elemento y validar estado "Dropped!"
 """
 import logging
-from selenium.webdriver import ActionChains
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
 from utils.selectors import DROPPABLE_SELECTORS
-from utils.utils import wait_for_element, take_screenshot
-import time
+from utils.utils import wait_for_element, take_screenshot, visual_checkpoint
+from utils.timing import timed_step
+from utils.drag import drag_and_drop
 
 logger = logging.getLogger(__name__)
 
+DROPPABLE_URL = 'https://demoqa.com/droppable'
+EXPECTED_TEXT = "Dropped!"
 
-def perform_drag_and_drop(driver):
+
+@timed_step()
+def perform_drag_and_drop(driver, url=DROPPABLE_URL):
     """
     Realiza la acción de drag & drop
     
     Args:
         driver: WebDriver instance
+        url (str): URL de la página (permite usar fixtures locales)
     
     Returns:
         bool: True si la validación es exitosa
     """
     try:
-        driver.get('https://demoqa.com/droppable')
+        driver.get(url)
         logger.info("Navegando a Droppable")
         
         # Esperar que los elementos estén disponibles
@@ -34,24 +42,25 @@ def perform_drag_and_drop(driver):
         initial_text = droppable.text
         logger.info(f"Texto inicial del área de drop: '{initial_text}'")
         
-        # Realizar drag & drop (método alternativo para Firefox)
-        actions = ActionChains(driver)
-        actions.click_and_hold(draggable).pause(1).move_to_element(droppable).pause(1).release().perform()
-        
-        logger.info("Drag & Drop ejecutado")
-        time.sleep(1)
+        # Realizar drag & drop; el drop se confirma con el cambio de texto del área
+        dropped = EC.text_to_be_present_in_element(
+            (By.CSS_SELECTOR, DROPPABLE_SELECTORS['droppable_text']), EXPECTED_TEXT
+        )
+        try:
+            strategy = drag_and_drop(driver, draggable, droppable, dropped)
+            logger.info(f"Drag & Drop ejecutado (estrategia: {strategy})")
+        except TimeoutException as e:
+            logger.warning(f"Drag & Drop sin confirmación: {e}")
         
         # Validar el cambio de estado
         droppable_text_element = wait_for_element(driver, DROPPABLE_SELECTORS['droppable_text'])
         final_text = droppable_text_element.text
         
-        expected_text = "Dropped!"
-        
-        if expected_text in final_text:
+        if EXPECTED_TEXT in final_text:
             logger.info(f"✓ Validación exitosa - Texto cambió a: '{final_text}'")
-            return True
+            return visual_checkpoint(driver, 'droppable-dropped', element=droppable)
         else:
-            logger.warning(f"✗ Validación fallida - Texto esperado: '{expected_text}', obtenido: '{final_text}'")
+            logger.warning(f"✗ Validación fallida - Texto esperado: '{EXPECTED_TEXT}', obtenido: '{final_text}'")
             return False
             
     except Exception as e:
@@ -5,48 +5,58 @@ URL: https://demoqa.com/automation-practice-form
 import logging
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-import time
 from utils.selectors import FORM_SELECTORS
 from utils.utils import (
     wait_for_element, 
     wait_for_clickable, 
     scroll_to_element,
     create_test_image,
-    take_screenshot
+    take_screenshot,
+    visual_checkpoint
 )
+from utils.timing import timed_step
+from utils.clock import get_clock
 
 logger = logging.getLogger(__name__)
 
+FORM_URL = 'https://demoqa.com/automation-practice-form'
+MODAL_VISUAL_MASKS = ('.modal-body tbody tr:nth-child(2) td:nth-child(2)',)
 
-def fill_form(driver):
+# Datos de prueba
+FORM_DATA = {
+    'first_name': 'Juan',
+    'last_name': 'Pérez',
+    'email': 'juan.perez@example.com',
+    'gender': 'Male',
+    'mobile': '1234567890',
+    'date_of_birth': '15 Oct 1990',
+    'subjects': ['Maths', 'Physics'],
+    'hobbies': ['Sports', 'Reading'],
+    'current_address': 'Calle Principal 123, Ciudad',
+    'state': 'NCR',
+    'city': 'Delhi'
+}
+
+
+@timed_step()
+def fill_form(driver, url=FORM_URL, form_data=None):
     """
     Completa todos los campos del formulario
     
     Args:
         driver: WebDriver instance
+        url (str): URL del formulario
+        form_data (dict): Datos a enviar (por defecto FORM_DATA); los campos de
+            selección (género, hobbies, estado, ciudad) son fijos
     
     Returns:
         dict: Datos enviados para validación
     """
+    form_data = form_data or FORM_DATA
     try:
-        driver.get('https://demoqa.com/automation-practice-form')
+        driver.get(url)
         logger.info("Navegando a formulario de práctica")
         
-        # Datos de prueba
-        form_data = {
-            'first_name': 'Juan',
-            'last_name': 'Pérez',
-            'email': 'juan.perez@example.com',
-            'gender': 'Male',
-            'mobile': '1234567890',
-            'date_of_birth': '15 Oct 1990',
-            'subjects': ['Maths', 'Physics'],
-            'hobbies': ['Sports', 'Reading'],
-            'current_address': 'Calle Principal 123, Ciudad',
-            'state': 'NCR',
-            'city': 'Delhi'
-        }
-        
         # First Name
         first_name_input = wait_for_element(driver, FORM_SELECTORS['first_name'])
         first_name_input.send_keys(form_data['first_name'])
@@ -62,9 +72,9 @@ def fill_form(driver):
         # Gender - Male
         gender_radio = wait_for_clickable(driver, FORM_SELECTORS['gender_male'])
         scroll_to_element(driver, gender_radio)
-        time.sleep(0.5)
+        get_clock().sleep(0.5)
         scroll_to_element(driver, gender_radio)
-        time.sleep(0.5)
+        get_clock().sleep(0.5)
         driver.execute_script("arguments[0].click();", gender_radio)
         
         # Mobile
@@ -84,7 +94,7 @@ def fill_form(driver):
         scroll_to_element(driver, subjects_input)
         for subject in form_data['subjects']:
             subjects_input.send_keys(subject)
-            time.sleep(0.5)
+            get_clock().sleep(0.5)
             subjects_input.send_keys(Keys.ENTER)
         
         # Hobbies
@@ -110,14 +120,14 @@ def fill_form(driver):
         state_dropdown = wait_for_clickable(driver, FORM_SELECTORS['state'])
         scroll_to_element(driver, state_dropdown)
         state_dropdown.click()
-        time.sleep(0.5)
+        get_clock().sleep(0.5)
         state_option = wait_for_clickable(driver, FORM_SELECTORS['state_option'])
         state_option.click()
         
         # City - Delhi
         city_dropdown = wait_for_clickable(driver, FORM_SELECTORS['city'])
         city_dropdown.click()
-        time.sleep(0.5)
+        get_clock().sleep(0.5)
         city_option = wait_for_clickable(driver, FORM_SELECTORS['city_option'])
         city_option.click()
         
@@ -135,6 +145,7 @@ def fill_form(driver):
         raise
 
 
+@timed_step()
 def validate_modal(driver, form_data):
     """
     Valida el modal de confirmación
@@ -149,7 +160,7 @@ def validate_modal(driver, form_data):
     """
     try:
         # Esperar modal
-        modal_title = wait_for_element(driver, FORM_SELECTORS['modal_title'], timeout=10)
+        modal_title = wait_for_element(driver, FORM_SELECTORS['modal_title'])
         assert 'Thanks for submitting the form' in modal_title.text
         logger.info("Modal de confirmación detectado")
         
@@ -177,6 +188,10 @@ def validate_modal(driver, form_data):
                 logger.warning(f"✗ Validación fallida - {label}: esperado '{expected_value}'")
                 all_valid = False
         
+        # El email cambia por usuario virtual en loadgen: fila enmascarada
+        if not visual_checkpoint(driver, 'form-modal', element=modal_body, masks=MODAL_VISUAL_MASKS):
+            all_valid = False
+        
         # Cerrar modal
         close_button = wait_for_clickable(driver, FORM_SELECTORS['close_modal'])
         close_button.click()
@@ -189,16 +204,17 @@ def validate_modal(driver, form_data):
         raise
 
 
-def execute_form_task(driver):
+def execute_form_task(driver, url=FORM_URL):
     """
     Ejecuta la tarea completa del formulario
     
     Args:
         driver: WebDriver instance
+        url (str): URL del formulario
     """
     logger.info("=== Iniciando tarea: FORMULARIO ===")
-    form_data = fill_form(driver)
-    time.sleep(2)  # Esperar que el modal aparezca
+    form_data = fill_form(driver, url=url)
+    get_clock().sleep(2)  # Esperar que el modal aparezca
     validation_result = validate_modal(driver, form_data)
     
     if validation_result:
@@ -0,0 +1,169 @@
+"""
+Registro de tareas
+Cada tarea declara nombre, entradas, salidas y función de huella (fingerprint);
+los resultados se memorizan en disco para saltar tareas sin cambios
+"""
+import hashlib
+import importlib
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Entradas comunes: destino de los datos (si cambia, la tarea debe re-ejecutarse)
+DB_INPUTS = ('DB_BACKEND', 'DB_HOST', 'DB_PORT', 'DB_NAME', 'SQLITE_PATH')
+
+
+class TaskSpec:
+    """
+    Declaración de una tarea
+
+    Las funciones se referencian como 'modulo:funcion' y se importan al usarlas,
+    así registrar una tarea no carga sus dependencias.
+    """
+
+    def __init__(self, name, label, target, inputs=(), outputs=(), fingerprint=None, version=1):
+        """
+        Args:
+            name (str): Nombre usado en el CLI (--task)
+            label (str): Nombre para los logs
+            target (str): 'modulo:funcion' que recibe el driver
+            inputs (tuple): Variables de entorno que afectan el resultado
+            outputs (tuple): Artefactos que produce (informativo)
+            fingerprint (str): 'modulo:funcion' sin argumentos que retorna una huella
+                del estado de la página (o None si no puede darla); None si la
+                tarea no es memorizable
+            version (int): Incrementar para invalidar resultados memorizados
+        """
+        self.name = name
+        self.label = label
+        self.target = target
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.fingerprint = fingerprint
+        self.version = version
+
+    @property
+    def memoizable(self):
+        return self.fingerprint is not None
+
+    def load(self):
+        """
+        Returns:
+            callable: Función de la tarea (importa el módulo la primera vez)
+        """
+        return _resolve(self.target)
+
+    def compute_fingerprint(self):
+        """
+        Huella de las entradas de la tarea
+
+        Returns:
+            str: sha256, o None si la tarea no es memorizable o la función de
+                huella no pudo establecer el estado (hay que ejecutarla)
+        """
+        if not self.memoizable:
+            return None
+        state = _resolve(self.fingerprint)()
+        if state is None:
+            return None
+        payload = {
+            'task': self.name,
+            'version': self.version,
+            'inputs': {name: os.getenv(name) for name in self.inputs},
+            'state': state,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _resolve(reference):
+    module_name, _, attr = reference.partition(':')
+    return getattr(importlib.import_module(module_name), attr)
+
+
+TASKS = {
+    spec.name: spec for spec in (
+        TaskSpec(
+            'form', 'Formulario', 'functions.form_task:execute_form_task',
+            outputs=('modal_validation',)
+        ),
+        TaskSpec(
+            'webtables', 'WebTables', 'functions.webtables_task:execute_webtables_task',
+            inputs=DB_INPUTS,
+            outputs=('employees',),
+            fingerprint='functions.webtables_task:webtables_fingerprint'
+        ),
+        TaskSpec(
+            'buttons', 'Buttons', 'functions.buttons_task:execute_buttons_task',
+            outputs=('click_validation',)
+        ),
+        TaskSpec(
+            'droppable', 'Droppable', 'functions.droppable_task:execute_droppable_task',
+            outputs=('drop_validation',)
+        ),
+    )
+}
+
+
+def get_task(name):
+    """
+    Returns:
+        TaskSpec: Tarea registrada
+
+    Raises:
+        KeyError: Si la tarea no existe
+    """
+    if name not in TASKS:
+        raise KeyError(f"Tarea desconocida: {name}")
+    return TASKS[name]
+
+
+def task_names():
+    return list(TASKS)
+
+
+class TaskMemo:
+    """
+    Resultados memorizados en disco: un archivo JSON por tarea
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.getenv('TASK_CACHE_DIR', '.task_cache')
+
+    def _path(self, task_name):
+        return os.path.join(self.directory, f'{task_name}.json')
+
+    def get(self, task_name, fingerprint):
+        """
+        Returns:
+            dict: Entrada memorizada si coincide la huella, None si no
+        """
+        if fingerprint is None:
+            return None
+        try:
+            with open(self._path(task_name), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('fingerprint') == fingerprint else None
+
+    def put(self, task_name, fingerprint, result):
+        """
+        Guarda el resultado (escritura atómica)
+        """
+        if fingerprint is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {'fingerprint': fingerprint, 'result': result, 'stored_at': time.time()}
+        tmp_path = self._path(task_name) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp_path, self._path(task_name))
+
+    def invalidate(self, task_name):
+        try:
+            os.remove(self._path(task_name))
+        except FileNotFoundError:
+            pass
@@ -2,86 +2,232 @@
 Tarea: Extraer registros de WebTables y guardar en MySQL
 URL: https://demoqa.com/webtables
 Extrae solo registro 1 y 3 (ignora el 2)
+Extracción por niveles: HTML estático primero, Selenium como respaldo
 """
+import hashlib
+import json
 import logging
-from selenium.webdriver.common.by import By
+import os
 from utils.selectors import WEBTABLE_SELECTORS
-from utils.utils import wait_for_element, take_screenshot
-from app.db import insert_employee, get_all_employees
+from utils.utils import take_screenshot
+from utils.tiered import TierStats, run_tiers, fetch_html, select_rows_text, find_json_records
+from utils.timing import timed_step
+from utils.devtools import evaluate, wait_for_selector
+from utils.locators import candidates_for, record_resolution
+from utils.checkpoint import current_checkpoint
+from app.db import insert_employee, insert_employees, get_all_employees, get_employee_by_email
 
 logger = logging.getLogger(__name__)
 
+WEBTABLES_URL = 'https://demoqa.com/webtables'
 
-def extract_row_data(row):
+# Extraer solo registro 1 y 3 (índices 0 y 2)
+TARGET_INDICES = [0, 2]
+
+ROW_FIELDS = ['first_name', 'last_name', 'age', 'email', 'salary', 'department']
+
+# Estadísticas de acierto y latencia por nivel (http / selenium)
+tier_stats = TierStats()
+
+# Textos de las filas objetivo en una sola llamada (Runtime.evaluate en Chromium)
+# Filas y celdas llegan como candidatos por rango (ver utils/locators.py): se
+# usa el primero que encuentre algo y se informa cuál fue
+BULK_ROWS_SCRIPT = """
+const [rowCandidates, cellCandidates, indices] = arguments;
+const rowIndex = rowCandidates.findIndex((selector) => document.querySelector(selector));
+const rows = rowIndex >= 0 ? document.querySelectorAll(rowCandidates[rowIndex]) : [];
+const targets = indices.filter((i) => i < rows.length);
+const cells = {};
+for (const [field, candidates] of Object.entries(cellCandidates)) {
+    cells[field] = targets.length ? candidates.findIndex((selector) => rows[targets[0]].querySelector(selector)) : -1;
+}
+return {
+    count: rows.length,
+    used: {rows: rowIndex, cells: cells},
+    fingerprint: location.host + location.pathname,
+    rows: targets.map((i) => {
+        const values = {};
+        for (const [field, candidates] of Object.entries(cellCandidates)) {
+            const cell = cells[field] >= 0 ? rows[i].querySelector(candidates[cells[field]]) : null;
+            values[field] = cell ? cell.innerText : null;
+        }
+        return [i, values];
+    })
+};
+"""
+
+
+def build_row_data(values):
     """
-    Extrae los datos de una fila de la tabla
+    Convierte los textos de una fila en el diccionario de empleado
     
     Args:
-        row: WebElement de la fila
+        values (dict): {campo: texto} para cada campo de ROW_FIELDS
     
     Returns:
         dict: Datos de la fila o None si está vacía
     """
-    try:
-        first_name = row.find_element(By.CSS_SELECTOR, WEBTABLE_SELECTORS['first_name']).text.strip()
-        
-        # Si la fila está vacía, retornar None
-        if not first_name:
-            return None
-        
-        last_name = row.find_element(By.CSS_SELECTOR, WEBTABLE_SELECTORS['last_name']).text.strip()
-        age = row.find_element(By.CSS_SELECTOR, WEBTABLE_SELECTORS['age']).text.strip()
-        email = row.find_element(By.CSS_SELECTOR, WEBTABLE_SELECTORS['email']).text.strip()
-        salary = row.find_element(By.CSS_SELECTOR, WEBTABLE_SELECTORS['salary']).text.strip()
-        department = row.find_element(By.CSS_SELECTOR, WEBTABLE_SELECTORS['department']).text.strip()
-        
-        return {
-            'first_name': first_name,
-            'last_name': last_name,
-            'age': int(age) if age else 0,
-            'email': email,
-            'salary': float(salary) if salary else 0.0,
-            'department': department
-        }
-    except Exception as e:
-        logger.warning(f"Error extrayendo datos de fila: {e}")
+    first_name = (values.get('first_name') or '').strip()
+    
+    # Si la fila está vacía, retornar None
+    if not first_name:
         return None
+    
+    age = (values.get('age') or '').strip()
+    salary = (values.get('salary') or '').strip()
+    
+    return {
+        'first_name': first_name,
+        'last_name': (values.get('last_name') or '').strip(),
+        'age': int(age) if age else 0,
+        'email': (values.get('email') or '').strip(),
+        'salary': float(salary) if salary else 0.0,
+        'department': (values.get('department') or '').strip()
+    }
 
 
-def extract_webtables(driver):
+def webtables_fingerprint(url=WEBTABLES_URL):
+    """
+    Huella del estado de la tabla para el registro de tareas
+    
+    Se calcula sobre las filas que extrae el nivel HTTP (no sobre el HTML
+    servido: demoqa arma la tabla en el navegador, así que ese HTML no cambia
+    aunque cambien los datos). Si el nivel HTTP no obtiene filas válidas, o
+    alguna ya no está en la BD, no hay huella y la tarea se ejecuta.
+    
+    Returns:
+        str: sha256 de las filas objetivo, o None si la tarea debe ejecutarse
+    """
+    rows = _light_rows(fetch_html(url))
+    if not validate_rows(rows):
+        return None
+    if any(get_employee_by_email(row['email']) is None for row in rows):
+        return None
+    payload = json.dumps(
+        {'selectors': WEBTABLE_SELECTORS, 'indices': TARGET_INDICES, 'url': url, 'rows': rows},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def validate_rows(rows):
+    """
+    Valida que las filas extraídas tengan datos coherentes
+    
+    Args:
+        rows (list): Lista de diccionarios de empleados
+    
+    Returns:
+        bool: True si todas las filas son válidas
+    """
+    if not rows:
+        return False
+    for row in rows:
+        if not row.get('first_name') or '@' not in row.get('email', ''):
+            return False
+        if row['age'] < 0 or row['salary'] < 0:
+            return False
+    return True
+
+
+@timed_step()
+def extract_webtables_light(url=WEBTABLES_URL):
+    """
+    Nivel ligero: descarga el HTML sin navegador y lo parsea
+    Usa los mismos WEBTABLE_SELECTORS; si no hay filas, busca un payload JSON embebido
+    
+    Args:
+        url (str): URL de la página
+    
+    Returns:
+        list: Lista con los datos extraídos (vacía si el HTML no los trae)
+    """
+    extracted_data = _light_rows(fetch_html(url))
+    logger.info(f"Nivel HTTP: {len(extracted_data)} registros extraídos")
+    return extracted_data
+
+
+def _light_rows(html):
+    cell_selectors = {field: WEBTABLE_SELECTORS[field] for field in ROW_FIELDS}
+    
+    raw_rows = select_rows_text(html, WEBTABLE_SELECTORS['rows'], cell_selectors, TARGET_INDICES)
+    if not any(raw.get('first_name') for raw in raw_rows):
+        records = find_json_records(html, ROW_FIELDS)
+        raw_rows = [records[i] for i in TARGET_INDICES if i < len(records)]
+    
+    extracted_data = []
+    for raw in raw_rows:
+        row_data = build_row_data(raw)
+        if row_data:
+            extracted_data.append(row_data)
+    return extracted_data
+
+
+def extract_webtables_tiered(driver, url=WEBTABLES_URL):
+    """
+    Extrae los registros probando primero el nivel HTTP y luego Selenium
+    
+    El navegador solo se usa si el nivel ligero falla o no pasa la validación.
+    Se desactiva con WEBTABLES_LIGHT_TIER=0.
+    
+    Args:
+        driver: WebDriver instance
+        url (str): URL de la página
+    
+    Returns:
+        list: Lista con los datos extraídos
+    """
+    tiers = []
+    if os.getenv('WEBTABLES_LIGHT_TIER', '1') != '0':
+        tiers.append(('http', lambda: extract_webtables_light(url)))
+    tiers.append(('selenium', lambda: extract_webtables(driver, url)))
+    
+    tier_name, extracted_data = run_tiers(tiers, validate_rows, stats=tier_stats)
+    logger.info(f"Extracción resuelta por nivel: {tier_name or 'ninguno'}")
+    return extracted_data or []
+
+
+@timed_step()
+def extract_webtables(driver, url=WEBTABLES_URL):
     """
     Extrae el registro 1 y 3 de la tabla (ignora el 2)
     
     Args:
         driver: WebDriver instance
+        url (str): URL de la página
     
     Returns:
         list: Lista con los datos extraídos
     """
     try:
-        driver.get('https://demoqa.com/webtables')
+        driver.get(url)
         logger.info("Navegando a WebTables")
         
-        # Esperar que la tabla esté visible
-        wait_for_element(driver, WEBTABLE_SELECTORS['table'])
+        # Esperar la tabla dentro de la página (sin sondeo desde el cliente)
+        wait_for_selector(driver, WEBTABLE_SELECTORS['table'])
         
-        # Obtener todas las filas
-        rows = driver.find_elements(By.CSS_SELECTOR, WEBTABLE_SELECTORS['rows'])
-        logger.info(f"Se encontraron {len(rows)} filas en la tabla")
+        # Todas las celdas de las filas objetivo en una sola llamada
+        cell_candidates = {field: candidates_for(WEBTABLE_SELECTORS[field]) for field in ROW_FIELDS}
+        bulk = evaluate(
+            driver, BULK_ROWS_SCRIPT, candidates_for(WEBTABLE_SELECTORS['rows']), cell_candidates, TARGET_INDICES
+        )
+        logger.info(f"Se encontraron {bulk['count']} filas en la tabla")
+        used = bulk.get('used', {})
+        if used.get('rows', -1) >= 0:
+            record_resolution(WEBTABLE_SELECTORS['rows'], bulk['fingerprint'], used['rows'])
+        for field, index in used.get('cells', {}).items():
+            if index >= 0:
+                record_resolution(WEBTABLE_SELECTORS[field], bulk['fingerprint'], index)
         
         extracted_data = []
         
-        # Extraer solo registro 1 y 3 (índices 0 y 2)
-        target_indices = [0, 2]
-        
-        for index in target_indices:
-            if index < len(rows):
-                row_data = extract_row_data(rows[index])
-                if row_data:
-                    extracted_data.append(row_data)
-                    logger.info(f"✓ Registro {index + 1} extraído: {row_data['email']}")
-                else:
-                    logger.warning(f"Registro {index + 1} está vacío")
+        for index, values in bulk['rows']:
+            row_data = build_row_data(values)
+            if row_data:
+                extracted_data.append(row_data)
+                logger.info("✓ Registro %d extraído: %s", index + 1, row_data['email'])
+            else:
+                logger.warning("Registro %d está vacío", index + 1)
         
         logger.info(f"Total de registros extraídos: {len(extracted_data)}")
         return extracted_data
@@ -92,16 +238,48 @@ def extract_webtables(driver):
         raise
 
 
-def save_to_database(data_list):
+@timed_step()
+def save_to_database(data_list, checkpoint_key=None):
     """
-    Guarda los datos extraídos en MySQL
+    Guarda los datos extraídos en la base de datos
+    Upsert por lotes de WEBTABLES_BATCH_SIZE; si un lote falla, guarda registro
+    por registro. Con un checkpoint activo, el offset de filas guardadas se
+    registra tras cada lote y una ejecución reanudada continúa desde ahí (los
+    upserts por email hacen que repetir un lote sea inofensivo)
     
     Args:
         data_list (list): Lista de diccionarios con datos de empleados
+        checkpoint_key (str): Clave del offset en el checkpoint (opcional)
     
     Returns:
         int: Cantidad de registros insertados
     """
+    if not data_list:
+        return 0
+    
+    checkpoint = current_checkpoint() if checkpoint_key else None
+    start = checkpoint.offset(checkpoint_key) if checkpoint is not None else 0
+    if start:
+        logger.info(f"↷ {start}/{len(data_list)} registros ya guardados antes de la interrupción")
+    
+    batch_size = int(os.getenv('WEBTABLES_BATCH_SIZE', '500'))
+    inserted_count = 0
+    for offset in range(start, len(data_list), batch_size):
+        batch = data_list[offset:offset + batch_size]
+        inserted_count += _save_batch(batch)
+        if checkpoint is not None:
+            checkpoint.set_offset(checkpoint_key, offset + len(batch))
+    return inserted_count
+
+
+def _save_batch(data_list):
+    try:
+        inserted_count = insert_employees(data_list)
+        logger.info(f"✓ {inserted_count} empleados guardados en BD (lote)")
+        return inserted_count
+    except Exception as e:
+        logger.warning(f"Error en inserción por lote, reintentando por registro: {e}")
+    
     inserted_count = 0
     
     for data in data_list:
@@ -115,10 +293,10 @@ def save_to_database(data_list):
                 department=data['department']
             )
             inserted_count += 1
-            logger.info(f"✓ Empleado guardado en BD: {data['email']}")
+            logger.info("✓ Empleado guardado en BD: %s", data['email'])
             
         except Exception as e:
-            logger.error(f"Error al guardar empleado {data['email']}: {e}")
+            logger.error("Error al guardar empleado %s: %s", data['email'], e)
     
     return inserted_count
 
@@ -132,15 +310,24 @@ def execute_webtables_task(driver):
     """
     logger.info("=== Iniciando tarea: WEBTABLES ===")
     
-    # Extraer datos
-    extracted_data = extract_webtables(driver)
+    # Página ya extraída en una ejecución interrumpida: se reutilizan sus filas
+    checkpoint = current_checkpoint()
+    page_key = f'page:{WEBTABLES_URL}'
+    if checkpoint is not None and checkpoint.is_done(page_key):
+        extracted_data = checkpoint.result(page_key)
+        logger.info(f"↷ Página ya extraída (checkpoint): {len(extracted_data)} registros")
+    else:
+        # Extraer datos (HTTP primero, Selenium si es necesario)
+        extracted_data = extract_webtables_tiered(driver)
+        if extracted_data and checkpoint is not None:
+            checkpoint.mark_done(page_key, extracted_data)
     
     if not extracted_data:
         logger.warning("No se extrajeron datos de la tabla")
         return False
     
     # Guardar en base de datos
-    inserted_count = save_to_database(extracted_data)
+    inserted_count = save_to_database(extracted_data, checkpoint_key=f'rows:{WEBTABLES_URL}')
     
     logger.info(f"✓ Tarea WebTables completada: {inserted_count} registros guardados")
     
@@ -148,4 +335,10 @@ def execute_webtables_task(driver):
     all_employees = get_all_employees()
     logger.info(f"Total de empleados en BD: {len(all_employees)}")
     
+    for tier, stats in tier_stats.snapshot().items():
+        logger.info(
+            f"Nivel '{tier}': aciertos {stats['hit']}/{stats['attempts']} "
+            f"({stats['hit_rate']:.0%}), latencia media {stats['avg_latency']:.3f}s"
+        )
+    
     return True
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""
+Modo generador de carga: el flujo del formulario como usuarios virtuales
+Cada VU abre su propio navegador y repite fill_form + validate_modal contra
+la URL configurada; cada ventana se reporta throughput, tasa de errores y
+percentiles de latencia
+
+Uso:
+    python loadgen.py --users 5 --ramp-up 30s --duration 2m --think exp:2 --headless
+    python loadgen.py --stages 30s:5,2m:10,30s:0 --rate 1.5 --base-url https://staging.example.com
+    python loadgen.py --users 2 --duration 30s --headless \\
+        --base-url file://$PWD/tests/fixtures --path form.html
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from utils.loadgen import LoadGenerator, format_window, parse_duration, parse_stages, parse_think_time
+from utils.logs import setup_logging
+from utils.metrics import start_http_server, write_textfile
+
+load_dotenv()
+setup_logging()
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = 'https://demoqa.com'
+DEFAULT_PATH = '/automation-practice-form'
+
+
+def form_url(base_url, path):
+    return f"{base_url.rstrip('/')}/{path.lstrip('/')}"
+
+
+def form_iteration(url):
+    """
+    Returns:
+        callable: Iteración de un VU (datos únicos por VU e iteración)
+    """
+    from functions.form_task import FORM_DATA, fill_form, validate_modal
+
+    def iteration(driver, user, number):
+        data = dict(FORM_DATA, email=f'vu{user}.{number}@example.com')
+        submitted = fill_form(driver, url=url, form_data=data)
+        if not validate_modal(driver, submitted):
+            raise AssertionError('el modal no coincide con los datos enviados')
+    return iteration
+
+
+def build_stages(args):
+    if args.stages:
+        return parse_stages(args.stages)
+    stages = []
+    if args.ramp_up:
+        stages.append((parse_duration(args.ramp_up), args.users))
+    stages.append((parse_duration(args.duration), args.users))
+    return stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generador de carga sobre el flujo del formulario')
+    parser.add_argument('--users', type=int, default=1, help='Usuarios virtuales (sin --stages)')
+    parser.add_argument('--ramp-up', default=None, help='Rampa hasta --users (p. ej. 30s)')
+    parser.add_argument('--duration', default='1m', help='Duración a --users tras la rampa')
+    parser.add_argument('--stages', default=None, help='Plan de etapas "30s:5,2m:10,30s:0" (reemplaza --users)')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='Llegadas por segundo (modelo abierto); sin --rate cada VU itera tras --think')
+    parser.add_argument('--think', default='none', help='Think time: none | const:S | uniform:A-B | exp:MEDIA | normal:M,S')
+    parser.add_argument('--base-url', default=os.getenv('LOADGEN_BASE_URL', DEFAULT_BASE_URL))
+    parser.add_argument('--path', default=os.getenv('LOADGEN_PATH', DEFAULT_PATH))
+    parser.add_argument('--window', type=float, default=5.0, help='Segundos por ventana de reporte')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--browser', choices=('firefox', 'chromium'), default=None)
+    parser.add_argument('--metrics-port', type=int, default=None, help='Expone /metrics mientras corre')
+    parser.add_argument('--metrics-file', default=None, help='Escribe las métricas al terminar')
+    parser.add_argument('--summary-json', default=None, help='Escribe el resumen final en este archivo')
+    parser.add_argument('--verbose', action='store_true', help='Mantiene los logs por campo de cada iteración')
+    args = parser.parse_args(argv)
+
+    from main import create_driver
+
+    if not args.verbose:
+        # Con varios VUs los logs por campo ocultan el reporte por ventana
+        for name in ('functions', 'utils.utils', 'utils.metrics'):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    url = form_url(args.base_url, args.path)
+    stages = build_stages(args)
+    model = f"abierto ({args.rate}/s)" if args.rate else f"cerrado (think {args.think})"
+    logger.info(f"Carga sobre {url}: etapas {stages}, modelo {model}")
+
+    generator = LoadGenerator(
+        iteration=form_iteration(url),
+        session_factory=lambda: create_driver(args.headless, browser=args.browser),
+        stages=stages,
+        arrival_rate=args.rate,
+        think_time=parse_think_time(args.think),
+        window=args.window,
+        seed=args.seed,
+    )
+    metrics_server = start_http_server(args.metrics_port) if args.metrics_port else None
+    try:
+        summary = generator.run()
+    except KeyboardInterrupt:
+        generator.stop()
+        summary = generator.total.snapshot()
+    finally:
+        if metrics_server:
+            metrics_server.shutdown()
+        if args.metrics_file:
+            write_textfile(args.metrics_file)
+
+    logger.info("=" * 60)
+    logger.info(f"TOTAL {format_window(summary, summary.get('peak_users', 0))}")
+    logger.info(f"Iteraciones: {summary['iterations']}  errores: {summary['errors']} {summary['errors_by_type']}")
+    logger.info("=" * 60)
+    if args.summary_json:
+        with open(args.summary_json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
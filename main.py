@@ -4,16 +4,24 @@ Ejecuta las tareas de automatización RPA
 """
 import argparse
 import logging
-from selenium import webdriver
-from selenium.webdriver.firefox.service import Service
-from webdriver_manager.firefox import GeckoDriverManager
+import os
+import time
 from dotenv import load_dotenv
 
-from functions.form_task import execute_form_task
-from functions.webtables_task import execute_webtables_task
-from functions.buttons_task import execute_buttons_task
-from functions.droppable_task import execute_droppable_task
-from utils.utils import setup_logging
+# Solo módulos livianos al importar: Selenium, webdriver-manager, el proxy, el
+# perfilador y cada tarea se importan al usarse, así --help, los errores de
+# argumentos y worker.py no pagan dependencias que no van a usar
+from functions.registry import TASKS, TaskMemo, get_task, task_names
+from utils.logs import bind_context, setup_logging
+from utils.timing import task_timer
+from utils.timeouts import set_wait_environment, start_budget
+from utils.checkpoint import CheckpointStore, checkpoint_path, current_checkpoint, use_checkpoint
+from utils.procfs import ResourceSampler, driver_pid
+from utils.metrics import (
+    TASK_RUNS, TASK_DURATION, BROWSERS_ACTIVE,
+    BROWSER_RSS_PEAK, BROWSER_THREADS_PEAK, BROWSER_CPU_SECONDS,
+    instrument_driver, start_http_server, write_textfile
+)
 
 # Cargar variables de entorno
 load_dotenv()
@@ -23,95 +31,383 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 
-def create_driver(headless=False):
+BROWSERS = ('firefox', 'chromium')
+
+
+def _firefox_session(headless, profile_template, node_pool):
     """
-    Crea y configura el WebDriver de Firefox
+    Returns:
+        tuple: (WebDriver de Firefox, directorio del perfil clonado o None)
+    """
+    from selenium import webdriver
+    from selenium.webdriver.firefox.service import Service
+    from utils.browser_profile import clone_profile, remove_profile
+    from utils.replay_proxy import get_replay_proxy
+    
+    options = webdriver.FirefoxOptions()
+    
+    if headless:
+        options.add_argument('--headless')
+    
+    # Caché HTTP de grabación/reproducción (HTTP_CACHE_MODE)
+    replay_proxy = get_replay_proxy()
+    if replay_proxy is not None:
+        for name, value in replay_proxy.firefox_prefs().items():
+            options.set_preference(name, value)
+        options.accept_insecure_certs = True
+    
+    if node_pool is not None:
+        if profile_template:
+            logger.warning("La plantilla de perfil es local: se ignora en nodos remotos")
+        return node_pool.create_session(options), None
+    
+    profile_dir = None
+    if profile_template:
+        profile_dir = clone_profile(profile_template)
+        options.add_argument('-profile')
+        options.add_argument(profile_dir)
+        logger.info(f"Perfil clonado desde plantilla: {profile_dir}")
+    
+    # GECKODRIVER_PATH evita que webdriver_manager consulte la red (ejecuciones offline)
+    driver_path = os.getenv('GECKODRIVER_PATH')
+    if not driver_path:
+        from webdriver_manager.firefox import GeckoDriverManager
+        driver_path = GeckoDriverManager().install()
+    service = Service(driver_path)
+    try:
+        return webdriver.Firefox(service=service, options=options), profile_dir
+    except Exception:
+        if profile_dir:
+            remove_profile(profile_dir)
+        raise
+
+
+def _chromium_session(headless, profile_template, node_pool):
+    """
+    Returns:
+        tuple: (WebDriver de Chromium, None)
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from utils.devtools import block_requests
+    from utils.replay_proxy import get_replay_proxy
+    
+    options = webdriver.ChromeOptions()
+    
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--disable-dev-shm-usage')
+    if os.getenv('CHROME_BINARY'):
+        options.binary_location = os.getenv('CHROME_BINARY')
+    if profile_template:
+        logger.warning("La plantilla de perfil es de Firefox: se ignora en Chromium")
+    
+    replay_proxy = get_replay_proxy()
+    if replay_proxy is not None:
+        options.add_argument(f'--proxy-server={replay_proxy.url}')
+        options.accept_insecure_certs = True
+    
+    if node_pool is not None:
+        return node_pool.create_session(options), None
+    
+    # Sin CHROMEDRIVER_PATH, Selenium Manager resuelve el driver
+    service = ChromeService(executable_path=os.getenv('CHROMEDRIVER_PATH') or None)
+    driver = webdriver.Chrome(service=service, options=options)
+    
+    # Fast path CDP: no descargar anuncios ni analítica (BLOCK_URL_PATTERNS, 'none' lo desactiva)
+    patterns = os.getenv('BLOCK_URL_PATTERNS', '').strip()
+    if not patterns:
+        block_requests(driver)
+    elif patterns.lower() != 'none':
+        block_requests(driver, [p.strip() for p in patterns.split(',') if p.strip()])
+    return driver, None
+
+
+def create_driver(headless=False, profile_template=None, browser=None):
+    """
+    Crea y configura el WebDriver
+    
+    Con WEBDRIVER_NODES la sesión se crea en el nodo remoto menos cargado
+    (ver utils/remote_nodes.py); si no, se inicia un navegador local.
     
     Args:
         headless (bool): Si True, ejecuta en modo headless
+        profile_template (str): Plantilla de perfil pre-sembrado a clonar
+            (por defecto FIREFOX_PROFILE_TEMPLATE; sin plantilla usa un perfil nuevo)
+        browser (str): 'firefox' o 'chromium' (por defecto BROWSER, o firefox)
     
     Returns:
-        WebDriver: Instancia configurada de Firefox WebDriver
+        WebDriver: Instancia configurada del WebDriver
     """
-    options = webdriver.FirefoxOptions()
+    browser = (browser or os.getenv('BROWSER') or 'firefox').strip().lower()
+    if browser not in BROWSERS:
+        raise ValueError(f"Navegador no soportado: '{browser}' (opciones: {', '.join(BROWSERS)})")
     
-    if headless:
-        options.add_argument('--headless')
+    from utils.remote_nodes import get_node_pool
+    
+    profile_template = profile_template or os.getenv('FIREFOX_PROFILE_TEMPLATE')
+    session = _firefox_session if browser == 'firefox' else _chromium_session
+    driver, profile_dir = session(headless, profile_template, get_node_pool())
     
-    service = Service(GeckoDriverManager().install())
-    driver = webdriver.Firefox(service=service, options=options)
+    instrument_driver(driver)
     
-    # Establecer timeouts
-    driver.implicitly_wait(10)
+    from utils.ratelimit import get_rate_limiter, rate_limit_driver
+    
+    limiter = get_rate_limiter()
+    if limiter is not None:
+        rate_limit_driver(driver, limiter)
+    BROWSERS_ACTIVE.inc()
+    original_quit = driver.quit
+    
+    def quit_and_cleanup():
+        try:
+            original_quit()
+        finally:
+            BROWSERS_ACTIVE.dec()
+            if profile_dir:
+                from utils.browser_profile import remove_profile
+                remove_profile(profile_dir)
+    
+    driver.quit = quit_and_cleanup
+    
+    # Sin espera implícita: se sumaría a cada espera explícita y haría que un
+    # find_element sobre un elemento ausente bloquee 10s. Las esperas toman su
+    # plazo del presupuesto de la tarea (utils/timeouts.py)
     driver.set_page_load_timeout(30)
     
     return driver
 
 
-def execute_task(task_name, headless=False):
+class LazyDriver:
+    """
+    Proxy que crea el WebDriver solo en el primer uso
+    
+    Permite que tareas resueltas sin navegador (p. ej. nivel HTTP de WebTables)
+    no paguen el arranque de Firefox.
+    """
+    
+    def __init__(self, factory):
+        self._factory = factory
+        self._driver = None
+    
+    @property
+    def started(self):
+        return self._driver is not None
+    
+    def unwrap(self):
+        """
+        Returns:
+            WebDriver: El driver real (lo crea si aún no existe)
+        """
+        return self._get_driver()
+    
+    def _get_driver(self):
+        if self._driver is None:
+            self._driver = self._factory()
+            logger.info("WebDriver iniciado correctamente")
+        return self._driver
+    
+    def __getattr__(self, name):
+        return getattr(self._get_driver(), name)
+    
+    def quit(self):
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+            logger.info("WebDriver cerrado")
+
+
+def session_pid(driver):
+    """
+    Returns:
+        int: pid del driver de la sesión; None si el navegador no arrancó
+            (un LazyDriver sin usar no se inicia por consultarlo)
+    """
+    if isinstance(driver, LazyDriver):
+        return driver_pid(driver.unwrap()) if driver.started else None
+    return driver_pid(driver)
+
+
+def run_measured_task(task_name, task_function, driver, recorder=None):
+    """
+    Ejecuta una tarea registrando duración, pasos, consumo del navegador y resultado
+    
+    El muestreo de recursos (RSS, CPU, hilos de geckodriver + Firefox) corre en
+    un hilo cada RESOURCE_SAMPLE_INTERVAL segundos (0.5 por defecto, 0 lo desactiva).
+    En modo pestañas las cifras corresponden al navegador compartido.
+    Las esperas de la tarea se reparten su presupuesto de tiempo (TASK_BUDGET).
+    
+    Args:
+        task_name (str): Nombre de la tarea
+        task_function (callable): Función de la tarea (recibe el driver)
+        driver: WebDriver instance
+        recorder (RunRecorder): Historial de la ejecución (opcional)
+    
+    Returns:
+        Resultado de la tarea
+    """
+    status = 'error'
+    interval = float(os.getenv('RESOURCE_SAMPLE_INTERVAL', '0.5'))
+    sampler = ResourceSampler(lambda: session_pid(driver), interval) if interval > 0 else None
+    try:
+        with task_timer(task_name) as timings:
+            timings.budget = start_budget(task_name)
+            if sampler is None:
+                result = task_function(driver)
+            else:
+                with sampler:
+                    result = task_function(driver)
+        status = 'success' if result else 'warning'
+        return result
+    finally:
+        TASK_DURATION.labels(task_name).observe(timings.duration)
+        TASK_RUNS.labels(task_name, status).inc()
+        if sampler is not None:
+            timings.resources = sampler.summary()
+            _report_resources(task_name, timings.resources)
+        if recorder is not None:
+            recorder.record_task(timings, status)
+
+
+def _report_resources(task_name, resources):
+    if resources is None:
+        return
+    BROWSER_RSS_PEAK.labels(task_name).set(resources['rss_peak_mb'] * 1024 * 1024)
+    BROWSER_THREADS_PEAK.labels(task_name).set(resources['threads_peak'])
+    BROWSER_CPU_SECONDS.labels(task_name).inc(resources['cpu_seconds'])
+    logger.info(
+        f"Recursos del navegador en '{task_name}': "
+        f"RSS pico {resources['rss_peak_mb']:.0f} MB (media {resources['rss_mean_mb']:.0f} MB), "
+        f"CPU {resources['cpu_seconds']:.1f}s ({resources['cpu_cores_mean']:.2f} núcleos), "
+        f"hilos pico {resources['threads_peak']}"
+    )
+
+
+def run_registered_task(spec, driver, recorder=None, memo=None):
+    """
+    Ejecuta una tarea del registro, saltándola si su huella no cambió
+    
+    Args:
+        spec (TaskSpec): Tarea registrada
+        driver: WebDriver instance
+        recorder (RunRecorder): Historial de la ejecución (opcional)
+        memo (TaskMemo): Resultados memorizados (None desactiva la memoización)
+    
+    Returns:
+        Resultado de la tarea
+    """
+    checkpoint = current_checkpoint()
+    checkpoint_key = f'task:{spec.name}'
+    if checkpoint is not None and checkpoint.is_done(checkpoint_key):
+        logger.info(f"↷ {spec.label}: completada antes de la interrupción, se salta (checkpoint)")
+        TASK_RUNS.labels(spec.name, 'resumed').inc()
+        return checkpoint.result(checkpoint_key)
+    
+    fingerprint = None
+    if memo is not None and spec.memoizable:
+        try:
+            fingerprint = spec.compute_fingerprint()
+        except Exception as e:
+            logger.warning(f"No se pudo calcular la huella de '{spec.name}': {e}")
+        cached = memo.get(spec.name, fingerprint)
+        if cached is not None:
+            logger.info(f"↷ {spec.label}: entradas sin cambios, se reutiliza el resultado memorizado")
+            TASK_RUNS.labels(spec.name, 'cached').inc()
+            return cached['result']
+    
+    result = run_measured_task(spec.name, spec.load(), driver, recorder)
+    if result and fingerprint is not None:
+        memo.put(spec.name, fingerprint, result)
+    if result and checkpoint is not None:
+        checkpoint.mark_done(checkpoint_key, result)
+    return result
+
+
+def execute_task(task_name, headless=False, profile_template=None, recorder=None, memo=None,
+                 tabs=False, browser=None, checkpoint=None):
     """
     Ejecuta una tarea específica
     
+    Con un checkpoint, las tareas (y las páginas y filas de webtables) que ya
+    terminaron en una ejecución interrumpida se saltan; si todo termina bien el
+    checkpoint se descarta.
+    
     Args:
         task_name (str): Nombre de la tarea a ejecutar
         headless (bool): Modo headless
+        profile_template (str): Plantilla de perfil de Firefox (opcional)
+        recorder (RunRecorder): Historial de la ejecución (opcional)
+        memo (TaskMemo): Resultados memorizados (opcional)
+        tabs (bool): Con 'all', ejecutar cada tarea en una pestaña del mismo navegador
+        browser (str): 'firefox' o 'chromium' (por defecto BROWSER)
+        checkpoint (CheckpointStore): Avances de una ejecución previa (opcional)
     """
     driver = None
     try:
-        driver = create_driver(headless)
-        logger.info(f"WebDriver iniciado correctamente")
+        driver = LazyDriver(lambda: create_driver(headless, profile_template, browser))
+        
+        with use_checkpoint(checkpoint):
+            if task_name == 'all':
+                completed = all(execute_all_tasks(driver, recorder, memo, tabs).values())
+            elif task_name in TASKS:
+                completed = bool(run_registered_task(get_task(task_name), driver, recorder, memo))
+            else:
+                logger.error(f"Tarea desconocida: {task_name}")
+                completed = False
         
-        if task_name == 'form':
-            execute_form_task(driver)
-        elif task_name == 'webtables':
-            execute_webtables_task(driver)
-        elif task_name == 'buttons':
-            execute_buttons_task(driver)
-        elif task_name == 'droppable':
-            execute_droppable_task(driver)
-        elif task_name == 'all':
-            execute_all_tasks(driver)
-        else:
-            logger.error(f"Tarea desconocida: {task_name}")
+        if checkpoint is not None and completed:
+            checkpoint.clear()
             
     except Exception as e:
         logger.error(f"Error ejecutando tarea '{task_name}': {e}")
         raise
     finally:
+        if checkpoint is not None and checkpoint.state:
+            checkpoint.close()
+            logger.info(f"Checkpoint conservado para reanudar: {checkpoint.path}")
         if driver:
             driver.quit()
-            logger.info("WebDriver cerrado")
 
 
-def execute_all_tasks(driver):
+def execute_all_tasks(driver, recorder=None, memo=None, tabs=False):
     """
-    Ejecuta todas las tareas en secuencia
+    Ejecuta todas las tareas del registro en secuencia
     
     Args:
         driver: WebDriver instance
+        recorder (RunRecorder): Historial de la ejecución (opcional)
+        memo (TaskMemo): Resultados memorizados (opcional)
+        tabs (bool): Ejecutar las tareas en paralelo, una pestaña por tarea
+    
+    Returns:
+        dict: {tarea: resultado}
     """
     logger.info("\n" + "="*60)
-    logger.info("EJECUTANDO TODAS LAS TAREAS")
+    logger.info("EJECUTANDO TODAS LAS TAREAS" + (" (UNA PESTAÑA POR TAREA)" if tabs else ""))
     logger.info("="*60 + "\n")
     
-    tasks = [
-        ('Formulario', execute_form_task),
-        ('WebTables', execute_webtables_task),
-        ('Buttons', execute_buttons_task),
-        ('Droppable', execute_droppable_task)
-    ]
-    
     results = {}
     
-    for task_name, task_function in tasks:
-        try:
-            logger.info(f"\n>>> Ejecutando: {task_name}")
-            result = task_function(driver)
-            results[task_name] = result
-            logger.info(f"<<< {task_name}: {'✓ COMPLETADO' if result else '⚠ COMPLETADO CON ADVERTENCIAS'}\n")
-        except Exception as e:
-            logger.error(f"<<< {task_name}: ✗ ERROR - {e}\n")
-            results[task_name] = False
+    if tabs:
+        from utils.tabs import run_in_tabs
+        
+        real_driver = driver.unwrap() if isinstance(driver, LazyDriver) else driver
+        tab_tasks = [
+            (spec.label, lambda tab, spec=spec: run_registered_task(spec, tab, recorder, memo))
+            for spec in TASKS.values()
+        ]
+        results = run_in_tabs(real_driver, tab_tasks)
+    else:
+        for spec in TASKS.values():
+            task_name = spec.label
+            try:
+                logger.info(f"\n>>> Ejecutando: {task_name}")
+                result = run_registered_task(spec, driver, recorder, memo)
+                results[task_name] = result
+                logger.info(f"<<< {task_name}: {'✓ COMPLETADO' if result else '⚠ COMPLETADO CON ADVERTENCIAS'}\n")
+            except Exception as e:
+                logger.error(f"<<< {task_name}: ✗ ERROR - {e}\n")
+                results[task_name] = False
     
     # Resumen final
     logger.info("\n" + "="*60)
@@ -127,6 +423,7 @@ def execute_all_tasks(driver):
     
     logger.info(f"\nTareas exitosas: {success_count}/{total_count}")
     logger.info("="*60)
+    return results
 
 
 def main():
@@ -144,6 +441,7 @@ Ejemplos de uso:
   python main.py --task buttons          # Solo botones
   python main.py --task droppable        # Solo Drag & Drop
   python main.py --task all --headless   # Todas en modo headless
+  python main.py --task all --profile-wire  # Perfil de comandos WebDriver
         """
     )
     
@@ -151,7 +449,7 @@ Ejemplos de uso:
         '--task',
         type=str,
         required=True,
-        choices=['form', 'webtables', 'buttons', 'droppable', 'all'],
+        choices=task_names() + ['all'],
         help='Tarea a ejecutar'
     )
     
@@ -161,6 +459,74 @@ Ejemplos de uso:
         help='Ejecutar en modo headless (sin interfaz gráfica)'
     )
     
+    parser.add_argument(
+        '--browser',
+        choices=BROWSERS,
+        default=None,
+        help='Navegador (por defecto BROWSER o firefox)'
+    )
+    
+    parser.add_argument(
+        '--profile-template',
+        type=str,
+        default=None,
+        help='Plantilla de perfil de Firefox a clonar por sesión (ver utils/browser_profile.py)'
+    )
+    
+    parser.add_argument(
+        '--metrics-file',
+        type=str,
+        default=os.getenv('METRICS_FILE'),
+        help='Escribe las métricas (formato Prometheus) en este archivo al terminar'
+    )
+    
+    parser.add_argument(
+        '--tabs',
+        action='store_true',
+        help='Con --task all: ejecuta las tareas en paralelo en pestañas de un solo navegador'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Ejecuta todas las tareas aunque sus entradas no hayan cambiado'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Reanuda una ejecución interrumpida desde su checkpoint (por defecto empieza de cero)'
+    )
+    
+    parser.add_argument(
+        '--no-checkpoint',
+        action='store_true',
+        help='No registrar avances (una caída obliga a repetir todo)'
+    )
+    
+    parser.add_argument(
+        '--no-history',
+        action='store_true',
+        help='No guardar la ejecución en el historial (ver python -m app.history --report)'
+    )
+    
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        default=None,
+        help='Expone /metrics en este puerto mientras se ejecuta'
+    )
+    
+    parser.add_argument(
+        '--profile-wire',
+        nargs='?',
+        const='wire_profile.folded',
+        default=None,
+        metavar='ARCHIVO',
+        help='Perfila los comandos WebDriver: reporte de puntos calientes y pilas para flame graph '
+             '(por defecto wire_profile.folded)'
+    )
+    
     args = parser.parse_args()
     
     logger.info("="*60)
@@ -170,12 +536,57 @@ Ejemplos de uso:
     logger.info(f"Modo headless: {'Sí' if args.headless else 'No'}")
     logger.info("="*60 + "\n")
     
+    from utils.locators import log_locator_drift
+    from utils.ratelimit import log_rate_limit_stats
+    from utils.replay_proxy import log_cache_stats
+    
+    metrics_server = start_http_server(args.metrics_port) if args.metrics_port else None
+    profiler = None
+    if args.profile_wire:
+        from utils.wire_profiler import WireProfiler
+        profiler = WireProfiler().install()
+    # Los plazos de espera se aprenden solo de ejecuciones en estas mismas condiciones
+    environment = {'headless': args.headless, 'http_cache': os.getenv('HTTP_CACHE_MODE', 'off'),
+                   'browser': args.browser or os.getenv('BROWSER') or 'firefox'}
+    set_wait_environment(**environment)
+    recorder = None
+    if not args.no_history:
+        from app.history import RunRecorder
+        recorder = RunRecorder(
+            command=f"--task {args.task}",
+            metadata={'task': args.task, 'profile_template': bool(args.profile_template), **environment}
+        )
+        bind_context(run_id=recorder.run_id)
+    
+    checkpoint = None
+    if not args.no_checkpoint:
+        checkpoint = CheckpointStore(checkpoint_path(f'main-{args.task}'))
+        if checkpoint.resumed and not args.resume:
+            logger.info(f"Checkpoint previo descartado (usa --resume para reanudar): {checkpoint.path}")
+            checkpoint.clear()
+    
     try:
-        execute_task(args.task, args.headless)
+        memo = None if args.force else TaskMemo()
+        execute_task(args.task, args.headless, args.profile_template, recorder, memo, args.tabs,
+                     args.browser, checkpoint)
         logger.info("\n✓ Ejecución completada exitosamente")
     except Exception as e:
         logger.error(f"\n✗ Ejecución falló: {e}")
         return 1
+    finally:
+        if profiler is not None:
+            profiler.uninstall()
+            logger.info("\n" + profiler.report())
+            profiler.write_folded(args.profile_wire)
+        log_cache_stats()
+        log_rate_limit_stats()
+        log_locator_drift()
+        if recorder is not None:
+            recorder.finish()
+        if args.metrics_file:
+            write_textfile(args.metrics_file)
+        if metrics_server:
+            metrics_server.shutdown()
     
     return 0
 
@@ -11,4 +11,55 @@ CREATE TABLE IF NOT EXISTS employees (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_email (email)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
\ No newline at end of file
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Historial de ejecuciones (RUN_HISTORY_BACKEND=mysql)
+CREATE TABLE IF NOT EXISTS run_history (
+    run_id CHAR(32) PRIMARY KEY,
+    started_at DOUBLE NOT NULL,
+    finished_at DOUBLE,
+    command VARCHAR(255),
+    hostname VARCHAR(255),
+    metadata TEXT
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS run_task_history (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    run_id CHAR(32) NOT NULL,
+    task VARCHAR(100) NOT NULL,
+    outcome VARCHAR(20) NOT NULL,
+    duration DOUBLE NOT NULL,
+    INDEX idx_task_history (run_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS run_step_history (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    run_id CHAR(32) NOT NULL,
+    task VARCHAR(100) NOT NULL,
+    step VARCHAR(100) NOT NULL,
+    duration DOUBLE NOT NULL,
+    ok TINYINT NOT NULL,
+    INDEX idx_step_history (task, step, run_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS run_resource_history (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    run_id CHAR(32) NOT NULL,
+    task VARCHAR(100) NOT NULL,
+    rss_peak_mb DOUBLE NOT NULL,
+    rss_mean_mb DOUBLE NOT NULL,
+    cpu_seconds DOUBLE NOT NULL,
+    cpu_cores_mean DOUBLE NOT NULL,
+    threads_peak INT NOT NULL,
+    INDEX idx_resource_history (task, id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS run_wait_history (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    run_id CHAR(32) NOT NULL,
+    task VARCHAR(100) NOT NULL,
+    selector VARCHAR(500) NOT NULL,
+    duration DOUBLE NOT NULL,
+    ok TINYINT NOT NULL,
+    INDEX idx_wait_history (ok, id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,45 @@
+"""
+Configuración común de pytest: raíz del repo en sys.path y rutas de fixtures
+"""
+import os
+import sys
+import pathlib
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+FIXTURES_DIR = pathlib.Path(__file__).parent / 'fixtures'
+
+
+@pytest.fixture
+def fixture_url():
+    """
+    Retorna una función que construye la URL file:// de una página de fixtures
+    """
+    def _url(name):
+        return (FIXTURES_DIR / name).as_uri()
+    return _url
+
+
+@pytest.fixture
+def virtual_clock():
+    """
+    Reloj virtual activo durante el test: esperas, reintentos y pausas no duermen
+    """
+    from utils.clock import VirtualClock, use_clock
+
+    with use_clock(VirtualClock()) as clock:
+        yield clock
+
+
+@pytest.fixture
+def fake_driver(virtual_clock):
+    """
+    WebDriver falso cuyos elementos aparecen en instantes del reloj virtual
+    """
+    from fake_webdriver import FakeWebDriver
+
+    return FakeWebDriver(virtual_clock)
@@ -0,0 +1,148 @@
+"""
+WebDriver falso sobre un reloj virtual
+Los elementos aparecen, se muestran o cambian de texto en instantes de tiempo
+virtual; con use_clock(clock) las esperas y sleeps del código avanzan ese
+reloj, así un flujo con esperas de segundos se prueba en milisegundos.
+"""
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+
+from utils.locators import RESOLVE_SCRIPT
+
+
+class FakeElement:
+    def __init__(self, driver, selector, text='', appear_at=0.0, visible_at=None, enabled=True, on_click=None):
+        self._driver = driver
+        self.selector = selector
+        self.text = text
+        self.appear_at = appear_at
+        self.visible_at = appear_at if visible_at is None else visible_at
+        self.enabled = enabled
+        self.on_click = on_click
+        self.clicks = 0
+        self.typed = []
+
+    @property
+    def present(self):
+        return self._driver.clock.monotonic() >= self.appear_at
+
+    def is_displayed(self):
+        return self._driver.clock.monotonic() >= self.visible_at
+
+    def is_enabled(self):
+        return self.enabled
+
+    def click(self):
+        self._driver.commands.append(('click', self.selector))
+        self.clicks += 1
+        if self.on_click:
+            self.on_click(self)
+
+    def send_keys(self, *values):
+        self._driver.commands.append(('send_keys', self.selector))
+        self.typed.extend(values)
+
+    def clear(self):
+        self.typed = []
+
+
+class FakeWebDriver:
+    """
+    Implementa lo que usan las esperas y tareas: find_element(s), get,
+    execute_script (script de resolución de localizadores o los registrados
+    con on_script), execute (acciones W3C de ActionChains) y quit
+
+    Args:
+        clock (VirtualClock): Reloj que controla cuándo existe cada elemento
+        command_latency (float): Segundos virtuales que consume cada comando
+    """
+
+    def __init__(self, clock, command_latency=0.0):
+        self.clock = clock
+        self.command_latency = command_latency
+        self.elements = {}
+        self.commands = []
+        self.current_url = 'about:blank'
+        self.capabilities = {'browserName': 'fake'}
+        self.quit_called = False
+        self.scripts = {}
+        self.actions = []
+        self.on_actions = None
+
+    def add(self, selector, **kwargs):
+        element = FakeElement(self, selector, **kwargs)
+        self.elements[selector] = element
+        return element
+
+    def appear_later(self, selector, delay, **kwargs):
+        """
+        Agrega un elemento que aparece `delay` segundos después del instante actual
+        """
+        return self.add(selector, appear_at=self.clock.monotonic() + delay, **kwargs)
+
+    def on_script(self, script, handler):
+        """
+        Responde a `script` con handler(*args) (p. ej. los scripts de una tarea)
+        """
+        self.scripts[script] = handler
+
+    def _command(self, name, detail=None):
+        self.commands.append((name, detail))
+        if self.command_latency:
+            self.clock.advance(self.command_latency)
+
+    def get(self, url):
+        self._command('get', url)
+        self.current_url = url
+
+    def find_element(self, by=By.ID, value=None):
+        self._command('find_element', value)
+        element = self.elements.get(value)
+        if element is None or not element.present:
+            raise NoSuchElementException(f'{by}={value}')
+        return element
+
+    def find_elements(self, by=By.ID, value=None):
+        self._command('find_elements', value)
+        element = self.elements.get(value)
+        return [element] if element is not None and element.present else []
+
+    def execute_script(self, script, *args):
+        self._command('execute_script')
+        if script == RESOLVE_SCRIPT:
+            return self._resolve(*args)
+        if script in self.scripts:
+            return self.scripts[script](*args)
+        return None
+
+    def execute(self, driver_command, params=None):
+        """
+        Comandos crudos: las acciones W3C se guardan y se pasan a on_actions
+        """
+        self._command(driver_command)
+        if driver_command == Command.W3C_ACTIONS:
+            self.actions.append(params['actions'])
+            if self.on_actions:
+                self.on_actions(params['actions'])
+        return {'value': None}
+
+    def _resolve(self, candidates, cached, state):
+        fingerprint = self.current_url.split('://', 1)[-1]
+        for index, candidate in enumerate(candidates):
+            element = self.elements.get(candidate)
+            if element is None or not element.present:
+                continue
+            if state != 'present' and not element.is_displayed():
+                continue
+            if state == 'clickable' and not element.enabled:
+                continue
+            return {'fingerprint': fingerprint, 'index': index, 'element': element}
+        return {'fingerprint': fingerprint, 'index': -1, 'element': None}
+
+    def save_screenshot(self, path):
+        self._command('save_screenshot', path)
+        return False
+
+    def quit(self):
+        self.quit_called = True
@@ -0,0 +1,106 @@
+"""
+Tests del backend SQLite embebido y la interfaz de almacenamiento (archivo en tmp_path)
+"""
+import threading
+
+import pytest
+
+from app.backends import SQLiteBackend, StorageBackend, copy_employees, create_backend
+
+
+def employee(n, **overrides):
+    data = {
+        'first_name': f'Nombre{n}', 'last_name': f'Apellido{n}', 'age': 30 + n,
+        'email': f'user{n}@example.com', 'salary': 1000.0 * n, 'department': 'QA',
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / 'data' / 'employees.db'))
+    yield backend
+    backend.close()
+
+
+def test_storage_backend_is_abstract():
+    with pytest.raises(TypeError):
+        StorageBackend()
+
+    class Partial(StorageBackend):
+        def upsert_employees(self, employees):
+            return 0
+
+    with pytest.raises(TypeError, match='get_all_employees'):
+        Partial()
+
+
+def test_insert_and_reads(backend):
+    assert backend.test_connection()
+    first_id = backend.insert_employee(**employee(1))
+    assert backend.upsert_employees([employee(2), employee(3)]) == 2
+    assert backend.upsert_employees([]) == 0
+
+    stored = backend.get_employee_by_email('user1@example.com')
+    assert stored['id'] == first_id and stored['salary'] == 1000.0 and stored['age'] == 31
+    assert backend.get_employee_by_email('missing@example.com') is None
+    assert [row['email'] for row in backend.get_all_employees()] == [
+        'user1@example.com', 'user2@example.com', 'user3@example.com'
+    ]
+
+
+def test_upsert_is_idempotent_by_email(backend):
+    backend.upsert_employees([employee(1), employee(2)])
+    backend.upsert_employees([employee(1), employee(2)])
+    updated_id = backend.insert_employee(**employee(1, department='Ventas', salary=5.0))
+
+    rows = backend.get_all_employees()
+    assert len(rows) == 2
+    assert rows[0]['id'] == updated_id
+    assert (rows[0]['department'], rows[0]['salary']) == ('Ventas', 5.0)
+
+
+def test_connections_are_per_thread_in_wal_mode(backend):
+    main_connection = backend.get_connection()
+    assert backend.get_connection() is main_connection
+    assert main_connection.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    seen = []
+
+    def write(n):
+        seen.append(backend.get_connection())
+        backend.upsert_employees([employee(n)])
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(c) for c in seen} | {id(main_connection)}) == 5
+    assert len(backend.get_all_employees()) == 4
+
+    backend.close()
+    assert backend.get_connection() is not main_connection
+
+
+def test_copy_employees_between_backends(backend, tmp_path):
+    backend.upsert_employees([employee(n) for n in range(5)])
+    target = SQLiteBackend(str(tmp_path / 'copy.db'))
+    try:
+        assert copy_employees(backend, target, batch_size=2) == 5
+        assert copy_employees(backend, target, batch_size=2) == 5
+        assert [row['email'] for row in target.get_all_employees()] == [
+            row['email'] for row in backend.get_all_employees()
+        ]
+    finally:
+        target.close()
+
+
+def test_create_backend_validates_name(monkeypatch, tmp_path):
+    monkeypatch.setenv('SQLITE_PATH', str(tmp_path / 'env.db'))
+    sqlite = create_backend(' SQLite ')
+    assert isinstance(sqlite, SQLiteBackend) and sqlite.path == str(tmp_path / 'env.db')
+    with pytest.raises(ValueError, match='postgres'):
+        create_backend('postgres')
@@ -0,0 +1,71 @@
+"""
+Tests de las plantillas de perfil: clonado de la caché y preferencias (sin Firefox)
+"""
+import os
+
+import pytest
+
+import utils.browser_profile as browser_profile
+from utils.browser_profile import (
+    PROFILE_PREFS, _freeze_cache, _link_or_copy_tree, _read_extra_prefs, build_profile_template,
+    clone_profile, remove_profile
+)
+
+
+@pytest.fixture
+def template(tmp_path, monkeypatch):
+    # Sin copy-on-write: se prueba la ruta de hard links / copia
+    monkeypatch.setattr(browser_profile, '_try_reflink_copy', lambda src, dst: False)
+    template_dir = build_profile_template(
+        str(tmp_path / 'template'), prefs={'custom.label': 'a "quoted" \\ value', 'custom.count': -3,
+                                           'custom.flag': True}
+    )
+    entries = tmp_path / 'template' / 'cache2' / 'entries'
+    entries.mkdir(parents=True)
+    (entries / 'ABC123').write_bytes(b'asset')
+    (tmp_path / 'template' / 'places.sqlite').write_bytes(b'db')
+    _freeze_cache(template_dir)
+    return template_dir
+
+
+def test_read_extra_prefs_round_trips_custom_values(template):
+    assert _read_extra_prefs(template) == {
+        'custom.label': 'a "quoted" \\ value', 'custom.count': -3, 'custom.flag': True
+    }
+    assert not set(_read_extra_prefs(template)) & set(PROFILE_PREFS)
+    assert _read_extra_prefs(os.path.dirname(template) + '/missing') == {}
+
+
+def test_link_or_copy_tree_shares_only_cache(template, tmp_path):
+    linked = tmp_path / 'linked'
+    _link_or_copy_tree(template, str(linked), link_cache=True)
+    source_entry = os.path.join(template, 'cache2', 'entries', 'ABC123')
+    assert os.path.samefile(source_entry, linked / 'cache2' / 'entries' / 'ABC123')
+    assert not os.path.samefile(os.path.join(template, 'places.sqlite'), linked / 'places.sqlite')
+
+    copied = tmp_path / 'copied'
+    _link_or_copy_tree(template, str(copied), link_cache=False)
+    assert not os.path.samefile(source_entry, copied / 'cache2' / 'entries' / 'ABC123')
+    assert (copied / 'cache2' / 'entries' / 'ABC123').read_bytes() == b'asset'
+
+
+@pytest.mark.parametrize('euid, shared', [(0, False), (1000, True)])
+def test_clone_copies_cache_when_running_as_root(template, tmp_path, monkeypatch, euid, shared):
+    monkeypatch.setattr(os, 'geteuid', lambda: euid, raising=False)
+    clone = clone_profile(template, base_dir=str(tmp_path))
+
+    entry = os.path.join(clone, 'cache2', 'entries', 'ABC123')
+    assert os.path.samefile(entry, os.path.join(template, 'cache2', 'entries', 'ABC123')) is shared
+    with open(os.path.join(clone, 'user.js'), encoding='utf-8') as f:
+        prefs = f.read()
+    # El clon guarda su caché en su propio directorio y conserva las preferencias extra
+    assert f'"browser.cache.disk.parent_directory", "{os.path.abspath(clone)}"' in prefs
+    assert '"custom.count", -3' in prefs
+
+    remove_profile(clone)
+    assert not os.path.exists(clone) and os.path.isdir(template)
+
+
+def test_clone_requires_template(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        clone_profile(str(tmp_path / 'missing'))
@@ -0,0 +1,107 @@
+"""
+Tests del lote de clicks de la tarea de botones sobre el WebDriver falso
+"""
+import pytest
+from selenium.webdriver.remote.webelement import WebElement
+
+import utils.locators as locators
+from functions.buttons_task import (
+    INTERACTIONS, LOCATE_BUTTONS_SCRIPT, READ_MESSAGES_SCRIPT, perform_batched_clicks
+)
+from utils.locators import LocatorCache
+from utils.selectors import BUTTON_SELECTORS
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+MESSAGES = {
+    'double_click': "You have done a double click",
+    'right_click': "You have done a right click",
+    'dynamic_click': "You have done a dynamic click",
+}
+
+
+@pytest.fixture(autouse=True)
+def isolated_locator_cache(monkeypatch):
+    monkeypatch.setattr(locators, '_cache', LocatorCache())
+
+
+def pointer_presses(actions):
+    """
+    Returns:
+        list: (id del elemento, botón) por cada pointerDown, en orden
+    """
+    presses = []
+    for device in actions:
+        target = None
+        for action in device['actions']:
+            if action['type'] == 'pointerMove':
+                target = action['origin'][ELEMENT_KEY]
+            elif action['type'] == 'pointerDown':
+                presses.append((target, action['button']))
+    return presses
+
+
+class ButtonsPage:
+    """
+    Página de botones: muestra cada mensaje cuando su botón recibe el gesto correcto
+    """
+
+    def __init__(self, driver, delay=0.0, texts=None):
+        self.driver = driver
+        self.delay = delay
+        self.texts = dict(MESSAGES, **(texts or {}))
+        self.shown_at = {}
+        self.buttons = [WebElement(driver, name) for name in INTERACTIONS]
+        driver.on_script(LOCATE_BUTTONS_SCRIPT, self.locate)
+        driver.on_script(READ_MESSAGES_SCRIPT, self.read)
+        driver.on_actions = self.perform
+
+    def locate(self, candidate_lists):
+        return {'found': self.buttons, 'used': [0] * len(candidate_lists), 'fingerprint': 'demoqa.com/buttons'}
+
+    def perform(self, actions):
+        presses = pointer_presses(actions)
+        gestures = {
+            'double_click': presses.count(('double_click', 0)) == 2,
+            'right_click': ('right_click', 2) in presses,
+            'dynamic_click': presses.count(('dynamic_click', 0)) == 1,
+        }
+        now = self.driver.clock.monotonic()
+        for name, done in gestures.items():
+            if done:
+                self.shown_at[name] = now + self.delay
+
+    def read(self, selectors):
+        now = self.driver.clock.monotonic()
+        names = {BUTTON_SELECTORS[INTERACTIONS[name][1]]: name for name in INTERACTIONS}
+        return [
+            self.texts[names[selector]] if self.shown_at.get(names[selector], float('inf')) <= now else None
+            for selector in selectors
+        ]
+
+
+def test_three_gestures_travel_in_one_actions_request(virtual_clock, fake_driver):
+    page = ButtonsPage(fake_driver, delay=0.25)
+
+    assert perform_batched_clicks(fake_driver, timeout=5) == {name: True for name in INTERACTIONS}
+
+    assert len(fake_driver.actions) == 1
+    assert pointer_presses(fake_driver.actions[0]) == [
+        ('double_click', 0), ('double_click', 0), ('right_click', 2), ('dynamic_click', 0)
+    ]
+    assert set(page.shown_at) == set(INTERACTIONS)
+    # Una lectura de mensajes por sondeo hasta que aparecen los tres
+    assert virtual_clock.monotonic() == pytest.approx(0.3)
+
+
+def test_wrong_and_missing_messages_fail_individually(virtual_clock, fake_driver):
+    page = ButtonsPage(fake_driver, texts={'right_click': 'Nada'})
+    fake_driver.on_actions = lambda actions: page.shown_at.update(double_click=0.0, right_click=0.0)
+
+    results = perform_batched_clicks(fake_driver, timeout=1)
+
+    assert results == {'double_click': True, 'right_click': False, 'dynamic_click': False}
+    # Plazo vencido: una última lectura y captura de cada interacción fallida
+    assert virtual_clock.monotonic() == pytest.approx(1.1)
+    screenshots = [detail for name, detail in fake_driver.commands if name == 'save_screenshot']
+    assert [path.rsplit('/', 1)[-1] for path in screenshots] == ['right_click_error.png', 'dynamic_click_error.png']
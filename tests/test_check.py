@@ -0,0 +1,173 @@
+"""
+Tests de las verificaciones de entorno: plazos, cancelación, logs agrupados y caché
+"""
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+import check
+from check import (
+    CheckCancelled, _release_driver, _track_driver, load_cache, run_checks, save_cache
+)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quits = 0
+
+    def quit(self):
+        self.quits += 1
+
+
+def test_results_keep_declaration_order_and_use_cache():
+    calls = []
+
+    def ok():
+        calls.append('ok')
+        return True
+
+    def broken():
+        raise RuntimeError('sin conexión')
+
+    cached = {'Python': {'ok': True, 'elapsed': 0.1, 'checked_at': 1.0}}
+    results = run_checks(
+        [('Python', ok, 1), ('Base de datos', broken, 1), ('Dependencias', ok, 1), ('Variables', lambda: None, 1)],
+        cached
+    )
+
+    assert list(results) == ['Python', 'Base de datos', 'Dependencias', 'Variables']
+    assert results['Python']['cached'] and calls == ['ok']
+    assert not results['Base de datos']['ok'] and not results['Base de datos']['timed_out']
+    assert results['Dependencias']['ok'] and not results['Variables']['ok']
+
+
+def test_timeout_quits_browser_and_stops_waiting():
+    driver = FakeDriver()
+    release = threading.Event()
+
+    def hung_browser_check():
+        _track_driver(driver)
+        release.wait(5)
+        _release_driver(driver)
+        return True
+
+    started = time.perf_counter()
+    results = run_checks([('Firefox Driver', hung_browser_check, 0.2)])
+    release.set()
+
+    assert time.perf_counter() - started < 2
+    assert results['Firefox Driver']['timed_out'] and not results['Firefox Driver']['ok']
+    # cancel_check cerró el navegador; el hilo no lo vuelve a cerrar
+    time.sleep(0.05)
+    assert driver.quits == 1
+
+
+def test_browser_started_after_cancel_is_closed():
+    driver = FakeDriver()
+    outcome = {}
+
+    def late_start():
+        check.cancel_check(threading.current_thread())
+        try:
+            _track_driver(driver)
+        except CheckCancelled as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=late_start)
+    thread.start()
+    thread.join()
+
+    assert isinstance(outcome['error'], CheckCancelled) and driver.quits == 1
+
+
+def test_parallel_check_logs_are_not_interleaved(caplog):
+    caplog.set_level(logging.INFO)
+    first_logged = threading.Event()
+
+    def slow():
+        check.logger.info('=== Lenta ===')
+        first_logged.set()
+        time.sleep(0.1)
+        check.logger.info('✓ lenta')
+        return True
+
+    def fast():
+        first_logged.wait(1)
+        check.logger.info('=== Rápida ===')
+        check.logger.info('✓ rápida')
+        return True
+
+    release, finished = threading.Event(), threading.Event()
+
+    def hung():
+        check.logger.info('=== Colgada ===')
+        release.wait(5)
+        check.logger.info('tarde')
+        finished.set()
+        return True
+
+    # Plazo holgado: con carga, el hilo colgado debe llegar a registrar su encabezado
+    run_checks([('Lenta', slow, 2), ('Rápida', fast, 2), ('Colgada', hung, 1)])
+    release.set()
+    assert finished.wait(5)
+
+    messages = [record.getMessage() for record in caplog.records if record.name == 'check']
+    assert messages == [
+        '=== Lenta ===', '✓ lenta', '=== Rápida ===', '✓ rápida',
+        '=== Colgada ===', '✗ Colgada: tiempo máximo excedido', 'tarde',
+    ]
+
+
+
+def test_log_buffers_survive_thread_ident_reuse(caplog):
+    caplog.set_level(logging.INFO)
+    log_buffer = check.CheckLogBuffer()
+
+    def log(message):
+        log_buffer.capture()
+        check.logger.info(message)
+
+    with log_buffer.installed():
+        first = threading.Thread(target=log, args=('primera',))
+        first.start()
+        first.join()
+        # Un hilo nuevo suele heredar el ident del que terminó
+        for _ in range(50):
+            second = threading.Thread(target=log, args=('segunda',))
+            second.start()
+            second.join()
+            if second.ident == first.ident:
+                break
+        else:
+            pytest.skip('el sistema no reutilizó el ident del hilo')
+
+        log_buffer.flush(first)
+        log_buffer.flush(second)
+
+    messages = [record.getMessage() for record in caplog.records if record.name == 'check']
+    assert messages == ['primera', 'segunda']
+
+
+def test_cache_round_trip_honours_fingerprint_and_ttl(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    now = time.time()
+    save_cache(path, 'abc', {
+        'Python': {'ok': True, 'elapsed': 0.1, 'checked_at': now},
+        'Base de datos': {'ok': False, 'elapsed': 0.2, 'checked_at': now},
+        'Dependencias': {'ok': True, 'elapsed': 0.3, 'checked_at': now - 600},
+    })
+
+    assert set(json.loads((tmp_path / 'cache.json').read_text())['results']) == {'Python', 'Dependencias'}
+    assert set(load_cache(path, 'abc', ttl=300)) == {'Python'}
+    assert load_cache(path, 'otra-huella', ttl=300) == {}
+    assert load_cache(str(tmp_path / 'missing.json'), 'abc', ttl=300) == {}
+
+
+@pytest.mark.parametrize('content', ['{no es json', '[]'])
+def test_corrupt_cache_is_ignored(tmp_path, content):
+    path = tmp_path / 'cache.json'
+    path.write_text(content)
+    assert load_cache(str(path), 'abc', ttl=300) == {}
@@ -0,0 +1,97 @@
+"""
+Tests del checkpoint append-only y la reanudación del guardado de webtables
+"""
+import os
+import time
+
+import pytest
+
+import functions.webtables_task as webtables
+from utils.checkpoint import CheckpointStore, use_checkpoint
+
+
+def test_progress_survives_restart_and_torn_last_line(tmp_path):
+    path = str(tmp_path / 'run.jsonl')
+    store = CheckpointStore(path)
+    store.mark_done('task:form', True)
+    store.set_offset('rows:page', 500)
+    store.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"key": "task:buttons", "do')
+
+    resumed = CheckpointStore(path)
+
+    assert resumed.resumed
+    assert resumed.is_done('task:form') and resumed.result('task:form') is True
+    assert not resumed.is_done('task:buttons')
+    assert resumed.offset('rows:page') == 500
+
+
+def test_first_progress_after_torn_tail_is_kept(tmp_path):
+    path = str(tmp_path / 'run.jsonl')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"key": "task:web')
+
+    store = CheckpointStore(path)
+    store.mark_done('task:webtables', 12)
+    store.close()
+
+    reloaded = CheckpointStore(path)
+    assert reloaded.is_done('task:webtables') and reloaded.result('task:webtables') == 12
+
+
+def test_stale_checkpoint_is_discarded(tmp_path):
+    path = str(tmp_path / 'run.jsonl')
+    store = CheckpointStore(path, max_age=3600)
+    store.mark_done('page:1', [{'email': 'old@example.com'}])
+    store.close()
+    assert CheckpointStore(path, max_age=3600).is_done('page:1')
+
+    two_hours_ago = time.time() - 7200
+    os.utime(path, (two_hours_ago, two_hours_ago))
+    stale = CheckpointStore(path, max_age=3600)
+
+    assert not stale.resumed and stale.result('page:1') is None
+    assert not os.path.exists(path)
+
+
+def test_compaction_keeps_one_line_per_key(tmp_path):
+    path = str(tmp_path / 'run.jsonl')
+    store = CheckpointStore(path, compact_every=10)
+    for offset in range(1, 26):
+        store.set_offset('rows:page', offset)
+    store.close()
+
+    with open(path, encoding='utf-8') as f:
+        lines = f.readlines()
+
+    assert len(lines) == 6  # instantánea tras 20 avances + 5 avances nuevos
+    assert CheckpointStore(path).offset('rows:page') == 25
+
+
+def test_save_resumes_from_last_committed_batch(tmp_path, monkeypatch):
+    monkeypatch.setenv('WEBTABLES_BATCH_SIZE', '2')
+    rows = [{'email': f'user{i}@example.com'} for i in range(7)]
+    written = []
+
+    def crash_on_third_batch(batch):
+        if len(written) == 4:
+            raise KeyboardInterrupt('caída simulada')
+        written.extend(row['email'] for row in batch)
+        return len(batch)
+
+    path = str(tmp_path / 'run.jsonl')
+    monkeypatch.setattr(webtables, 'insert_employees', crash_on_third_batch)
+    with use_checkpoint(CheckpointStore(path)), pytest.raises(KeyboardInterrupt):
+        webtables.save_to_database(rows, checkpoint_key='rows:page')
+
+    def insert(batch):
+        written.extend(row['email'] for row in batch)
+        return len(batch)
+
+    written.clear()
+    monkeypatch.setattr(webtables, 'insert_employees', insert)
+    with use_checkpoint(CheckpointStore(path)):
+        assert webtables.save_to_database(rows, checkpoint_key='rows:page') == 3
+
+    assert written == [f'user{i}@example.com' for i in range(4, 7)]
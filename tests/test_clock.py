@@ -0,0 +1,96 @@
+"""
+Tests de esperas, presupuestos y tareas sobre el reloj virtual y el WebDriver falso
+"""
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+import utils.locators as locators
+from functions.buttons_task import perform_dynamic_click
+from utils.clock import SYSTEM_CLOCK, VirtualClock, get_clock, use_clock, wait_until
+from utils.drag import drag_and_drop
+from utils.locators import LocatorCache
+from utils.selectors import BUTTON_SELECTORS, FORM_SELECTORS, SELECTOR_FALLBACKS
+from utils.timeouts import BudgetExceeded, TaskBudget
+from utils.timing import task_timer
+from utils.utils import wait_for_clickable, wait_for_element
+
+
+@pytest.fixture(autouse=True)
+def isolated_locator_cache(monkeypatch):
+    monkeypatch.setattr(locators, '_cache', LocatorCache())
+
+
+def test_use_clock_is_scoped():
+    clock = VirtualClock(start=5)
+    with use_clock(clock):
+        get_clock().sleep(2.5)
+        assert get_clock().monotonic() == 7.5
+    assert get_clock() is SYSTEM_CLOCK
+    assert clock.sleeps == [2.5]
+
+
+def test_wait_polls_until_element_appears(virtual_clock, fake_driver):
+    fake_driver.appear_later('#firstName', 2.3)
+
+    element = wait_for_element(fake_driver, '#firstName', timeout=10)
+
+    assert element.selector == '#firstName'
+    assert virtual_clock.monotonic() == pytest.approx(2.5)
+    assert virtual_clock.sleeps == [0.5] * 5
+
+
+def test_wait_times_out_like_webdriverwait(virtual_clock, fake_driver):
+    fake_driver.add('#submit', enabled=False)
+
+    with pytest.raises(TimeoutException):
+        wait_for_clickable(fake_driver, '#submit', timeout=3)
+    assert virtual_clock.monotonic() == pytest.approx(3.5)
+
+    with pytest.raises(TimeoutException, match='nunca'):
+        wait_until(fake_driver, lambda d: False, 1, poll_frequency=0.25, message='nunca')
+
+
+def test_waits_feed_budget_in_virtual_seconds(virtual_clock, fake_driver):
+    fake_driver.appear_later('#userEmail', 1.2)
+
+    with task_timer('form') as timings:
+        timings.budget = TaskBudget('form', 4, factor=3, min_timeout=1.0)
+        wait_for_element(fake_driver, '#userEmail')
+        virtual_clock.sleep(2.5)
+        with pytest.raises(BudgetExceeded):
+            wait_for_element(fake_driver, '#never')
+
+    # Sin presupuesto la espera ni empieza: solo queda registrada la primera
+    assert timings.waits == [{'selector': '#userEmail', 'duration': pytest.approx(1.5), 'ok': True}]
+    assert virtual_clock.monotonic() == pytest.approx(4.0)
+
+
+def test_healing_locator_waits_for_late_fallback(virtual_clock, fake_driver):
+    fake_driver.current_url = 'https://demoqa.com/automation-practice-form'
+    selector = FORM_SELECTORS['city_option']
+    fallback = SELECTOR_FALLBACKS[selector][0]
+    fake_driver.appear_later(fallback, 1.2)
+
+    assert wait_for_clickable(fake_driver, selector, timeout=5).selector == fallback
+    assert virtual_clock.monotonic() == pytest.approx(1.5)
+    assert [name for name, _ in fake_driver.commands] == ['execute_script'] * 4
+
+
+def test_dynamic_click_task_runs_in_virtual_time(virtual_clock, fake_driver):
+    message = BUTTON_SELECTORS['dynamic_click_message']
+
+    def show_message(button):
+        fake_driver.appear_later(message, 0.3, text='You have done a dynamic click')
+
+    fake_driver.add(BUTTON_SELECTORS['dynamic_click'], on_click=show_message)
+
+    assert perform_dynamic_click(fake_driver) is True
+    assert virtual_clock.sleeps == [0.5]
+
+
+def test_drag_confirmation_wait_uses_clock(virtual_clock, fake_driver):
+    def dropped(driver):
+        return virtual_clock.monotonic() >= 0.2
+
+    assert drag_and_drop(fake_driver, 'source', 'target', dropped, strategy='synthetic') == 'synthetic'
+    assert virtual_clock.monotonic() == pytest.approx(0.2)
@@ -0,0 +1,63 @@
+"""
+Tests de los atajos CDP y su equivalente WebDriver (sin navegador)
+"""
+import pytest
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+from utils.devtools import block_requests, evaluate, wait_for_selector
+
+
+class FakeFirefox:
+    def __init__(self, async_outcome=None):
+        self.calls = []
+        self.async_outcome = async_outcome
+
+    def execute_script(self, script, *args):
+        self.calls.append(('execute_script', args))
+        return {'count': 3, 'rows': []}
+
+    def execute_async_script(self, script, *args):
+        self.calls.append(('execute_async_script', args))
+        return self.async_outcome
+
+
+class FakeChromium(FakeFirefox):
+    def __init__(self, result):
+        super().__init__()
+        self.result = result
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append((cmd, params))
+        return self.result
+
+
+def test_evaluate_uses_single_runtime_evaluate_on_chromium():
+    driver = FakeChromium({'result': {'type': 'object', 'value': {'count': 3}}})
+
+    assert evaluate(driver, 'return arguments[0];', {'count': 3}) == {'count': 3}
+    assert len(driver.calls) == 1
+    command, params = driver.calls[0]
+    assert command == 'Runtime.evaluate'
+    assert params['returnByValue'] is True
+    assert '.apply(null, [{"count": 3}])' in params['expression']
+
+
+def test_evaluate_falls_back_to_execute_script():
+    driver = FakeFirefox()
+
+    assert evaluate(driver, 'return 1;', 'tr', [0, 2]) == {'count': 3, 'rows': []}
+    assert driver.calls == [('execute_script', ('tr', [0, 2]))]
+    assert block_requests(driver) is False
+
+
+def test_script_errors_surface_as_javascript_exception():
+    driver = FakeChromium({'exceptionDetails': {'text': 'Uncaught', 'exception': {'description': 'boom'}}})
+    with pytest.raises(JavascriptException, match='boom'):
+        evaluate(driver, 'throw new Error("boom");')
+
+
+def test_wait_for_selector_timeout():
+    driver = FakeFirefox(async_outcome={'error': 'Error: timeout: .rt-table'})
+    with pytest.raises(TimeoutException, match='.rt-table'):
+        wait_for_selector(driver, '.rt-table', timeout=0.1)
+    assert driver.calls[0][0] == 'execute_async_script'
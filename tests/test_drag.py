@@ -0,0 +1,81 @@
+"""
+Tests del orden de estrategias de drag & drop y su cadena de respaldo (driver falso)
+"""
+import pytest
+from selenium.common.exceptions import (
+    JavascriptException, MoveTargetOutOfBoundsException, TimeoutException
+)
+
+import utils.drag as drag
+from utils.drag import DEFAULT_ORDER, drag_and_drop, strategy_order
+
+
+@pytest.fixture(autouse=True)
+def no_preferred(monkeypatch):
+    monkeypatch.setattr(drag, '_preferred', {})
+    monkeypatch.delenv('DRAG_STRATEGY', raising=False)
+
+
+def fake_strategies(monkeypatch, behaviours):
+    """
+    Reemplaza las estrategias: cada una registra su nombre y aplica su comportamiento
+    """
+    attempts = []
+
+    def make(name, behaviour):
+        def strategy(driver, source, target):
+            attempts.append(name)
+            behaviour(driver)
+        return strategy
+
+    monkeypatch.setattr(drag, 'STRATEGIES', {name: make(name, b) for name, b in behaviours.items()})
+    return attempts
+
+
+def test_strategy_order_defaults_forced_and_preferred(monkeypatch):
+    assert strategy_order('firefox') == DEFAULT_ORDER
+    assert strategy_order('firefox', 'legacy') == ('legacy',)
+
+    monkeypatch.setenv('DRAG_STRATEGY', 'Synthetic')
+    assert strategy_order('firefox') == ('synthetic',)
+    monkeypatch.setenv('DRAG_STRATEGY', 'teleport')
+    with pytest.raises(ValueError, match='teleport'):
+        strategy_order('firefox')
+
+    monkeypatch.delenv('DRAG_STRATEGY')
+    drag._preferred['chrome'] = 'synthetic'
+    assert strategy_order('chrome') == ('synthetic', 'actions', 'legacy')
+    assert strategy_order('firefox') == DEFAULT_ORDER
+
+
+def test_errors_and_timeouts_fall_through_to_next_strategy(virtual_clock, fake_driver, monkeypatch):
+    dropped = []
+
+    def out_of_bounds(driver):
+        raise MoveTargetOutOfBoundsException('move target out of bounds')
+
+    def script_error(driver):
+        raise JavascriptException('elementFromPoint is null')
+
+    attempts = fake_strategies(monkeypatch, {
+        'actions': out_of_bounds,
+        'synthetic': script_error,
+        'legacy': lambda driver: dropped.append(True),
+    })
+
+    assert drag_and_drop(fake_driver, 'source', 'target', lambda d: bool(dropped)) == 'legacy'
+    assert attempts == ['actions', 'synthetic', 'legacy']
+    # La estrategia que funcionó pasa a probarse primero en este navegador
+    assert strategy_order('fake') == ('legacy', 'actions', 'synthetic')
+
+
+def test_probe_timeouts_then_all_fail(virtual_clock, fake_driver, monkeypatch):
+    attempts = fake_strategies(monkeypatch, {name: lambda driver: None for name in DEFAULT_ORDER})
+
+    with pytest.raises(TimeoutException, match='actions, synthetic, legacy'):
+        drag_and_drop(fake_driver, 'source', 'target', lambda d: False, timeout=3, probe_timeout=0.5)
+
+    assert attempts == list(DEFAULT_ORDER)
+    # Dos sondeos cortos y la espera completa de la última estrategia
+    assert virtual_clock.monotonic() == pytest.approx(0.55 * 2 + 3.05, abs=0.06)
+    assert 'fake' not in drag._preferred
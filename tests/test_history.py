@@ -0,0 +1,129 @@
+"""
+Tests del historial de ejecuciones y la detección de regresiones
+"""
+import sqlite3
+
+import pytest
+
+from app.history import HistoryStore, RunRecorder, TOTAL_STEP, detect_regressions
+from utils.timing import TaskTimings
+
+
+def make_store(tmp_path):
+    path = str(tmp_path / 'history.db')
+    return HistoryStore(lambda: sqlite3.connect(path))
+
+
+def record_run(store, started_at, extract_seconds, outcome='success'):
+    recorder = RunRecorder('--task webtables', store=store)
+    recorder.started_at = started_at
+    timings = TaskTimings('webtables')
+    timings.add_step('extract_webtables', extract_seconds)
+    timings.add_step('save_to_database', 0.2)
+    timings.duration = extract_seconds + 0.2
+    recorder.record_task(timings, outcome)
+    recorder.finish()
+
+
+def test_flags_significant_step_regression(tmp_path):
+    store = make_store(tmp_path)
+    for i, seconds in enumerate([1.00, 1.02, 0.98, 1.01, 0.99, 1.03]):
+        record_run(store, started_at=i, extract_seconds=seconds)
+    record_run(store, started_at=10, extract_seconds=2.5)
+
+    report = {(e['task'], e['step']): e for e in detect_regressions(store)}
+
+    assert report[('webtables', 'extract_webtables')]['regression']
+    assert report[('webtables', TOTAL_STEP)]['regression']
+    assert not report[('webtables', 'save_to_database')]['regression']
+
+
+def test_noise_within_baseline_is_not_flagged(tmp_path):
+    store = make_store(tmp_path)
+    for i, seconds in enumerate([1.0, 1.3, 0.8, 1.2, 0.9, 1.1]):
+        record_run(store, started_at=i, extract_seconds=seconds)
+    record_run(store, started_at=10, extract_seconds=1.25)
+
+    assert not any(e['regression'] for e in detect_regressions(store))
+
+
+def test_needs_minimum_samples(tmp_path):
+    store = make_store(tmp_path)
+    record_run(store, started_at=0, extract_seconds=1.0)
+    record_run(store, started_at=1, extract_seconds=5.0)
+
+    report = detect_regressions(store, min_samples=5)
+
+    assert report and all(e['median'] is None and not e['regression'] for e in report)
+
+
+def test_resource_profile_uses_worst_recorded_task(tmp_path):
+    store = make_store(tmp_path)
+    assert store.resource_profile() is None
+
+    for rss, cores in [(400.0, 0.5), (650.0, 0.3)]:
+        recorder = RunRecorder('--task webtables', store=store)
+        timings = TaskTimings('webtables')
+        timings.duration = 1.0
+        timings.resources = {
+            'rss_peak_mb': rss, 'rss_mean_mb': rss / 2, 'cpu_seconds': cores,
+            'cpu_cores_mean': cores, 'threads_peak': 80,
+        }
+        recorder.record_task(timings, 'success')
+        recorder.finish()
+
+    profile = store.resource_profile()
+
+    assert profile == {'samples': 2, 'rss_peak_mb': 650.0, 'cpu_cores_mean': 0.5}
+
+
+def test_wait_latencies_learn_p99_from_successful_waits(tmp_path):
+    store = make_store(tmp_path)
+    recorder = RunRecorder('--task webtables', store=store)
+    timings = TaskTimings('webtables')
+    timings.duration = 1.0
+    for i in range(100):
+        timings.add_wait('.rt-table', 0.01 * (i + 1))
+    timings.add_wait('.rt-table', 30.0, ok=False)
+    timings.add_wait('#rare', 0.5)
+    recorder.record_task(timings, 'success')
+    recorder.finish()
+
+    latencies = store.wait_latencies()
+
+    assert latencies == {'.rt-table': pytest.approx(0.99)}
+
+
+def record_waits(store, seconds, **metadata):
+    recorder = RunRecorder('--task webtables', metadata=metadata, store=store)
+    timings = TaskTimings('webtables')
+    timings.duration = 1.0
+    for _ in range(20):
+        timings.add_wait('.rt-table', seconds)
+    recorder.record_task(timings, 'success')
+    recorder.finish()
+
+
+def test_wait_latencies_are_keyed_by_run_environment(tmp_path):
+    store = make_store(tmp_path)
+    record_waits(store, 2.0, browser='firefox', http_cache='off', headless=True)
+    record_waits(store, 0.05, browser='firefox', http_cache='replay', headless=True)
+    record_waits(store, 0.8, browser='chromium', http_cache='off', headless=True)
+
+    live = {'browser': 'firefox', 'http_cache': 'off', 'headless': True}
+    assert store.wait_latencies(environment=live) == {'.rt-table': 2.0}
+    assert store.wait_latencies(environment=dict(live, http_cache='replay')) == {'.rt-table': 0.05}
+    assert store.wait_latencies(environment=dict(live, browser='chromium')) == {'.rt-table': 0.8}
+    assert store.wait_latencies(environment=dict(live, headless=False)) == {}
+    # Sin filtro se mezclan todas (el p99 lo fija la más lenta)
+    assert store.wait_latencies() == {'.rt-table': 2.0}
+
+
+def test_runs_without_environment_metadata_count_as_live_firefox(tmp_path):
+    store = make_store(tmp_path)
+    record_waits(store, 1.5)
+
+    assert store.wait_latencies(environment={'browser': 'firefox', 'http_cache': 'off', 'headless': None}) == {
+        '.rt-table': 1.5
+    }
+    assert store.wait_latencies(environment={'browser': 'chromium', 'http_cache': 'off'}) == {}
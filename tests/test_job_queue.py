@@ -0,0 +1,131 @@
+"""
+Tests de la cola de trabajos durable (SQLite en tmp_path) y su uso desde el worker
+"""
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from app.job_queue import JobQueue
+from worker import Worker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / 'jobs.db')
+
+
+@pytest.fixture
+def queue(queue_path):
+    queue = JobQueue(queue_path)
+    yield queue
+    queue.close()
+
+
+def test_claim_is_atomic_across_connections(queue, queue_path):
+    assert queue.enqueue('form', {'n': 1}, count=40) == 40
+    claimed = []
+
+    def drain(worker_id):
+        own = JobQueue(queue_path)
+        try:
+            job = own.claim(worker_id)
+            while job is not None:
+                claimed.append(job['id'])
+                job = own.claim(worker_id)
+        finally:
+            own.close()
+
+    threads = [threading.Thread(target=drain, args=(f'w{i}',)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Cada trabajo lo reclama exactamente un worker
+    assert sorted(claimed) == list(range(1, 41))
+    assert queue.counts() == {'running': 40}
+    assert queue.claim('w0') is None
+
+
+def test_claim_returns_payload_and_counts_attempts(queue):
+    queue.enqueue('webtables', {'page': 3})
+    job = queue.claim('w1')
+    assert job == {'id': 1, 'task': 'webtables', 'payload': {'page': 3}, 'attempts': 1}
+    queue.complete(job['id'])
+    assert queue.counts() == {'done': 1}
+
+
+def test_fail_retries_until_max_attempts(queue):
+    queue.enqueue('buttons')
+    for attempt in range(1, 4):
+        job = queue.claim('w1')
+        assert job['attempts'] == attempt
+        queue.fail(job['id'], RuntimeError(f'fallo {attempt}'), max_attempts=3)
+
+    assert queue.counts() == {'failed': 1}
+    assert queue.claim('w1') is None
+    row = queue._connection.execute("SELECT error FROM jobs WHERE id = 1").fetchone()
+    assert row['error'] == 'fallo 3'
+
+
+def test_requeue_stale_only_recovers_old_running_jobs(queue):
+    queue.enqueue('form', count=2)
+    stale = queue.claim('dead-worker')
+    queue.claim('live-worker')
+    queue._connection.execute("UPDATE jobs SET started_at = ? WHERE id = ?", (time.time() - 7200, stale['id']))
+
+    assert queue.requeue_stale(older_than=3600) == 1
+    assert queue.counts() == {'pending': 1, 'running': 1}
+    again = queue.claim('w2')
+    assert again['id'] == stale['id'] and again['attempts'] == 2
+
+
+def test_worker_fails_job_of_unregistered_task(queue):
+    queue.enqueue('removed_task')
+    queue.enqueue('removed_task')
+    worker = Worker(queue, idle_sleep=0)
+
+    stats = worker.run(exit_when_empty=True)
+
+    # El bucle sigue y no queda nada en 'running' ni se abre un navegador
+    assert stats['failed'] == 2
+    assert queue.counts() == {'failed': 2}
+    assert worker.driver is None
+
+
+def test_job_of_crashed_worker_is_reclaimed_on_restart(queue, queue_path):
+    queue.enqueue('removed_task')
+    # Un worker reclama el trabajo y muere sin terminarlo
+    crash = (
+        "import os, socket, sys; from app.job_queue import JobQueue; "
+        "JobQueue(sys.argv[1]).claim(f'{socket.gethostname()}:{os.getpid()}'); os._exit(1)"
+    )
+    subprocess.run([sys.executable, '-c', crash, queue_path], cwd=ROOT, check=False)
+    assert queue.counts() == {'running': 1}
+
+    # Otro worker del host arranca enseguida: el trabajo no espera a requeue_stale
+    worker = Worker(queue, idle_sleep=0)
+    worker.run(exit_when_empty=True)
+
+    assert queue.counts() == {'failed': 1}
+    assert worker.stats['failed'] == 1
+
+
+def test_requeue_orphaned_keeps_live_and_remote_workers(queue):
+    queue.enqueue('form', count=4)
+    host = socket.gethostname()
+    for worker_id in (f'{host}:100', f'{host}:200', 'otro-host:100', f'{host}:300'):
+        queue.claim(worker_id)
+
+    recovered = queue.requeue_orphaned(host, own_id=f'{host}:300', is_alive=lambda pid: pid == 200)
+
+    # 100 murió; 300 es un proceso anterior con el pid del worker que llama
+    assert recovered == 2
+    assert queue.counts() == {'pending': 2, 'running': 2}
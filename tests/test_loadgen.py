@@ -0,0 +1,112 @@
+"""
+Tests del generador de carga con sesiones falsas y, si hay navegador, una
+iteración real contra la página de fixtures del formulario
+"""
+import random
+import shutil
+import threading
+
+import pytest
+
+from loadgen import form_iteration, form_url
+from utils.loadgen import LoadGenerator, WindowStats, parse_stages, parse_think_time, percentile, target_users
+
+
+class FakeSession:
+    quits = 0
+    lock = threading.Lock()
+
+    def quit(self):
+        with FakeSession.lock:
+            FakeSession.quits += 1
+
+
+def test_stages_ramp_linearly_between_targets():
+    stages = parse_stages('10s:4,1m:4,10s:0')
+
+    assert stages == [(10.0, 4), (60.0, 4), (10.0, 0)]
+    assert [target_users(stages, t) for t in (0, 5, 10, 40, 75, 80)] == [0, 2, 4, 4, 2, None]
+
+
+def test_think_time_distributions_and_percentiles():
+    rng = random.Random(1)
+
+    assert parse_think_time('const:1.5')(rng) == 1.5
+    assert all(0.5 <= parse_think_time('uniform:0.5-2')(rng) <= 2 for _ in range(100))
+    assert parse_think_time('none')(rng) == 0.0
+    with pytest.raises(ValueError):
+        parse_think_time('zipf:2')
+    assert percentile([0.1 * i for i in range(1, 101)], 99) == pytest.approx(9.9)
+
+    stats = WindowStats()
+    stats.record(0.2)
+    stats.record(0.4, error='TimeoutException')
+    snapshot = stats.snapshot()
+    assert snapshot['iterations'] == 2 and snapshot['error_rate'] == 0.5
+    assert snapshot['errors_by_type'] == {'TimeoutException': 1}
+
+
+def test_closed_model_runs_concurrent_users_and_reports_windows():
+    FakeSession.quits = 0
+    windows = []
+    active = set()
+    peak = []
+    lock = threading.Lock()
+
+    def iteration(session, user, number):
+        with lock:
+            active.add(user)
+            peak.append(len(active))
+        threading.Event().wait(0.01)
+        with lock:
+            active.discard(user)
+        if number == 3 and user == 0:
+            raise AssertionError('modal')
+
+    generator = LoadGenerator(iteration, FakeSession, stages=[(0.6, 3)], think_time=parse_think_time('const:0.01'),
+                              window=0.2, report=lambda elapsed, stats, users: windows.append(stats))
+    summary = generator.run()
+
+    assert summary['iterations'] > 10
+    assert summary['errors'] == 1 and summary['errors_by_type'] == {'AssertionError': 1}
+    assert summary['peak_users'] == 3 and max(peak) > 1
+    assert FakeSession.quits == 3
+    assert len(windows) >= 2 and sum(w['iterations'] for w in windows) == summary['iterations']
+
+
+def test_open_model_follows_arrival_rate():
+    generator = LoadGenerator(lambda session, user, number: None, FakeSession, stages=[(0.5, 2)],
+                              arrival_rate=40, seed=3, report=lambda *args: None)
+    summary = generator.run()
+
+    assert 8 <= summary['iterations'] <= 35
+    assert form_url('file:///repo/tests/fixtures/', 'form.html') == 'file:///repo/tests/fixtures/form.html'
+
+
+def available_browser():
+    """
+    Returns:
+        str: 'firefox' o 'chromium' si el navegador y su driver están instalados, o None
+    """
+    if shutil.which('firefox') and shutil.which('geckodriver'):
+        return 'firefox'
+    if (shutil.which('chromium') or shutil.which('chromium-browser')) and shutil.which('chromedriver'):
+        return 'chromium'
+    return None
+
+
+@pytest.mark.skipif(available_browser() is None, reason='requiere Firefox+geckodriver o Chromium+chromedriver')
+def test_form_iteration_against_fixture_page(fixture_url, monkeypatch):
+    from main import create_driver
+
+    monkeypatch.setenv('VISUAL_MODE', 'off')
+    monkeypatch.setenv('WEBDRIVER_NODES', '')
+    monkeypatch.delenv('FIREFOX_PROFILE_TEMPLATE', raising=False)
+    url = form_url(fixture_url('form.html').rsplit('/', 1)[0], 'form.html')
+    driver = create_driver(headless=True, browser=available_browser())
+    try:
+        # fill_form + validate_modal con el email único del VU; lanza si el modal no coincide
+        form_iteration(url)(driver, 0, 1)
+        assert driver.find_element('id', 'userEmail').get_attribute('value') == 'vu0.1@example.com'
+    finally:
+        driver.quit()
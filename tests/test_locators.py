@@ -0,0 +1,105 @@
+"""
+Tests de los localizadores con autorreparación (driver falso, sin navegador)
+"""
+import json
+import logging
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+import utils.locators as locators
+from utils.locators import LocatorCache, candidates_for, record_resolution, resolve
+from utils.selectors import (
+    BUTTON_SELECTORS, DROPPABLE_SELECTORS, FORM_SELECTORS, SELECTOR_FALLBACKS, WEBTABLE_SELECTORS
+)
+from utils.utils import wait_for_clickable
+
+PAGE = 'demoqa.com/automation-practice-form'
+
+
+class FakeDriver:
+    """
+    Responde al script de resolución como lo haría la página: el primer
+    candidato (en el orden preferido por la caché) que esté en `present`
+    """
+
+    def __init__(self, present=(), fingerprint=PAGE):
+        self.present = set(present)
+        self.fingerprint = fingerprint
+        self.calls = []
+
+    def execute_script(self, script, candidates, cached, state):
+        self.calls.append((list(candidates), dict(cached), state))
+        order = list(range(len(candidates)))
+        preferred = cached.get(self.fingerprint)
+        if preferred in candidates:
+            order.remove(candidates.index(preferred))
+            order.insert(0, candidates.index(preferred))
+        for index in order:
+            if candidates[index] in self.present:
+                return {'fingerprint': self.fingerprint, 'index': index, 'element': f'<{candidates[index]}>'}
+        return {'fingerprint': self.fingerprint, 'index': -1, 'element': None}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = LocatorCache(str(tmp_path / 'locators.json'))
+    monkeypatch.setattr(locators, '_cache', cache)
+    return cache
+
+
+def test_fallbacks_are_keyed_by_existing_selectors():
+    primaries = {
+        *FORM_SELECTORS.values(), *WEBTABLE_SELECTORS.values(),
+        *BUTTON_SELECTORS.values(), *DROPPABLE_SELECTORS.values(),
+    }
+    assert set(SELECTOR_FALLBACKS) <= primaries
+    assert candidates_for('#firstName') == ['#firstName']
+    assert candidates_for(FORM_SELECTORS['state_option'])[0] == '#react-select-3-option-0'
+
+
+def test_broken_primary_resolves_in_one_call_and_reports_drift(cache, tmp_path, caplog):
+    selector = FORM_SELECTORS['state_option']
+    fallback = SELECTOR_FALLBACKS[selector][1]
+    driver = FakeDriver(present=[fallback])
+
+    assert resolve(driver, selector, 'clickable', timeout=1) == f'<{fallback}>'
+    assert len(driver.calls) == 1
+    assert driver.calls[0][2] == 'clickable'
+    assert cache.drift() == [(selector, PAGE, fallback)]
+    assert 'Selector desplazado' in caplog.text
+
+    # Una ejecución nueva carga el ganador y lo envía para probarlo primero
+    saved = json.loads((tmp_path / 'locators.json').read_text())
+    assert saved[selector][PAGE]['winner'] == fallback
+    next_run = FakeDriver(present=[fallback, selector])
+    assert resolve(next_run, selector, timeout=1, cache=LocatorCache(str(tmp_path / 'locators.json'))) == f'<{fallback}>'
+    assert next_run.calls[0][1] == {PAGE: fallback}
+
+
+def test_primary_recovering_clears_cached_winner(cache, caplog):
+    caplog.set_level(logging.INFO, logger='utils.locators')
+    selector = FORM_SELECTORS['close_modal']
+    record_resolution(selector, PAGE, 2)
+    assert cache.winners(selector) == {PAGE: '//button[normalize-space()="Close"]'}
+
+    record_resolution(selector, PAGE, 0)
+    assert cache.winners(selector) == {PAGE: selector}
+    assert 'vuelve a resolver' in caplog.text
+
+
+def test_no_candidate_times_out(cache, virtual_clock):
+    driver = FakeDriver()
+    with pytest.raises(TimeoutException, match='ningún candidato'):
+        resolve(driver, BUTTON_SELECTORS['dynamic_click'], timeout=10)
+    assert len(driver.calls) == 22 and virtual_clock.monotonic() == 10.5
+    assert cache.drift() == []
+
+
+def test_wait_helpers_route_healable_selectors(cache):
+    selector = FORM_SELECTORS['city_option']
+    driver = FakeDriver(present=[selector])
+
+    assert wait_for_clickable(driver, selector, timeout=1) == f'<{selector}>'
+    assert [state for _, _, state in driver.calls] == ['clickable']
+    assert cache.drift() == []
@@ -0,0 +1,30 @@
+"""
+Tests del logging estructurado: contexto, JSON y limitación de mensajes
+"""
+import json
+import logging
+
+from utils.logs import configure_logging, log_context, stop_logging
+from utils.timing import task_timer
+
+
+def test_json_lines_carry_context_and_rate_limit(tmp_path):
+    path = tmp_path / 'rpa.log'
+    configure_logging(fmt='json', use_queue=True, rate_limit=1, filename=str(path))
+    logger = logging.getLogger('tests.logs')
+    try:
+        with log_context(run_id='abc', worker='w1'), task_timer('webtables'):
+            for index in range(50):
+                logger.info("Registro %d extraído", index)
+            logger.error("Error en fila %d", 7)
+    finally:
+        stop_logging()
+        configure_logging()
+
+    entries = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+    rows = [e for e in entries if e['level'] == 'INFO']
+    assert rows[0]['msg'] == 'Registro 0 extraído'
+    assert len(rows) < 50
+    assert entries[-1]['msg'] == 'Error en fila 7'
+    assert all(e['run_id'] == 'abc' and e['worker'] == 'w1' and e['task'] == 'webtables' for e in entries)
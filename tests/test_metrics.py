@@ -0,0 +1,80 @@
+"""
+Tests del formato de exportación de utils.metrics
+"""
+import urllib.request
+
+import pytest
+
+from utils.metrics import Counter, Registry, _Metric, start_http_server, write_textfile
+
+
+def test_render_prometheus_text_format():
+    registry = Registry()
+    runs = registry.counter('rpa_task_runs', 'Ejecuciones', ('task', 'status'))
+    latency = registry.histogram('rpa_wait_seconds', 'Esperas', ('kind',), buckets=(0.1, 1.0))
+    active = registry.gauge('rpa_browsers_active', 'Navegadores')
+
+    runs.labels('webtables', 'success').inc()
+    runs.labels(task='webtables', status='success').inc()
+    latency.labels('visible').observe(0.05)
+    latency.labels('visible').observe(0.5)
+    latency.labels('visible').observe(5)
+    active.inc()
+
+    text = registry.render()
+
+    assert '# TYPE rpa_task_runs_total counter' in text
+    assert 'rpa_task_runs_total{task="webtables",status="success"} 2' in text
+    assert 'rpa_wait_seconds_bucket{kind="visible",le="0.1"} 1' in text
+    assert 'rpa_wait_seconds_bucket{kind="visible",le="1"} 2' in text
+    assert 'rpa_wait_seconds_bucket{kind="visible",le="+Inf"} 3' in text
+    assert 'rpa_wait_seconds_count{kind="visible"} 3' in text
+    assert 'rpa_browsers_active 1' in text
+
+
+def test_write_textfile_is_complete(tmp_path):
+    registry = Registry()
+    registry.counter('rpa_retry_attempts', 'Intentos', ('outcome',)).labels('failure').inc(3)
+
+    path = tmp_path / 'metrics' / 'rpa.prom'
+    write_textfile(str(path), registry)
+
+    assert 'rpa_retry_attempts_total{outcome="failure"} 3' in path.read_text()
+    assert [p.name for p in path.parent.iterdir()] == ['rpa.prom']
+
+
+def test_http_endpoint_binds_loopback_unless_configured(monkeypatch):
+    registry = Registry()
+    registry.gauge('rpa_browsers_active', 'Navegadores').set(2)
+
+    monkeypatch.delenv('METRICS_ADDR', raising=False)
+    server = start_http_server(0, registry=registry)
+    try:
+        host, port = server.server_address
+        assert host == '127.0.0.1'
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5) as response:
+            assert 'rpa_browsers_active 2' in response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    monkeypatch.setenv('METRICS_ADDR', '0.0.0.0')
+    server = start_http_server(0, registry=registry)
+    try:
+        assert server.server_address[0] == '0.0.0.0'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_metric_families_must_define_their_children():
+    with pytest.raises(TypeError):
+        _Metric('rpa_x', 'X')
+
+    class NoCollect(_Metric):
+        def _new_child(self):
+            return None
+
+    with pytest.raises(TypeError, match='_collect_child'):
+        NoCollect('rpa_x', 'X')
+    assert Counter('rpa_x', 'X').labels().value == 0
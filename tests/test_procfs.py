@@ -0,0 +1,38 @@
+"""
+Tests del muestreo de recursos vía /proc y la sugerencia de workers
+"""
+import os
+import sys
+
+import pytest
+
+from utils.procfs import ResourceSampler, recommend_workers
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith('linux'), reason='requiere /proc')
+
+
+def test_sampler_measures_own_process():
+    with ResourceSampler(os.getpid, interval=0.01) as sampler:
+        sum(i * i for i in range(300000))
+
+    summary = sampler.summary()
+
+    assert summary['samples'] >= 2
+    assert summary['rss_peak_mb'] >= summary['rss_mean_mb'] > 0
+    assert summary['threads_peak'] >= 2  # hilo principal + hilo del muestreo
+    assert summary['cpu_seconds'] >= 0
+
+
+def test_sampler_without_browser_has_no_summary():
+    with ResourceSampler(lambda: None, interval=0.01) as sampler:
+        pass
+
+    assert sampler.summary() is None
+
+
+def test_recommend_workers_takes_tighter_limit():
+    # Memoria: 4000 * 0.8 / 500 = 6; CPU: 8 * 0.9 / 0.5 = 14
+    assert recommend_workers(500, 0.5, memory_mb=4000, cpus=8) == 6
+    # CPU: 4 * 0.9 / 1.5 = 2
+    assert recommend_workers(200, 1.5, memory_mb=16000, cpus=4) == 2
+    assert recommend_workers(5000, 4.0, memory_mb=1000, cpus=1) == 1
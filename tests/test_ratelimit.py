@@ -0,0 +1,111 @@
+"""
+Tests del limitador por host con reloj y espera simulados
+"""
+import urllib.error
+
+import pytest
+
+from utils.ratelimit import RateLimiter, rate_limit_driver
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+
+
+def limiter(clock, path=':memory:', **kwargs):
+    kwargs.setdefault('burst', 1)
+    return RateLimiter(path, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_token_bucket_spaces_requests_per_host():
+    clock = FakeClock()
+    rl = limiter(clock, host_rate=10)
+
+    waits = [rl.acquire('https://demoqa.com/page') for _ in range(4)]
+    assert waits == pytest.approx([0, 0.1, 0.2, 0.3])
+    assert rl.acquire('https://other.example.com/') == 0
+    assert rl.acquire('file:///tmp/fixture.html') == 0
+
+    clock.now += 10
+    assert rl.acquire('https://demoqa.com/') == 0
+    stats = rl.stats()['demoqa.com']
+    assert stats['requests'] == 5 and stats['waited'] == pytest.approx(0.6)
+
+
+def test_host_bucket_is_shared_across_processes(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / 'ratelimit.db')
+    first = limiter(clock, path, host_rate=2, worker_id='a')
+    second = limiter(clock, path, host_rate=2, worker_id='b')
+
+    assert first.acquire('https://demoqa.com/') == 0
+    assert second.acquire('https://demoqa.com/') == pytest.approx(0.5)
+
+    # El cubo por worker no se comparte
+    own = limiter(clock, path, worker_rate=1, worker_id='c')
+    other = limiter(clock, path, worker_rate=1, worker_id='d')
+    assert own.acquire('https://demoqa.com/') == 0 and other.acquire('https://demoqa.com/') == 0
+
+
+def test_throttling_slows_every_worker_down_and_recovers(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / 'ratelimit.db')
+    first = limiter(clock, path, host_rate=10, worker_id='a', recovery=0.25)
+    second = limiter(clock, path, host_rate=10, worker_id='b')
+    url = 'https://demoqa.com/books'
+
+    assert first.record(url, 0.2, status=429)
+    assert first.record(url, 20.0)  # lenta
+    first.acquire(url)
+    # Tasa al 25% (2.5/s) también para el otro proceso
+    assert second.acquire(url) == pytest.approx(0.4)
+
+    # Un 404 no es una señal de freno: cuenta como respuesta sana (25% -> 50%)
+    assert not first.record(url, 0.2, status=404)
+    clock.now += 10
+    first.acquire(url)
+    assert second.acquire(url) == pytest.approx(0.2)
+
+    for _ in range(2):
+        first.record(url, 0.1)
+    clock.now += 10
+    first.acquire(url)
+    assert second.acquire(url) == pytest.approx(0.1)
+
+
+def test_request_context_records_http_errors():
+    clock = FakeClock()
+    rl = limiter(clock, host_rate=10)
+
+    with pytest.raises(urllib.error.HTTPError):
+        with rl.request('https://demoqa.com/'):
+            raise urllib.error.HTTPError('https://demoqa.com/', 503, 'Service Unavailable', {}, None)
+    assert rl.stats()['demoqa.com']['throttled'] == 1
+
+
+def test_driver_navigation_passes_through_limiter():
+    clock = FakeClock()
+    rl = limiter(clock, host_rate=1)
+    commands = []
+
+    class FakeDriver:
+        def execute(self, command, params=None):
+            commands.append((command, params))
+            return {'value': None}
+
+    driver = rate_limit_driver(FakeDriver(), rl)
+    driver.execute('get', {'url': 'https://demoqa.com/'})
+    driver.execute('get', {'url': 'https://demoqa.com/buttons'})
+    driver.execute('findElement', {'using': 'css selector', 'value': '#x'})
+
+    assert clock.slept == pytest.approx([1.0])
+    assert [c for c, _ in commands] == ['get', 'get', 'findElement']
+    assert rl.stats()['demoqa.com']['requests'] == 2
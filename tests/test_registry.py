@@ -0,0 +1,95 @@
+"""
+Tests del registro de tareas, la memoización en disco y el salto de tareas sin cambios
+"""
+import pytest
+
+import functions.webtables_task as webtables
+import main
+import utils.timeouts as timeouts
+from functions.registry import TaskMemo, TaskSpec
+
+RUNS = []
+STATE = {'fingerprint': 'v1'}
+
+
+def fake_task(driver):
+    RUNS.append(driver)
+    return {'rows': len(RUNS)}
+
+
+def fake_fingerprint():
+    return STATE['fingerprint']
+
+
+@pytest.fixture
+def spec(monkeypatch):
+    RUNS.clear()
+    STATE['fingerprint'] = 'v1'
+    monkeypatch.setenv('RESOURCE_SAMPLE_INTERVAL', '0')
+    monkeypatch.setenv('WAIT_LEARNING', '0')
+    monkeypatch.setattr(timeouts, '_profile', None)
+    return TaskSpec('fake', 'Falsa', 'test_registry:fake_task', inputs=('FAKE_TARGET',),
+                    fingerprint='test_registry:fake_fingerprint')
+
+
+def test_memo_put_get_and_invalidate(tmp_path):
+    memo = TaskMemo(str(tmp_path / 'cache'))
+    assert memo.get('webtables', 'abc') is None
+
+    memo.put('webtables', 'abc', [{'email': 'a@example.com'}])
+    assert memo.get('webtables', 'abc')['result'] == [{'email': 'a@example.com'}]
+    assert memo.get('webtables', 'other') is None
+    assert memo.get('webtables', None) is None
+
+    memo.put('form', None, True)
+    assert not (tmp_path / 'cache' / 'form.json').exists()
+
+    memo.invalidate('webtables')
+    assert memo.get('webtables', 'abc') is None
+
+
+def test_fingerprint_covers_inputs_and_state(spec, monkeypatch):
+    first = spec.compute_fingerprint()
+    assert first == spec.compute_fingerprint()
+
+    monkeypatch.setenv('FAKE_TARGET', 'otra-bd')
+    assert spec.compute_fingerprint() != first
+
+    STATE['fingerprint'] = None
+    assert spec.compute_fingerprint() is None
+    assert TaskSpec('form', 'Formulario', 'x:y').compute_fingerprint() is None
+
+
+def test_unchanged_task_is_skipped(spec, tmp_path):
+    memo = TaskMemo(str(tmp_path / 'cache'))
+
+    assert main.run_registered_task(spec, 'driver-1', memo=memo) == {'rows': 1}
+    assert main.run_registered_task(spec, 'driver-2', memo=memo) == {'rows': 1}
+    assert RUNS == ['driver-1']
+
+    STATE['fingerprint'] = 'v2'
+    assert main.run_registered_task(spec, 'driver-3', memo=memo) == {'rows': 2}
+
+    # Sin huella (estado desconocido) siempre se ejecuta y no se memoriza
+    STATE['fingerprint'] = None
+    main.run_registered_task(spec, 'driver-4', memo=memo)
+    main.run_registered_task(spec, 'driver-5', memo=memo)
+    assert RUNS == ['driver-1', 'driver-3', 'driver-4', 'driver-5']
+
+
+def test_webtables_fingerprint_needs_rows_and_stored_employees(monkeypatch, fixture_url):
+    stored = set()
+    monkeypatch.setattr(webtables, 'get_employee_by_email', lambda email: {'email': email} if email in stored else None)
+
+    # Tabla armada en el navegador: el HTML servido no trae filas
+    assert webtables.webtables_fingerprint(fixture_url('webtables_shell.html')) is None
+
+    url = fixture_url('webtables.html')
+    rows = webtables.extract_webtables_light(url)
+    assert webtables.validate_rows(rows)
+    # Filas ausentes de la BD (tabla vaciada): hay que volver a escribirlas
+    assert webtables.webtables_fingerprint(url) is None
+
+    stored.update(row['email'] for row in rows)
+    fingerprint = webtables.webtables_fingerprint(url)
+    assert fingerprint is not None and fingerprint == webtables.webtables_fingerprint(url)
@@ -0,0 +1,64 @@
+"""
+Tests del reparto de sesiones entre nodos WebDriver remotos (sin navegador)
+"""
+import pytest
+from urllib3.exceptions import MaxRetryError
+
+from utils.remote_nodes import NodePool, NoNodeAvailable, parse_nodes
+
+
+class FakeDriver:
+    def __init__(self, url):
+        self.url = url
+        self.fail_with = None
+        self.quits = 0
+
+    def execute(self, driver_command, params=None):
+        if self.fail_with:
+            raise self.fail_with
+        return {'value': None}
+
+    def quit(self):
+        self.quits += 1
+
+
+def make_pool(spec, down=(), probe=None):
+    def factory(url, options):
+        if url in down:
+            raise MaxRetryError(None, url, 'connection refused')
+        return FakeDriver(url)
+    return NodePool(parse_nodes(spec), recheck_interval=0, probe=probe or (lambda url: url not in down),
+                    session_factory=factory)
+
+
+def test_places_sessions_on_least_loaded_node():
+    pool = make_pool('http://a:4444=2,http://b:4444=1')
+
+    placed = [pool.create_session(options=None).url for _ in range(3)]
+
+    assert sorted(placed) == ['http://a:4444', 'http://a:4444', 'http://b:4444']
+    with pytest.raises(NoNodeAvailable):
+        pool.create_session(options=None)
+
+
+def test_fails_over_and_releases_capacity():
+    down = {'http://a:4444'}
+    pool = make_pool('http://a:4444,http://b:4444', down=down)
+
+    driver = pool.create_session(options=None)
+    assert driver.url == 'http://b:4444'
+    assert not pool.nodes[0].healthy
+
+    # Un error de conexión durante la sesión marca el nodo; quit libera el lugar una vez
+    driver.fail_with = MaxRetryError(None, driver.url, 'reset')
+    with pytest.raises(MaxRetryError):
+        driver.execute('getTitle')
+    assert not pool.nodes[1].healthy
+    driver.quit()
+    driver.quit()
+    assert pool.nodes[1].active == 0
+
+    # El chequeo de salud recupera los nodos cuando vuelven a responder
+    down.clear()
+    assert pool.create_session(options=None).url in ('http://a:4444', 'http://b:4444')
+    assert all(node.healthy for node in pool.nodes)
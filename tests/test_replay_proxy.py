@@ -0,0 +1,50 @@
+"""
+Tests del proxy de grabación/reproducción con un origen HTTP local
+"""
+import functools
+import http.server
+import threading
+import urllib.error
+
+import pytest
+
+from utils.replay_proxy import ReplayProxy
+
+
+@pytest.fixture
+def origin(tmp_path):
+    site = tmp_path / 'site'
+    site.mkdir()
+    (site / 'page.html').write_text('<p>grabado</p>', encoding='utf-8')
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(site))
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_record_then_replay_offline(tmp_path, origin):
+    store = str(tmp_path / 'cache')
+    recorder = ReplayProxy(store, mode='record').start()
+    try:
+        body = recorder.urllib_opener().open(f'{origin}/page.html', timeout=5).read()
+    finally:
+        recorder.stop()
+    assert body == b'<p>grabado</p>'
+    assert recorder.stats()['recorded'] == 1
+
+    replayer = ReplayProxy(store, mode='replay', ignore_params=('_',)).start()
+    try:
+        opener = replayer.urllib_opener()
+        # Un parámetro ignorado no cambia la clave
+        assert opener.open(f'{origin}/page.html?_=123', timeout=5).read() == b'<p>grabado</p>'
+        with pytest.raises(urllib.error.HTTPError) as error:
+            opener.open(f'{origin}/missing.html', timeout=5)
+        assert error.value.code == 504
+    finally:
+        replayer.stop()
+
+    stats = replayer.stats()
+    assert (stats['hit'], stats['miss'], stats['hit_ratio']) == (1, 1, 0.5)
@@ -0,0 +1,40 @@
+"""
+Tests de retry_on_failure sobre el reloj virtual (los backoffs no duermen)
+"""
+import time
+
+import pytest
+
+from utils.utils import retry_on_failure
+
+
+def test_flaky_function_succeeds_after_backoff(virtual_clock):
+    attempts = []
+
+    def flaky_function():
+        attempts.append(virtual_clock.monotonic())
+        if len(attempts) < 3:
+            raise Exception(f"Fallo simulado (intento {len(attempts)})")
+        return "¡Éxito!"
+
+    started = time.perf_counter()
+    assert retry_on_failure(flaky_function, max_retries=5, delay=1) == "¡Éxito!"
+
+    assert virtual_clock.sleeps == [1, 2]
+    assert attempts == [0, 1, 3]
+    assert time.perf_counter() - started < 0.5
+
+
+def test_always_failing_function_raises_last_error(virtual_clock):
+    def always_fails():
+        raise ValueError("Esta función siempre falla")
+
+    with pytest.raises(ValueError, match='siempre falla'):
+        retry_on_failure(always_fails, max_retries=3, delay=2)
+    assert virtual_clock.sleeps == [2, 4]
+    assert virtual_clock.monotonic() == 6
+
+
+def test_working_function_does_not_wait(virtual_clock):
+    assert retry_on_failure(lambda: "Funcionó de inmediato", max_retries=3, delay=1) == "Funcionó de inmediato"
+    assert virtual_clock.sleeps == []
@@ -0,0 +1,59 @@
+"""
+Tests de arranque en frío del CLI: importar main no carga Selenium ni las tareas
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Presupuesto del import de main medido con -X importtime (hoy ~30ms; antes ~230ms)
+IMPORT_BUDGET_MS = float(os.getenv('STARTUP_IMPORT_BUDGET_MS', '120'))
+
+HEAVY_MODULES = (
+    'selenium.webdriver',
+    'webdriver_manager',
+    'urllib3',
+    'http.server',
+    'pymysql',
+    'functions.form_task',
+    'functions.webtables_task',
+    'functions.buttons_task',
+    'functions.droppable_task',
+    'utils.replay_proxy',
+    'utils.wire_profiler',
+)
+
+
+def import_times(code):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def test_importing_main_skips_browser_and_task_dependencies():
+    times = import_times('import main')
+
+    assert not [name for name in HEAVY_MODULES if name in times]
+    assert times['main'] < IMPORT_BUDGET_MS
+
+
+def test_help_runs_without_loading_selenium():
+    result = subprocess.run(
+        [sys.executable, '-c', 'import sys, runpy; sys.argv = ["main.py", "--help"]\n'
+         'try:\n    runpy.run_path("main.py", run_name="__main__")\n'
+         'except SystemExit:\n    pass\n'
+         'print("selenium.webdriver" in sys.modules)'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    assert '--task' in result.stdout
+    assert result.stdout.strip().endswith('False')
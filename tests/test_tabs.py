@@ -0,0 +1,101 @@
+"""
+Tests de la multiplexación de pestañas sobre una sesión WebDriver falsa
+"""
+import threading
+
+from selenium.webdriver.remote.command import Command
+
+import utils.tabs as tabs
+from utils.ratelimit import RateLimiter
+from utils.tabs import TabMultiplexer, run_in_tabs
+
+
+class FakeSession:
+    """
+    Sesión con varias ventanas: registra en qué pestaña corrió cada comando
+
+    El estado vive en un dict compartido porque las vistas son copias superficiales.
+    """
+
+    def __init__(self):
+        self.state = {'handles': ['tab-0'], 'current': 'tab-0', 'log': [], 'switches': 0}
+
+    def execute(self, driver_command, params=None):
+        state = self.state
+        if driver_command == Command.W3C_GET_CURRENT_WINDOW_HANDLE:
+            return {'value': state['current']}
+        if driver_command == Command.NEW_WINDOW:
+            handle = f"tab-{len(state['handles'])}"
+            state['handles'].append(handle)
+            return {'value': {'handle': handle}}
+        if driver_command == Command.SWITCH_TO_WINDOW:
+            state['current'] = params['handle']
+            state['switches'] += 1
+            return {'value': None}
+        if driver_command == Command.CLOSE:
+            state['handles'].remove(state['current'])
+            return {'value': None}
+        state['log'].append((params.get('task', driver_command), state['current']))
+        return {'value': state['current']}
+
+
+def test_each_view_runs_commands_in_its_own_tab():
+    session = FakeSession()
+    multiplexer = TabMultiplexer(session)
+    first = multiplexer.open_tab(reuse_current=True)
+    second = multiplexer.open_tab()
+
+    assert (first.window_handle, second.window_handle) == ('tab-0', 'tab-1')
+    assert second.execute('getTitle', {'task': 'b'})['value'] == 'tab-1'
+    assert second.execute('getTitle', {'task': 'b'})['value'] == 'tab-1'
+    assert first.execute('getTitle', {'task': 'a'})['value'] == 'tab-0'
+    # Solo cambia de pestaña cuando la vista activa es otra
+    assert session.state['switches'] == 2
+
+    multiplexer.close_all(keep_one=True)
+    assert session.state['handles'] == ['tab-0']
+
+
+def test_run_in_tabs_collects_results_and_cleans_up():
+    session = FakeSession()
+    barrier = threading.Barrier(3)
+
+    def task(name):
+        def run(tab):
+            barrier.wait(2)
+            for _ in range(20):
+                assert tab.execute('getTitle', {'task': name})['value'] == tab.window_handle
+            return f'{name} ok'
+        return run
+
+    def failing(tab):
+        barrier.wait(2)
+        raise RuntimeError('elemento no encontrado')
+
+    results = run_in_tabs(session, [('form', task('form')), ('buttons', task('buttons')), ('droppable', failing)])
+
+    assert results == {'form': 'form ok', 'buttons': 'buttons ok', 'droppable': False}
+    # Cada comando se ejecutó en la pestaña de su tarea
+    tabs = {name: {handle for task_name, handle in session.state['log'] if task_name == name}
+            for name in ('form', 'buttons')}
+    assert tabs == {'form': {'tab-0'}, 'buttons': {'tab-1'}}
+    # Se conserva solo la pestaña inicial
+    assert session.state['handles'] == ['tab-0']
+
+
+def test_tab_navigation_passes_through_limiter(monkeypatch):
+    slept = []
+    limiter = RateLimiter(':memory:', host_rate=1, burst=1, clock=lambda: 1000.0, sleep=slept.append)
+    monkeypatch.setattr(tabs, 'get_rate_limiter', lambda: limiter)
+    session = FakeSession()
+    multiplexer = TabMultiplexer(session)
+    first = multiplexer.open_tab(reuse_current=True)
+    second = multiplexer.open_tab()
+
+    first.execute('get', {'url': 'https://demoqa.com/automation-practice-form'})
+    second.execute('get', {'url': 'https://demoqa.com/buttons'})
+
+    # El segundo get espera su token aunque venga de otra pestaña
+    assert slept == [1.0]
+    assert limiter.stats()['demoqa.com']['requests'] == 2
+    assert session.state['log'] == [('get', 'tab-0'), ('get', 'tab-1')]
@@ -0,0 +1,123 @@
+"""
+Tests de la extracción por niveles contra páginas locales de fixtures
+"""
+import pytest
+
+from utils.tiered import TierStats, run_tiers, fetch_html
+
+
+def test_run_tiers_uses_first_valid_tier():
+    stats = TierStats()
+    calls = []
+
+    def light():
+        calls.append('http')
+        return [{'email': 'a@example.com'}]
+
+    def heavy():
+        calls.append('selenium')
+        return [{'email': 'b@example.com'}]
+
+    tier, result = run_tiers([('http', light), ('selenium', heavy)], bool, stats=stats)
+
+    assert tier == 'http'
+    assert result == [{'email': 'a@example.com'}]
+    assert calls == ['http']
+    assert stats.snapshot()['http']['hit_rate'] == 1.0
+
+
+def test_run_tiers_falls_back_on_empty_invalid_or_error():
+    stats = TierStats()
+
+    def broken():
+        raise RuntimeError('sin red')
+
+    tiers = [
+        ('broken', broken),
+        ('empty', lambda: []),
+        ('invalid', lambda: ['x']),
+        ('selenium', lambda: ['ok']),
+    ]
+    tier, result = run_tiers(tiers, lambda rows: rows == ['ok'], stats=stats)
+
+    assert (tier, result) == ('selenium', ['ok'])
+    snapshot = stats.snapshot()
+    assert snapshot['broken']['error'] == 1
+    assert snapshot['empty']['miss'] == 1
+    assert snapshot['invalid']['miss'] == 1
+    assert snapshot['selenium']['hit'] == 1
+
+
+def test_run_tiers_raises_when_every_tier_fails():
+    def broken():
+        raise RuntimeError('falló')
+
+    with pytest.raises(RuntimeError):
+        run_tiers([('a', broken), ('b', broken)], bool)
+
+
+def test_fetch_html_reads_fixture_page(fixture_url):
+    html = fetch_html(fixture_url('webtables.html'))
+    assert 'rt-table' in html
+
+
+def test_select_rows_text_uses_webtable_selectors(fixture_url):
+    pytest.importorskip('bs4')
+    from utils.tiered import select_rows_text
+    from utils.selectors import WEBTABLE_SELECTORS
+
+    fields = ['first_name', 'email', 'department']
+    rows = select_rows_text(
+        fetch_html(fixture_url('webtables.html')),
+        WEBTABLE_SELECTORS['rows'],
+        {field: WEBTABLE_SELECTORS[field] for field in fields},
+        [0, 2],
+    )
+
+    assert rows == [
+        {'first_name': 'Cierra', 'email': 'cierra@example.com', 'department': 'Insurance'},
+        {'first_name': 'Kierra', 'email': 'kierra@example.com', 'department': 'Legal'},
+    ]
+
+
+def test_find_json_records_reads_embedded_payload(fixture_url):
+    pytest.importorskip('bs4')
+    from utils.tiered import find_json_records
+
+    records = find_json_records(
+        fetch_html(fixture_url('webtables_json.html')),
+        ['first_name', 'last_name', 'email'],
+    )
+
+    assert len(records) == 3
+    assert records[1] == {'first_name': 'Alden', 'last_name': 'Cantrell', 'email': 'alden@example.com'}
+
+
+@pytest.mark.parametrize('page', ['webtables.html', 'webtables_json.html'])
+def test_light_tier_resolves_without_browser(fixture_url, page):
+    pytest.importorskip('bs4')
+    pytest.importorskip('selenium')
+    from functions import webtables_task
+
+    class NoBrowser:
+        def __getattr__(self, name):
+            raise AssertionError('no se debe usar el navegador')
+
+    rows = webtables_task.extract_webtables_tiered(NoBrowser(), fixture_url(page))
+
+    assert [row['email'] for row in rows] == ['cierra@example.com', 'kierra@example.com']
+    assert rows[0]['age'] == 39 and rows[0]['salary'] == 10000.0
+
+
+def test_light_tier_falls_back_to_selenium_on_app_shell(fixture_url, monkeypatch):
+    pytest.importorskip('bs4')
+    pytest.importorskip('selenium')
+    from functions import webtables_task
+
+    expected = [{'first_name': 'Cierra', 'last_name': 'Vega', 'age': 39,
+                 'email': 'cierra@example.com', 'salary': 10000.0, 'department': 'Insurance'}]
+    monkeypatch.setattr(webtables_task, 'extract_webtables', lambda driver, url: expected)
+
+    rows = webtables_task.extract_webtables_tiered(object(), fixture_url('webtables_shell.html'))
+
+    assert rows == expected
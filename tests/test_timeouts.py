@@ -0,0 +1,79 @@
+"""
+Tests del presupuesto de tiempo por tarea y los plazos aprendidos
+"""
+import pytest
+
+from utils.timeouts import BudgetExceeded, TaskBudget, record_wait, task_budget_seconds, wait_timeout
+from utils.timing import task_timer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_learned_p99_shortens_waits_for_known_selectors():
+    budget = TaskBudget('webtables', 45, latencies={'.rt-table': 0.4, '.slow': 6.0},
+                        factor=3, min_timeout=1.0, clock=FakeClock())
+
+    assert budget.timeout_for('.rt-table') == pytest.approx(1.2)
+    assert budget.timeout_for('.slow') == 10
+    assert budget.timeout_for('#unknown') == 10
+
+
+def test_waits_are_capped_by_remaining_budget():
+    clock = FakeClock()
+    budget = TaskBudget('buttons', 12, factor=3, min_timeout=1.0, clock=clock)
+
+    clock.now += 9
+    assert budget.timeout_for('#doubleClickBtn') == pytest.approx(3)
+
+    clock.now += 3
+    with pytest.raises(BudgetExceeded, match='buttons'):
+        budget.timeout_for('#doubleClickBtn')
+
+
+def test_active_task_budget_and_wait_recording(monkeypatch):
+    monkeypatch.setenv('TASK_BUDGET_FORM', '5')
+    assert task_budget_seconds('form') == 5
+    assert wait_timeout('#firstName') == 10
+
+    with task_timer('form') as timings:
+        timings.budget = TaskBudget('form', 5, latencies={'#firstName': 0.1}, factor=3, min_timeout=1.0)
+        assert wait_timeout('#firstName') == pytest.approx(1.0)
+        record_wait('#firstName', 0.12, ok=True)
+
+    assert timings.waits == [{'selector': '#firstName', 'duration': 0.12, 'ok': True}]
+
+
+class RecordingStore:
+    def __init__(self):
+        self.environments = []
+
+    def wait_latencies(self, environment=None):
+        self.environments.append(environment)
+        return {'.rt-table': 0.4}
+
+
+def test_wait_profile_is_learned_for_the_current_environment(monkeypatch):
+    import utils.timeouts as timeouts
+
+    store = RecordingStore()
+    monkeypatch.setattr('app.history.create_history_store', lambda: store)
+    monkeypatch.setattr(timeouts, '_environment', None)
+    monkeypatch.setattr(timeouts, '_profile', None)
+    monkeypatch.delenv('WAIT_LEARNING', raising=False)
+    monkeypatch.setenv('BROWSER', 'chromium')
+    monkeypatch.setenv('HTTP_CACHE_MODE', 'replay')
+
+    assert timeouts.get_wait_profile() == {'.rt-table': 0.4}
+    timeouts.set_wait_environment(browser='firefox', http_cache='off', headless=True)
+    assert timeouts.get_wait_profile() == {'.rt-table': 0.4}
+
+    assert store.environments == [
+        {'browser': 'chromium', 'http_cache': 'replay', 'headless': None},
+        {'browser': 'firefox', 'http_cache': 'off', 'headless': True},
+    ]
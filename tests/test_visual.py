@@ -0,0 +1,142 @@
+"""
+Tests de los puntos de control visuales con imágenes sintéticas (sin navegador)
+"""
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import utils.visual as visual
+from utils.utils import visual_checkpoint
+from utils.visual import VisualStore, diff_pixels, hamming, perceptual_hash
+
+
+def frame(width=120, height=80):
+    pixels = np.full((height, width, 3), 240, dtype=np.uint8)
+    pixels[10:30, 10:60] = (30, 90, 200)
+    pixels[50:70, 70:110] = (200, 40, 40)
+    return pixels
+
+
+class FakeDriver:
+    def __init__(self, pixels, rects=()):
+        self.pixels = pixels
+        self.rects = rects
+        self.scripts = []
+
+    def get_screenshot_as_png(self):
+        buffer = io.BytesIO()
+        Image.fromarray(self.pixels).save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    def execute_script(self, script, *args):
+        self.scripts.append(args)
+        return [list(rect) for rect in self.rects]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return VisualStore(str(tmp_path / 'baselines'), str(tmp_path / 'output'))
+
+
+def test_identical_frames_skip_baseline_decode(store, monkeypatch):
+    base = frame()
+    assert store.compare('home', base)['status'] == 'new'
+
+    def no_decode(path):
+        raise AssertionError('la línea base no debe decodificarse con hash idéntico')
+    monkeypatch.setattr(visual, 'load_image', no_decode)
+
+    result = store.compare('home', base.copy())
+    assert result['status'] == 'identical' and result['ok']
+
+
+def test_tolerances_and_diff_image(tmp_path):
+    # Sin descarte por pHash: se prueba el diff por píxel
+    store = VisualStore(str(tmp_path / 'baselines'), str(tmp_path / 'output'), phash_threshold=64)
+    base = frame()
+    store.compare('home', base)
+
+    noisy = base.copy()
+    noisy[0:5, 0:5] += 3  # bajo pixel_tolerance
+    assert store.compare('home', noisy)['status'] == 'match'
+
+    changed = base.copy()
+    changed[40:48, 20:40] = 0
+    result = store.compare('home', changed)
+    assert result['status'] == 'changed' and not result['ok']
+    assert result['diff_ratio'] == pytest.approx(160 / (120 * 80))
+    assert (tmp_path / 'output' / 'home.diff.png').exists()
+
+
+def test_masks_hide_dynamic_regions(store):
+    base = frame()
+    clock = (90, 0, 30, 8)
+    store.compare('header', base, rects=[clock])
+
+    ticked = base.copy()
+    ticked[0:8, 90:120] = 0
+    assert store.compare('header', ticked, rects=[clock])['status'] == 'identical'
+
+    driver = FakeDriver(ticked, rects=[clock])
+    assert store.check(driver, 'header', masks=['#clock'])['status'] == 'identical'
+    assert driver.scripts == [(['#clock'], None)]
+
+
+def test_phash_rejects_large_changes_without_full_diff(store, monkeypatch):
+    base = frame()
+    store.compare('page', base)
+    flipped = np.ascontiguousarray(base[::-1, ::-1])
+    assert hamming(perceptual_hash(base), perceptual_hash(flipped)) > store.phash_threshold
+
+    monkeypatch.setattr(visual, 'diff_pixels', lambda *args, **kwargs: pytest.fail('diff completo innecesario'))
+    result = store.compare('page', flipped)
+    assert result['status'] == 'changed' and result['diff_ratio'] is None
+
+    assert store.compare('page', frame(60, 40))['status'] == 'size'
+
+
+
+def test_new_masks_skip_phash_computed_with_other_masks(store):
+    base = frame()
+    store.compare('banner', base)
+    # Máscara nueva sobre una región que ya no coincide con la línea base
+    banner = (0, 0, 70, 80)
+    rotated = base.copy()
+    rotated[:, 0:70] = (10, 200, 10)
+    masked_distance = hamming(perceptual_hash(visual.apply_masks(rotated, [banner])), perceptual_hash(base))
+    assert masked_distance > store.phash_threshold
+
+    result = store.compare('banner', rotated, rects=[banner])
+    assert result['status'] == 'match' and result['phash_distance'] is None
+
+def test_diff_pixels_matches_reference_loop():
+    rng = np.random.default_rng(3)
+    a = rng.integers(0, 256, (16, 16, 3), dtype=np.uint8)
+    b = rng.integers(0, 256, (16, 16, 3), dtype=np.uint8)
+    expected = np.array([[max(abs(int(p) - int(q)) for p, q in zip(a[y, x], b[y, x])) > 40
+                          for x in range(16)] for y in range(16)])
+
+    changed, ratio = diff_pixels(a, b, pixel_tolerance=40)
+    assert (changed == expected).all()
+    assert ratio == expected.mean()
+
+
+def test_checkpoint_is_noop_when_disabled_and_update_rewrites(tmp_path, monkeypatch):
+    monkeypatch.delenv('VISUAL_MODE', raising=False)
+    assert visual_checkpoint(None, 'anything') is True
+
+    monkeypatch.setenv('VISUAL_BASELINE_DIR', str(tmp_path / 'baselines'))
+    monkeypatch.setenv('VISUAL_OUTPUT_DIR', str(tmp_path / 'output'))
+    monkeypatch.setattr(visual, '_store', None)
+    monkeypatch.setenv('VISUAL_MODE', 'check')
+    assert visual_checkpoint(FakeDriver(frame()), 'flow') is True
+    changed = frame()
+    changed[:, :60] = 0
+    assert visual_checkpoint(FakeDriver(changed), 'flow') is False
+
+    monkeypatch.setenv('VISUAL_MODE', 'update')
+    assert visual_checkpoint(FakeDriver(changed), 'flow') is True
+    monkeypatch.setenv('VISUAL_MODE', 'check')
+    assert visual_checkpoint(FakeDriver(changed), 'flow') is True
@@ -0,0 +1,85 @@
+"""
+Tests del perfilador de comandos WebDriver (sin navegador: conexión simulada)
+"""
+import os
+from types import SimpleNamespace
+
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from utils.timing import task_timer
+from utils.wire_profiler import ELEMENT_KEY, ROOT, WireProfiler
+
+
+def fake_execute(connection, command, params):
+    params.pop('id', None)
+    if command == 'findElement':
+        return {'value': {ELEMENT_KEY: 'el-1'}}
+    return {'value': 'texto'}
+
+
+def read_cell(connection):
+    connection.execute('findElement', {'using': 'css selector', 'value': '.rt-td'})
+    connection.execute('getElementText', {'id': 'el-1'})
+
+
+def test_groups_commands_by_task_function_and_selector(monkeypatch, tmp_path):
+    monkeypatch.setattr(RemoteConnection, 'execute', fake_execute)
+    connection = object.__new__(RemoteConnection)
+    profiler = WireProfiler().install()
+    try:
+        with task_timer('webtables'):
+            read_cell(connection)
+            read_cell(connection)
+    finally:
+        profiler.uninstall()
+    assert RemoteConnection.execute is fake_execute
+
+    commands = {key: count for key, count, _ in profiler.hot_spots('command')}
+    assert commands == {'findElement': 2, 'getElementText': 2}
+    # El comando sobre el elemento hereda el selector con el que se encontró
+    assert profiler.hot_spots('selector') == [
+        ('css selector=.rt-td', 4, profiler.hot_spots('selector')[0][2])
+    ]
+    assert profiler.hot_spots('function')[0][0].endswith('read_cell')
+    assert profiler.hot_spots('task')[0][:2] == ('webtables', 4)
+
+    path = tmp_path / 'wire.folded'
+    profiler.write_folded(str(path))
+    stacks = [line.rsplit(' ', 1)[0] for line in path.read_text(encoding='utf-8').splitlines()]
+    assert any(s.startswith('webtables;') and s.endswith('read_cell;getElementText') for s in stacks)
+    assert 'findElement' in profiler.report()
+
+
+def test_stack_labels_without_co_qualname():
+    # Python 3.9/3.10: los objetos código no tienen co_qualname
+    code = SimpleNamespace(co_filename=os.path.join(ROOT, 'functions', 'webtables_task.py'), co_name='read_rows')
+    caller = SimpleNamespace(f_code=code, f_globals={'__name__': 'functions.webtables_task'}, f_back=None)
+    skipped = SimpleNamespace(
+        f_code=SimpleNamespace(co_filename=os.path.join(ROOT, 'utils', 'wire_profiler.py'), co_name='execute'),
+        f_globals={'__name__': 'utils.wire_profiler'}, f_back=caller,
+    )
+    assert not hasattr(code, 'co_qualname')
+    assert WireProfiler._project_frames(skipped) == ['functions.webtables_task.read_rows']
+
+    profiler = WireProfiler()
+    profiler._record('findElements', None, 0.01, skipped)
+    assert profiler.hot_spots('function')[0][:2] == ('functions.webtables_task.read_rows', 1)
+
+
+def frame_at(path, module, name, back=None):
+    code = SimpleNamespace(co_filename=os.path.join(ROOT, *path), co_name=name)
+    return SimpleNamespace(f_code=code, f_globals={'__name__': module}, f_back=back)
+
+
+def test_in_repo_virtualenv_and_driver_wrappers_are_not_project_code():
+    caller = frame_at(('functions', 'form_task.py'), 'functions.form_task', 'open_form')
+    limiter = frame_at(('utils', 'ratelimit.py'), 'utils.ratelimit', 'execute', caller)
+    lazy = frame_at(('main.py',), '__main__', 'quit', limiter)
+    webdriver = frame_at(('env', 'lib', 'python3.12', 'site-packages', 'selenium', 'webdriver', 'remote',
+                          'webdriver.py'), 'selenium.webdriver.remote.webdriver', 'execute', lazy)
+    vendored = frame_at(('vendor', 'dist-packages', 'selenium', 'webdriver.py'), 'selenium.webdriver', 'get', webdriver)
+
+    assert WireProfiler._project_frames(vendored) == ['functions.form_task.open_form']
+    assert WireProfiler._project_frames(frame_at(('main.py',), '__main__', 'execute_all_tasks')) == [
+        '__main__.execute_all_tasks'
+    ]
@@ -0,0 +1,78 @@
+"""
+Tests del pool de workers: reenvío de señales a procesos hijos reales
+"""
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Hijo: cuenta los SIGTERM recibidos mientras "termina su trabajo"
+CHILD = textwrap.dedent("""
+    import signal, sys, time
+    received = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: received.append(signum))
+    open(sys.argv[1] + '.ready', 'w').close()
+    deadline = time.monotonic() + 10
+    while not received and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.5)
+    with open(sys.argv[1], 'w') as f:
+        f.write(str(len(received)))
+""")
+
+# Padre: run_pool con los hijos sustituidos por CHILD. El reenvío se retrasa
+# para que no se funda con una señal que el hijo ya recibió (las señales
+# estándar pendientes no se acumulan)
+POOL = textwrap.dedent("""
+    import signal, subprocess, sys, time
+    import worker
+
+    child, out = sys.argv[1], sys.argv[2]
+    real_popen, real_signal = subprocess.Popen, signal.signal
+
+    def popen(argv, env, **kwargs):
+        return real_popen([sys.executable, child, f"{out}-{env['WORKER_INDEX']}"], env=env, **kwargs)
+
+    def delayed(signum, handler):
+        return real_signal(signum, lambda *args: (time.sleep(0.2), handler(*args)))
+
+    subprocess.Popen = popen
+    signal.signal = delayed
+    sys.exit(worker.run_pool(2, []))
+""")
+
+
+def wait_for(paths, timeout=20):
+    deadline = time.monotonic() + timeout
+    while not all(os.path.exists(path) for path in paths):
+        assert time.monotonic() < deadline, f'no aparecieron: {paths}'
+        time.sleep(0.02)
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='grupos de procesos POSIX')
+def test_group_signal_reaches_each_worker_once(tmp_path):
+    child_path = tmp_path / 'child.py'
+    child_path.write_text(CHILD)
+    out = str(tmp_path / 'signals')
+    # El padre en su propia sesión: la señal al grupo no alcanza a pytest
+    pool = subprocess.Popen([sys.executable, '-c', POOL, str(child_path), out],
+                            cwd=ROOT, start_new_session=True)
+    try:
+        wait_for([f'{out}-{index}.ready' for index in range(2)])
+
+        # Como un Ctrl-C en la terminal o un SIGTERM del cgroup: a todo el grupo del padre
+        os.killpg(pool.pid, signal.SIGTERM)
+
+        assert pool.wait(timeout=20) == 0
+        counts = [int((tmp_path / f'signals-{index}').read_text()) for index in range(2)]
+        # Una segunda señal haría que Worker saliera sin terminar el trabajo en curso
+        assert counts == [1, 1]
+    finally:
+        if pool.poll() is None:
+            pool.kill()
@@ -0,0 +1,271 @@
+"""
+Plantillas de perfil de Firefox para arranque rápido
+Perfil pre-sembrado (sin asistentes de primer uso, caché en disco caliente)
+que se clona por sesión con copy-on-write o hard links
+"""
+import argparse
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Preferencias que eliminan asistentes de primer uso y tráfico de fondo
+PROFILE_PREFS = {
+    'browser.shell.checkDefaultBrowser': False,
+    'browser.startup.homepage_override.mstone': 'ignore',
+    'browser.startup.page': 0,
+    'browser.aboutwelcome.enabled': False,
+    'startup.homepage_welcome_url': 'about:blank',
+    'startup.homepage_welcome_url.additional': '',
+    'datareporting.policy.dataSubmissionEnabled': False,
+    'datareporting.healthreport.uploadEnabled': False,
+    'toolkit.telemetry.reportingpolicy.firstRun': False,
+    'toolkit.telemetry.enabled': False,
+    'app.update.auto': False,
+    'app.update.enabled': False,
+    'extensions.update.enabled': False,
+    'browser.safebrowsing.malware.enabled': False,
+    'browser.safebrowsing.phishing.enabled': False,
+    'browser.search.update': False,
+    'network.captive-portal-service.enabled': False,
+    'network.connectivity-service.enabled': False,
+    # Caché en disco persistente para que la plantilla conserve los assets
+    'browser.cache.disk.enable': True,
+    'browser.cache.disk.capacity': 262144,
+    'browser.cache.disk.smart_size.enabled': False,
+}
+
+# Única carpeta que se comparte por hard link entre plantilla y clones
+_CACHE_DIR = 'cache2'
+
+
+def _format_pref(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return str(value)
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def write_user_prefs(profile_dir, prefs=None):
+    """
+    Escribe user.js con las preferencias del perfil
+
+    Args:
+        profile_dir (str): Directorio del perfil
+        prefs (dict): Preferencias adicionales (sobrescriben PROFILE_PREFS)
+    """
+    merged = dict(PROFILE_PREFS)
+    merged.update(prefs or {})
+    # La caché del perfil vive dentro del propio directorio para poder clonarla
+    merged['browser.cache.disk.parent_directory'] = os.path.abspath(profile_dir)
+
+    lines = [f'user_pref("{name}", {_format_pref(value)});' for name, value in merged.items()]
+    with open(os.path.join(profile_dir, 'user.js'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def build_profile_template(template_dir, warm_urls=None, headless=True, prefs=None, driver_factory=None):
+    """
+    Crea (o refresca) una plantilla de perfil y calienta su caché de disco
+
+    Args:
+        template_dir (str): Directorio donde vive la plantilla
+        warm_urls (list): URLs a visitar para poblar la caché
+        headless (bool): Calentar en modo headless
+        prefs (dict): Preferencias adicionales
+        driver_factory (callable): Recibe FirefoxOptions y retorna un WebDriver
+
+    Returns:
+        str: Path absoluto de la plantilla
+    """
+    template_dir = os.path.abspath(template_dir)
+    os.makedirs(template_dir, exist_ok=True)
+    write_user_prefs(template_dir, prefs)
+    logger.info(f"Plantilla de perfil preparada: {template_dir}")
+
+    if not warm_urls:
+        return template_dir
+
+    from selenium import webdriver
+
+    options = webdriver.FirefoxOptions()
+    if headless:
+        options.add_argument('--headless')
+    # -profile hace que Firefox use el directorio en sitio (sin copia temporal)
+    options.add_argument('-profile')
+    options.add_argument(template_dir)
+
+    if driver_factory is None:
+        from selenium.webdriver.firefox.service import Service
+        from webdriver_manager.firefox import GeckoDriverManager
+
+        def driver_factory(opts):
+            return webdriver.Firefox(service=Service(GeckoDriverManager().install()), options=opts)
+
+    driver = driver_factory(options)
+    try:
+        for url in warm_urls:
+            try:
+                driver.get(url)
+                logger.info(f"✓ Caché calentada: {url}")
+            except Exception as e:
+                logger.warning(f"No se pudo calentar {url}: {e}")
+    finally:
+        driver.quit()
+
+    # Bloqueos de la sesión de calentamiento que no deben copiarse a los clones
+    for lock_name in ('lock', '.parentlock', 'parent.lock'):
+        lock_path = os.path.join(template_dir, lock_name)
+        if os.path.lexists(lock_path):
+            os.remove(lock_path)
+
+    _freeze_cache(template_dir)
+    return template_dir
+
+
+def _freeze_cache(template_dir):
+    """
+    Marca la caché de la plantilla como solo lectura
+
+    Los clones comparten estos archivos por hard link: si Firefox intenta
+    reescribir una entrada, falla y la descarta en el clon (unlink), sin
+    modificar el inodo compartido con la plantilla. root ignora estos permisos,
+    por eso en ese caso los clones copian la caché (ver _can_share_cache).
+    """
+    cache_dir = os.path.join(template_dir, _CACHE_DIR)
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            os.chmod(os.path.join(root, name), 0o444)
+
+
+def _try_reflink_copy(src, dst):
+    """
+    Copia con copy-on-write (cp --reflink=always); retorna False si no hay soporte
+    """
+    if not sys.platform.startswith('linux') or shutil.which('cp') is None:
+        return False
+    result = subprocess.run(
+        ['cp', '-a', '--reflink=always', src + '/.', dst],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return result.returncode == 0
+
+
+def _can_share_cache():
+    """
+    Los hard links solo son seguros si el modo 0o444 protege la plantilla:
+    root (habitual en CI y Docker) puede escribir igual sobre el inodo compartido
+    """
+    return not hasattr(os, 'geteuid') or os.geteuid() != 0
+
+
+def _link_or_copy_tree(src, dst, link_cache=None):
+    """
+    Hard links para las entradas de caché (solo lectura), copia para el resto
+
+    Args:
+        link_cache (bool): Compartir la caché por hard link (por defecto si no se es root)
+    """
+    if link_cache is None:
+        link_cache = _can_share_cache()
+    for root, dirs, files in os.walk(src):
+        rel = os.path.relpath(root, src)
+        target_root = os.path.join(dst, rel) if rel != '.' else dst
+        os.makedirs(target_root, exist_ok=True)
+        in_cache = link_cache and rel.split(os.sep)[0] == _CACHE_DIR
+        for name in files:
+            source_file = os.path.join(root, name)
+            target_file = os.path.join(target_root, name)
+            if in_cache:
+                try:
+                    os.link(source_file, target_file)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(source_file, target_file)
+
+
+def clone_profile(template_dir, base_dir=None):
+    """
+    Clona la plantilla en un directorio temporal para una sesión
+
+    Usa copy-on-write si el sistema de archivos lo soporta; si no, hard links
+    para la caché (copia si se ejecuta como root) y copia normal para bases de
+    datos y preferencias.
+
+    Args:
+        template_dir (str): Plantilla creada con build_profile_template
+        base_dir (str): Directorio padre de los clones (temporal por defecto)
+
+    Returns:
+        str: Path del perfil clonado
+    """
+    if not os.path.isdir(template_dir):
+        raise FileNotFoundError(f"Plantilla de perfil no encontrada: {template_dir}")
+
+    clone_dir = tempfile.mkdtemp(prefix='rpa-profile-', dir=base_dir)
+    if not _try_reflink_copy(template_dir, clone_dir):
+        _link_or_copy_tree(template_dir, clone_dir)
+
+    # Firefox debe guardar la caché del clone dentro del clone
+    write_user_prefs(clone_dir, _read_extra_prefs(template_dir))
+    return clone_dir
+
+
+def _read_extra_prefs(profile_dir):
+    """
+    Recupera las preferencias de user.js que no forman parte de PROFILE_PREFS
+    """
+    extra = {}
+    path = os.path.join(profile_dir, 'user.js')
+    if not os.path.exists(path):
+        return extra
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith('user_pref("'):
+                continue
+            name, _, raw = line[len('user_pref("'):].partition('", ')
+            raw = raw.rstrip(');')
+            if name in PROFILE_PREFS or name == 'browser.cache.disk.parent_directory':
+                continue
+            if raw in ('true', 'false'):
+                extra[name] = raw == 'true'
+            elif raw.lstrip('-').isdigit():
+                extra[name] = int(raw)
+            else:
+                extra[name] = raw.strip('"').replace('\\"', '"').replace('\\\\', '\\')
+    return extra
+
+
+def remove_profile(profile_dir):
+    """
+    Elimina un clon de perfil (nunca la plantilla)
+    """
+    shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+def main():
+    """
+    CLI para crear la plantilla: python -m utils.browser_profile DIR --warm-url URL
+    """
+    parser = argparse.ArgumentParser(description='Crear plantilla de perfil de Firefox')
+    parser.add_argument('template_dir', help='Directorio de la plantilla')
+    parser.add_argument('--warm-url', action='append', default=[],
+                        help='URL a visitar para calentar la caché (repetible)')
+    parser.add_argument('--no-headless', action='store_true', help='Calentar con interfaz gráfica')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    build_profile_template(args.template_dir, args.warm_url, headless=not args.no_headless)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
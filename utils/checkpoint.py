@@ -0,0 +1,199 @@
+"""
+Checkpoints de ejecuciones largas
+Registro append-only (una línea JSON por avance) de tareas completadas,
+páginas extraídas y offsets de filas guardadas. Cada avance es un write +
+flush (fsync opcional); cada `compact_every` avances el registro se reescribe
+como una sola instantánea. Tras una caída, la ejecución siguiente relee el
+registro y salta lo que ya estaba hecho (main.py solo reanuda con --resume).
+
+Uso:
+    store = CheckpointStore('.checkpoints/main-all.jsonl')
+    with use_checkpoint(store):
+        ...                          # las tareas consultan current_checkpoint()
+    store.clear()                    # ejecución completa: no hay nada que reanudar
+
+Variables de entorno:
+    CHECKPOINT_DIR:    Directorio de los registros (.checkpoints por defecto)
+    CHECKPOINT_FSYNC:  '1' hace fsync en cada avance (sobrevive a cortes de energía)
+    CHECKPOINT_MAX_AGE_HOURS: Registros más viejos se descartan al cargarlos (24 por defecto; 0 sin límite)
+"""
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_current_checkpoint = contextvars.ContextVar('rpa_checkpoint', default=None)
+
+
+class CheckpointStore:
+    """
+    Estado {clave: entrada} respaldado por un registro append-only
+    """
+
+    def __init__(self, path, compact_every=200, fsync=None, max_age=None):
+        """
+        Args:
+            path (str): Archivo del registro (se crea al primer avance)
+            compact_every (int): Avances antes de reescribir el registro como instantánea
+            fsync (bool): fsync por avance (por defecto CHECKPOINT_FSYNC)
+            max_age (float): Segundos tras el último avance en que el registro sigue
+                vigente (por defecto CHECKPOINT_MAX_AGE_HOURS; 0 sin límite)
+        """
+        self.path = path
+        self.compact_every = compact_every
+        self.fsync = fsync if fsync is not None else os.getenv('CHECKPOINT_FSYNC', '0').strip() == '1'
+        if max_age is None:
+            max_age = float(os.getenv('CHECKPOINT_MAX_AGE_HOURS', '24') or 0) * 3600
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._file = None
+        self._appended = 0
+        self.state = {}
+        self.resumed = self._load()
+
+    def _load(self):
+        """
+        Returns:
+            bool: True si había avances previos (ejecución reanudada)
+        """
+        try:
+            age = time.time() - os.path.getmtime(self.path)
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return False
+        if self.max_age and age > self.max_age:
+            # Páginas y resultados de hace tanto ya no reflejan el sitio
+            logger.warning(f"Checkpoint: {self.path} tiene {age / 3600:.1f} h, se descarta")
+            os.remove(self.path)
+            return False
+        torn = False
+        for number, line in enumerate(lines, 1):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Última línea cortada por la caída: se descarta
+                logger.warning(f"Checkpoint: línea {number} incompleta descartada en {self.path}")
+                torn = True
+                continue
+            self.state[entry.pop('key')] = entry
+        if torn:
+            # Reescribir sin la línea cortada: si no, el próximo avance se
+            # anexaría a ella y también se perdería
+            with self._lock:
+                self._compact_locked()
+        if self.state:
+            logger.info(f"Checkpoint: {len(self.state)} avances previos en {self.path}")
+        return bool(self.state)
+
+    def _append(self, key, entry):
+        with self._lock:
+            self.state[key] = entry
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(json.dumps({'key': key, **entry}, default=str) + '\n')
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._appended += 1
+            if self._appended >= self.compact_every:
+                self._compact_locked()
+
+    def _compact_locked(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key, entry in self.state.items():
+                f.write(json.dumps({'key': key, **entry}, default=str) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        if self._file is not None:
+            self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._appended = 0
+
+    def compact(self):
+        """
+        Reescribe el registro con una línea por clave
+        """
+        with self._lock:
+            if self.state:
+                self._compact_locked()
+
+    def is_done(self, key):
+        entry = self.state.get(key)
+        return entry is not None and entry.get('done', False)
+
+    def result(self, key, default=None):
+        entry = self.state.get(key)
+        return entry.get('result', default) if entry else default
+
+    def mark_done(self, key, result=None):
+        """
+        Registra una unidad de trabajo completada (tarea, job o página)
+        """
+        self._append(key, {'done': True, 'result': result, 'at': time.time()})
+
+    def offset(self, key):
+        """
+        Returns:
+            int: Elementos ya procesados de la secuencia `key` (0 si no hay avance)
+        """
+        entry = self.state.get(key)
+        return entry.get('offset', 0) if entry else 0
+
+    def set_offset(self, key, offset):
+        self._append(key, {'offset': offset, 'at': time.time()})
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def clear(self):
+        """
+        Descarta el registro (la ejecución terminó: no hay nada que reanudar)
+        """
+        self.close()
+        with self._lock:
+            self.state = {}
+            self._appended = 0
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def checkpoint_path(name):
+    """
+    Returns:
+        str: Registro de la ejecución `name` en CHECKPOINT_DIR
+    """
+    return os.path.join(os.getenv('CHECKPOINT_DIR', '.checkpoints'), f'{name}.jsonl')
+
+
+def current_checkpoint():
+    """
+    Returns:
+        CheckpointStore: Checkpoint activo en este contexto o None
+    """
+    return _current_checkpoint.get()
+
+
+@contextmanager
+def use_checkpoint(store):
+    """
+    Activa `store` para las tareas ejecutadas dentro del bloque
+    """
+    token = _current_checkpoint.set(store)
+    try:
+        yield store
+    finally:
+        _current_checkpoint.reset(token)
@@ -0,0 +1,125 @@
+"""
+Reloj intercambiable para esperas, reintentos y pausas
+El motor de reintentos, las esperas explícitas y las tareas toman el tiempo
+y duermen a través de get_clock(). En producción es el reloj del sistema; en
+tests, use_clock(VirtualClock()) hace que cada sleep avance el tiempo virtual
+al instante, así los tests de lógica temporal corren en milisegundos.
+
+wait_until() reemplaza a WebDriverWait.until (que duerme con time.sleep) con
+la misma semántica de sondeo sobre el reloj activo.
+"""
+import contextlib
+import contextvars
+import threading
+import time
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+
+class SystemClock:
+    """
+    Reloj real (time.monotonic / time.time / time.sleep)
+    """
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    Tiempo simulado: sleep() avanza el reloj sin esperar
+
+    Pensado para tests de un solo hilo; con varios hilos cada sleep avanza el
+    tiempo compartido por igual.
+    """
+
+    def __init__(self, start=0.0, wall_start=1_700_000_000.0):
+        self._now = start
+        self._wall_offset = wall_start - start
+        self._lock = threading.Lock()
+        self.sleeps = []
+
+    def monotonic(self):
+        with self._lock:
+            return self._now
+
+    def time(self):
+        with self._lock:
+            return self._now + self._wall_offset
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self._now += max(0.0, seconds)
+
+    def advance(self, seconds):
+        """
+        Avanza el tiempo sin registrarlo como sleep (p. ej. latencia simulada de un comando)
+        """
+        with self._lock:
+            self._now += seconds
+
+
+SYSTEM_CLOCK = SystemClock()
+
+_current_clock = contextvars.ContextVar('clock', default=SYSTEM_CLOCK)
+
+
+def get_clock():
+    """
+    Returns:
+        SystemClock | VirtualClock: Reloj activo en el contexto
+    """
+    return _current_clock.get()
+
+
+@contextlib.contextmanager
+def use_clock(clock):
+    """
+    Activa `clock` dentro del bloque (los hilos nuevos usan el reloj del sistema)
+    """
+    token = _current_clock.set(clock)
+    try:
+        yield clock
+    finally:
+        _current_clock.reset(token)
+
+
+def wait_until(driver, condition, timeout, poll_frequency=0.5, message='', ignored=(NoSuchElementException,)):
+    """
+    Sondea `condition(driver)` hasta que retorne un valor verdadero
+
+    Args:
+        driver: WebDriver instance
+        condition (callable): Condición (p. ej. expected_conditions)
+        timeout (float): Segundos máximos
+        poll_frequency (float): Segundos entre sondeos
+        message (str): Mensaje de la excepción al vencer el plazo
+        ignored (tuple): Excepciones tratadas como "todavía no"
+
+    Returns:
+        El valor retornado por la condición
+
+    Raises:
+        TimeoutException: Si la condición no se cumplió en `timeout` segundos
+    """
+    clock = get_clock()
+    end = clock.monotonic() + timeout
+    while True:
+        try:
+            value = condition(driver)
+            if value:
+                return value
+        except ignored:
+            pass
+        if clock.monotonic() > end:
+            break
+        clock.sleep(poll_frequency)
+    raise TimeoutException(message)
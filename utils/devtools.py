@@ -0,0 +1,141 @@
+"""
+Atajos de rendimiento sobre el protocolo DevTools (CDP)
+En Chromium usan comandos CDP directos; en otros navegadores recurren al
+equivalente WebDriver, así las tareas llaman siempre a la misma función
+
+    evaluate:         Runtime.evaluate en una llamada (extracción masiva del DOM)
+    wait_for_selector: espera dentro de la página con MutationObserver, sin sondeo
+    block_requests:   Network.setBlockedURLs (anuncios, analítica, etc.)
+"""
+import json
+import logging
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+from utils.timeouts import record_wait, wait_timeout
+
+logger = logging.getLogger(__name__)
+
+# Dominios de terceros que no aportan a las tareas (demoqa carga muchos anuncios)
+DEFAULT_BLOCKED_URLS = (
+    '*googlesyndication.com*',
+    '*doubleclick.net*',
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*adservice.google.*',
+    '*amazon-adsystem.com*',
+)
+
+# Resuelve cuando el selector existe; rechaza al vencer el plazo
+WAIT_FOR_SELECTOR_SCRIPT = """
+const [selector, timeoutMs] = arguments;
+return new Promise((resolve, reject) => {
+    if (document.querySelector(selector)) {
+        resolve(true);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        if (document.querySelector(selector)) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(true);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        reject(new Error('timeout: ' + selector));
+    }, timeoutMs);
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+});
+"""
+
+
+def supports_cdp(driver):
+    """
+    Returns:
+        bool: True si el driver expone comandos CDP (Chromium local)
+    """
+    return callable(getattr(driver, 'execute_cdp_cmd', None))
+
+
+def _wrap(script, args):
+    # El mismo cuerpo sirve para execute_script y Runtime.evaluate (usa `arguments`)
+    return f'(function() {{ {script} }}).apply(null, {json.dumps(list(args))})'
+
+
+def evaluate(driver, script, *args, await_promise=False):
+    """
+    Ejecuta un script en una sola llamada y retorna su valor (solo datos JSON)
+
+    Args:
+        driver: WebDriver instance
+        script (str): Cuerpo de función JavaScript (lee sus argumentos de `arguments`)
+        args: Argumentos serializables a JSON
+        await_promise (bool): Esperar la promesa que retorne el script
+
+    Returns:
+        Valor retornado por el script
+
+    Raises:
+        JavascriptException: Si el script lanza una excepción
+    """
+    if supports_cdp(driver):
+        result = driver.execute_cdp_cmd('Runtime.evaluate', {
+            'expression': _wrap(script, args),
+            'returnByValue': True,
+            'awaitPromise': await_promise,
+        })
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            message = details.get('exception', {}).get('description') or details.get('text')
+            raise JavascriptException(message)
+        return result.get('result', {}).get('value')
+
+    if await_promise:
+        # execute_async_script: el último argumento es el callback de WebDriver
+        async_script = (
+            'const done = arguments[arguments.length - 1];'
+            f'Promise.resolve({_wrap(script, args)})'
+            '.then((value) => done({value: value}), (error) => done({error: String(error)}));'
+        )
+        outcome = driver.execute_async_script(async_script)
+        if 'error' in outcome:
+            raise JavascriptException(outcome['error'])
+        return outcome.get('value')
+    return driver.execute_script(script, *args)
+
+
+def wait_for_selector(driver, selector, timeout=None):
+    """
+    Espera a que exista un elemento observando el DOM desde la página
+
+    Args:
+        timeout (float): Segundos (por defecto el plazo del presupuesto de la tarea)
+
+    Raises:
+        TimeoutException: Si el selector no aparece en `timeout` segundos
+    """
+    timeout = wait_timeout(selector) if timeout is None else timeout
+    start = time.perf_counter()
+    try:
+        evaluate(driver, WAIT_FOR_SELECTOR_SCRIPT, selector, int(timeout * 1000), await_promise=True)
+    except JavascriptException as e:
+        record_wait(selector, time.perf_counter() - start, ok=False)
+        raise TimeoutException(f"'{selector}' no apareció en {timeout}s: {e}") from e
+    record_wait(selector, time.perf_counter() - start, ok=True)
+
+
+def block_requests(driver, patterns=DEFAULT_BLOCKED_URLS):
+    """
+    Bloquea peticiones por patrón de URL (solo Chromium)
+
+    Returns:
+        bool: True si el bloqueo quedó activo
+    """
+    if not supports_cdp(driver) or not patterns:
+        return False
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+    logger.info(f"Peticiones bloqueadas por CDP: {len(patterns)} patrones")
+    return True
@@ -0,0 +1,156 @@
+"""
+Motor de drag & drop
+Estrategias de la más rápida a la más conservadora; el drop se confirma
+esperando el cambio de estado de la página (no con sleeps) y se recuerda,
+por navegador, la primera estrategia que funcionó
+
+Estrategias:
+    actions:   acciones W3C con duración mínima (eventos de entrada reales)
+    synthetic: secuencia pointer/mouse sintetizada en un solo execute_script
+    legacy:    cadena original con pausas de 1s (compatibilidad con Firefox antiguo)
+"""
+import logging
+import os
+import threading
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver import ActionChains
+
+from utils.clock import get_clock, wait_until
+from utils.metrics import DRAG_DURATION
+
+logger = logging.getLogger(__name__)
+
+# Movimientos intermedios: los droppables estilo jQuery UI solo inician el
+# arrastre tras superar una distancia mínima y recalculan la intersección en
+# cada mousemove
+SYNTHETIC_DRAG_SCRIPT = """
+const [source, target, steps] = arguments;
+source.scrollIntoView({block: 'center', inline: 'center'});
+const center = (el) => {
+    const r = el.getBoundingClientRect();
+    return [r.left + r.width / 2, r.top + r.height / 2];
+};
+const [sx, sy] = center(source);
+const [tx, ty] = center(target);
+const pointerTypes = {mousedown: 'pointerdown', mousemove: 'pointermove', mouseup: 'pointerup'};
+const fire = (type, x, y, buttons, fallback) => {
+    const el = document.elementFromPoint(x, y) || fallback;
+    const init = {
+        bubbles: true, cancelable: true, composed: true, view: window,
+        clientX: x, clientY: y, screenX: x, screenY: y, button: 0, buttons: buttons,
+        pointerId: 1, pointerType: 'mouse', isPrimary: true
+    };
+    if (window.PointerEvent) {
+        el.dispatchEvent(new PointerEvent(pointerTypes[type], init));
+    }
+    el.dispatchEvent(new MouseEvent(type, init));
+};
+fire('mousedown', sx, sy, 1, source);
+for (let i = 1; i <= steps; i++) {
+    fire('mousemove', sx + (tx - sx) * i / steps, sy + (ty - sy) * i / steps, 1, document);
+}
+fire('mouseup', tx, ty, 0, target);
+"""
+
+
+def _drag_actions(driver, source, target):
+    # Un movimiento corto inicia el arrastre; duración 0 evita la interpolación de 250ms
+    ActionChains(driver, duration=0) \
+        .click_and_hold(source) \
+        .move_by_offset(5, 5) \
+        .move_to_element(target) \
+        .release() \
+        .perform()
+
+
+def _drag_synthetic(driver, source, target, steps=5):
+    driver.execute_script(SYNTHETIC_DRAG_SCRIPT, source, target, steps)
+
+
+def _drag_legacy(driver, source, target):
+    ActionChains(driver).click_and_hold(source).pause(1).move_to_element(target).pause(1).release().perform()
+
+
+STRATEGIES = {
+    'actions': _drag_actions,
+    'synthetic': _drag_synthetic,
+    'legacy': _drag_legacy,
+}
+
+DEFAULT_ORDER = ('actions', 'synthetic', 'legacy')
+
+# Estrategia que funcionó por navegador (se prueba primero en los siguientes drops)
+_preferred = {}
+_preferred_lock = threading.Lock()
+
+
+def strategy_order(browser, strategy=None):
+    """
+    Orden de estrategias a probar
+
+    Args:
+        browser (str): browserName de la sesión
+        strategy (str): Estrategia forzada (por defecto DRAG_STRATEGY o automático)
+
+    Returns:
+        tuple: Nombres de estrategia
+    """
+    strategy = strategy or os.getenv('DRAG_STRATEGY', '').strip().lower() or None
+    if strategy:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estrategia de drag desconocida: '{strategy}' (opciones: {', '.join(STRATEGIES)})")
+        return (strategy,)
+    with _preferred_lock:
+        preferred = _preferred.get(browser)
+    if preferred is None:
+        return DEFAULT_ORDER
+    return (preferred,) + tuple(name for name in DEFAULT_ORDER if name != preferred)
+
+
+def drag_and_drop(driver, source, target, confirm, timeout=5, probe_timeout=1.0, strategy=None):
+    """
+    Arrastra `source` sobre `target` y espera la confirmación del drop
+
+    Args:
+        driver: WebDriver instance
+        source: WebElement a arrastrar
+        target: WebElement destino
+        confirm (callable): Condición de espera (recibe el driver) que indica el drop
+        timeout (float): Espera máxima de la última estrategia
+        probe_timeout (float): Espera máxima de las estrategias previas
+        strategy (str): Forzar una estrategia
+
+    Returns:
+        str: Estrategia que logró el drop
+
+    Raises:
+        TimeoutException: Si ninguna estrategia confirmó el drop (por plazo o por error)
+    """
+    browser = (driver.capabilities or {}).get('browserName', 'unknown')
+    order = strategy_order(browser, strategy)
+
+    clock = get_clock()
+    for position, name in enumerate(order):
+        is_last = position == len(order) - 1
+        start = clock.monotonic()
+        try:
+            STRATEGIES[name](driver, source, target)
+            wait_until(driver, confirm, timeout if is_last else probe_timeout, poll_frequency=0.05)
+        except TimeoutException:
+            DRAG_DURATION.labels(name, 'timeout').observe(clock.monotonic() - start)
+            logger.warning(f"Drag '{name}' sin confirmación en {browser}")
+            continue
+        except WebDriverException as e:
+            # p. ej. MoveTargetOutOfBoundsException o un error del script: probar la siguiente
+            DRAG_DURATION.labels(name, 'error').observe(clock.monotonic() - start)
+            logger.warning(f"Drag '{name}' falló en {browser}: {type(e).__name__}: {e.msg or e}")
+            continue
+        elapsed = clock.monotonic() - start
+        DRAG_DURATION.labels(name, 'success').observe(elapsed)
+        with _preferred_lock:
+            _preferred[browser] = name
+        logger.info(f"Drop confirmado con estrategia '{name}' en {elapsed:.2f}s")
+        return name
+
+    raise TimeoutException(f"Ninguna estrategia de drag confirmó el drop: {', '.join(order)}")
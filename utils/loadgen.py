@@ -0,0 +1,351 @@
+"""
+Generador de carga: usuarios virtuales (VU) concurrentes
+Cada VU tiene su propia sesión y repite una iteración (p. ej. completar y
+validar el formulario). La cantidad de VUs sigue un plan de etapas con rampa
+lineal; opcionalmente las iteraciones llegan a una tasa objetivo (modelo
+abierto) en lugar de encadenarse tras un tiempo de espera (modelo cerrado).
+
+Etapas:      "30s:5,2m:5,30s:0"  (rampa a 5 VUs en 30s, 2 minutos a 5, bajada a 0)
+Think time:  none | const:1.5 | uniform:0.5-2 | exp:1 (media) | normal:1,0.3
+
+En el modelo abierto la latencia se mide desde la llegada programada (incluye
+la cola), así una saturación se ve en los percentiles y no se oculta.
+"""
+import collections
+import logging
+import math
+import queue
+import random
+import re
+import threading
+import time
+
+from utils.metrics import LOADGEN_ITERATIONS, LOADGEN_LATENCY, LOADGEN_USERS
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def parse_duration(text):
+    """
+    Returns:
+        float: Segundos de '90', '90s', '2m' o '1h'
+    """
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*', text)
+    if not match:
+        raise ValueError(f"Duración inválida: '{text}'")
+    return float(match.group(1)) * {'': 1, 's': 1, 'm': 60, 'h': 3600}[match.group(2)]
+
+
+def parse_stages(spec):
+    """
+    Args:
+        spec (str): "duración:usuarios,duración:usuarios,..."
+
+    Returns:
+        list: (segundos, usuarios objetivo al final de la etapa)
+    """
+    stages = []
+    for item in (part.strip() for part in spec.split(',')):
+        if not item:
+            continue
+        duration, _, users = item.partition(':')
+        stages.append((parse_duration(duration), int(users)))
+    if not stages:
+        raise ValueError("El plan de carga necesita al menos una etapa")
+    return stages
+
+
+def target_users(stages, elapsed):
+    """
+    Usuarios objetivo en el instante `elapsed`: rampa lineal entre el objetivo
+    de la etapa anterior y el de la actual
+
+    Returns:
+        int: Usuarios objetivo o None si el plan terminó
+    """
+    previous = 0
+    for duration, users in stages:
+        if elapsed < duration:
+            return round(previous + (users - previous) * (elapsed / duration if duration else 1))
+        elapsed -= duration
+        previous = users
+    return None
+
+
+def parse_think_time(spec):
+    """
+    Returns:
+        callable: (random.Random) -> segundos de espera entre iteraciones
+    """
+    kind, _, params = (spec or 'none').strip().lower().partition(':')
+    if kind == 'none':
+        return lambda rng: 0.0
+    if kind == 'const':
+        value = float(params)
+        return lambda rng: value
+    if kind == 'uniform':
+        low, _, high = params.partition('-')
+        low, high = float(low), float(high)
+        return lambda rng: rng.uniform(low, high)
+    if kind == 'exp':
+        mean = float(params)
+        return lambda rng: rng.expovariate(1 / mean)
+    if kind == 'normal':
+        mean, _, sigma = params.partition(',')
+        mean, sigma = float(mean), float(sigma)
+        return lambda rng: max(0.0, rng.gauss(mean, sigma))
+    raise ValueError(f"Distribución de think time desconocida: '{spec}' (none, const, uniform, exp, normal)")
+
+
+def percentile(ordered, q):
+    """
+    Percentil por rango más cercano de una lista ordenada
+    """
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class WindowStats:
+    """
+    Iteraciones, errores y latencias de una ventana de tiempo (seguro entre hilos)
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._reset(clock())
+
+    def _reset(self, now):
+        self.started = now
+        self.latencies = []
+        self.errors = collections.Counter()
+        self.dropped = 0
+
+    def record(self, seconds, error=None):
+        with self._lock:
+            self.latencies.append(seconds)
+            if error is not None:
+                self.errors[error] += 1
+
+    def drop(self):
+        with self._lock:
+            self.dropped += 1
+
+    def snapshot(self, reset=False):
+        """
+        Returns:
+            dict: iterations, errors, error_rate, throughput (iter/s), dropped,
+                errors_by_type y p50/p90/p95/p99/max en segundos
+        """
+        now = self._clock()
+        with self._lock:
+            latencies = sorted(self.latencies)
+            errors = sum(self.errors.values())
+            summary = {
+                'seconds': now - self.started,
+                'iterations': len(latencies),
+                'errors': errors,
+                'error_rate': errors / len(latencies) if latencies else 0.0,
+                'throughput': len(latencies) / (now - self.started) if now > self.started else 0.0,
+                'dropped': self.dropped,
+                'errors_by_type': dict(self.errors),
+                'max': latencies[-1] if latencies else None,
+            }
+            for q in PERCENTILES:
+                summary[f'p{q}'] = percentile(latencies, q)
+            if reset:
+                self._reset(now)
+        return summary
+
+
+def format_window(stats, users):
+    def ms(value):
+        return f"{value * 1000:7.0f}" if value is not None else '      -'
+    return (
+        f"VUs={users:<4} iter/s={stats['throughput']:6.2f} errores={stats['error_rate']:6.1%} "
+        f"p50={ms(stats['p50'])}ms p95={ms(stats['p95'])}ms p99={ms(stats['p99'])}ms "
+        f"descartadas={stats['dropped']}"
+    )
+
+
+class LoadGenerator:
+    """
+    Ejecuta un plan de carga con usuarios virtuales en hilos
+    """
+
+    def __init__(self, iteration, session_factory, stages, arrival_rate=None, think_time=None,
+                 window=5.0, seed=None, max_backlog=None, report=None):
+        """
+        Args:
+            iteration (callable): (sesión, número de VU, número de iteración); lanza si falla
+            session_factory (callable): () -> sesión del VU (se cierra con quit())
+            stages (list): Plan de etapas (ver parse_stages)
+            arrival_rate (float): Iteraciones por segundo (modelo abierto); None = modelo cerrado
+            think_time (callable): Espera entre iteraciones del modelo cerrado (ver parse_think_time)
+            window (float): Segundos por ventana de reporte
+            seed (int): Semilla de las distribuciones
+            max_backlog (int): Llegadas en cola antes de descartar (por defecto 10 por VU)
+            report (callable): (segundos transcurridos, stats, VUs) por ventana (por defecto log)
+        """
+        self.iteration = iteration
+        self.session_factory = session_factory
+        self.stages = stages
+        self.arrival_rate = arrival_rate
+        self.think_time = think_time or parse_think_time('none')
+        self.window_seconds = window
+        self.max_backlog = max_backlog
+        self.report = report or self._log_window
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._arrivals = queue.Queue()
+        self._stop = threading.Event()
+        self._users = {}
+        self._users_lock = threading.Lock()
+        self.window = WindowStats()
+        self.total = WindowStats()
+
+    def _log_window(self, elapsed, stats, users):
+        logger.info(f"[{elapsed:6.1f}s] {format_window(stats, users)}")
+
+    def _random(self, draw):
+        with self._rng_lock:
+            return draw(self._rng)
+
+    def _record(self, seconds, error=None):
+        self.window.record(seconds, error)
+        self.total.record(seconds, error)
+        LOADGEN_ITERATIONS.labels('error' if error else 'success').inc()
+        LOADGEN_LATENCY.observe(seconds)
+
+    def _next_job(self, stop):
+        """
+        Returns:
+            float: Instante programado de la próxima iteración o None si el VU debe parar
+        """
+        if self.arrival_rate is None:
+            return None if stop.is_set() else time.monotonic()
+        while not stop.is_set():
+            try:
+                return self._arrivals.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _run_user(self, number, stop):
+        session = None
+        count = 0
+        try:
+            try:
+                session = self.session_factory()
+            except Exception as e:
+                self._record(0.0, f'session:{type(e).__name__}')
+                logger.error(f"VU {number}: no se pudo crear la sesión: {e}")
+                stop.wait(1.0)
+                return
+            while True:
+                scheduled = self._next_job(stop)
+                if scheduled is None:
+                    return
+                error = None
+                try:
+                    self.iteration(session, number, count)
+                except Exception as e:
+                    error = type(e).__name__
+                    logger.warning(f"VU {number} iteración {count} falló: {e}")
+                self._record(time.monotonic() - scheduled, error)
+                count += 1
+                if self.arrival_rate is None:
+                    stop.wait(self._random(self.think_time))
+        finally:
+            if session is not None:
+                try:
+                    session.quit()
+                except Exception as e:
+                    logger.warning(f"VU {number}: error al cerrar la sesión: {e}")
+            with self._users_lock:
+                if self._users.get(number, (None,))[0] is threading.current_thread():
+                    del self._users[number]
+
+    def _scale(self, target):
+        with self._users_lock:
+            active = sorted(n for n, (_, stop) in self._users.items() if not stop.is_set())
+            for number in active[target:]:
+                self._users[number][1].set()
+            # Los VUs que están terminando conservan su número hasta salir
+            missing = target - len(active)
+            number = 0
+            while missing > 0:
+                if number not in self._users:
+                    stop = threading.Event()
+                    thread = threading.Thread(target=self._run_user, args=(number, stop), name=f'vu-{number}', daemon=True)
+                    self._users[number] = (thread, stop)
+                    thread.start()
+                    missing -= 1
+                number += 1
+            running = sum(1 for _, stop in self._users.values() if not stop.is_set())
+        LOADGEN_USERS.set(running)
+        return running
+
+    def _schedule_arrivals(self, now, next_arrival, users):
+        """
+        Encola las llegadas vencidas (intervalos exponenciales: llegadas de Poisson)
+
+        Returns:
+            float: Instante de la próxima llegada
+        """
+        backlog_limit = self.max_backlog if self.max_backlog is not None else 10 * max(users, 1)
+        while next_arrival <= now:
+            if self._arrivals.qsize() >= backlog_limit:
+                self.window.drop()
+                self.total.drop()
+            else:
+                self._arrivals.put(next_arrival)
+            next_arrival += self._random(lambda rng: rng.expovariate(self.arrival_rate))
+        return next_arrival
+
+    def run(self):
+        """
+        Ejecuta el plan completo
+
+        Returns:
+            dict: Resumen total (ver WindowStats.snapshot) con peak_users
+        """
+        start = time.monotonic()
+        self.window = WindowStats()
+        self.total = WindowStats()
+        next_window = start + self.window_seconds
+        next_arrival = start
+        peak_users = 0
+        users = 0
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                target = target_users(self.stages, now - start)
+                if target is None:
+                    break
+                users = self._scale(target)
+                peak_users = max(peak_users, users)
+                if self.arrival_rate is not None:
+                    next_arrival = self._schedule_arrivals(now, next_arrival, users)
+                if now >= next_window:
+                    self.report(now - start, self.window.snapshot(reset=True), users)
+                    next_window += self.window_seconds
+                self._stop.wait(0.05)
+        finally:
+            self._scale(0)
+            with self._users_lock:
+                threads = [thread for thread, _ in self._users.values()]
+            for thread in threads:
+                thread.join()
+            LOADGEN_USERS.set(0)
+        if self.window.snapshot()['iterations']:
+            self.report(time.monotonic() - start, self.window.snapshot(reset=True), users)
+        summary = self.total.snapshot()
+        summary['peak_users'] = peak_users
+        return summary
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,215 @@
+"""
+Localizadores con autorreparación
+SELECTOR_FALLBACKS (utils/selectors.py) asocia a un selector principal sus
+candidatos alternativos por rango (CSS o XPath). Un selector con alternativas
+se resuelve probando todos sus candidatos en una sola llamada de script por
+sondeo: si el marcado cambió, un candidato alternativo responde en el mismo
+sondeo en lugar de agotar el plazo completo con el selector roto.
+
+El ganador se guarda por huella de página (host + ruta) en LOCATOR_CACHE_PATH,
+así las ejecuciones siguientes lo prueban primero, y cada desplazamiento
+(ganador distinto del selector principal) se reporta una vez por página.
+"""
+import json
+import logging
+import os
+import threading
+
+from utils.clock import get_clock, wait_until
+from utils.metrics import LOCATOR_RESOLUTIONS
+from utils.selectors import SELECTOR_FALLBACKS
+
+logger = logging.getLogger(__name__)
+
+# Primer candidato (en orden) con un elemento en el estado pedido
+RESOLVE_SCRIPT = """
+const [candidates, cached, state] = arguments;
+const fingerprint = location.host + location.pathname;
+const order = candidates.map((_, i) => i);
+const preferred = candidates.indexOf(cached[fingerprint]);
+if (preferred > 0) {
+    order.splice(order.indexOf(preferred), 1);
+    order.unshift(preferred);
+}
+const find = (candidate) => {
+    if (/^[(.]?\\//.test(candidate)) {
+        const found = document.evaluate(candidate, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        return Array.from({length: found.snapshotLength}, (_, i) => found.snapshotItem(i));
+    }
+    try {
+        return Array.from(document.querySelectorAll(candidate));
+    } catch (e) {
+        return [];
+    }
+};
+const ready = (el) => {
+    if (state === 'present') return true;
+    const style = getComputedStyle(el);
+    const visible = el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+    return visible && (state !== 'clickable' || !el.disabled);
+};
+for (const i of order) {
+    const element = find(candidates[i]).find(ready);
+    if (element) return {fingerprint: fingerprint, index: i, element: element};
+}
+return {fingerprint: fingerprint, index: -1, element: null};
+"""
+
+
+def candidates_for(selector):
+    """
+    Returns:
+        list: Selector principal seguido de sus alternativas por rango
+    """
+    return [selector, *SELECTOR_FALLBACKS.get(selector, ())]
+
+
+def is_healable(selector):
+    return selector in SELECTOR_FALLBACKS
+
+
+class LocatorCache:
+    """
+    Ganadores por selector y huella de página, persistidos en JSON
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._drift = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Caché de localizadores ilegible ({path}): {e}")
+
+    def winners(self, selector):
+        """
+        Returns:
+            dict: {huella: selector ganador}
+        """
+        with self._lock:
+            return {fp: entry['winner'] for fp, entry in self._entries.get(selector, {}).items()}
+
+    def record(self, selector, fingerprint, winner):
+        """
+        Registra el candidato que resolvió; reporta el desplazamiento la primera vez
+
+        Returns:
+            bool: True si el ganador no es el selector principal
+        """
+        drifted = winner != selector
+        with self._lock:
+            entry = self._entries.setdefault(selector, {}).get(fingerprint)
+            changed = entry is None or entry['winner'] != winner
+            if changed:
+                self._entries[selector][fingerprint] = {'winner': winner, 'since': get_clock().time()}
+            if drifted:
+                self._drift[(selector, fingerprint)] = winner
+        if changed:
+            if drifted:
+                logger.warning(f"⚠ Selector desplazado en {fingerprint}: '{selector}' -> '{winner}'")
+            elif entry is not None:
+                logger.info(f"✓ Selector '{selector}' vuelve a resolver en {fingerprint}")
+            self._save()
+        return drifted
+
+    def drift(self):
+        """
+        Returns:
+            list: (selector principal, huella, ganador) desplazados en este proceso
+        """
+        with self._lock:
+            return [(selector, fp, winner) for (selector, fp), winner in self._drift.items()]
+
+    def _save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._entries, indent=2, sort_keys=True)
+        tmp_path = f'{self.path}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar la caché de localizadores: {e}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_locator_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LocatorCache(os.getenv('LOCATOR_CACHE_PATH', '.locator_cache.json') or None)
+        return _cache
+
+
+def resolve(driver, selector, state='visible', timeout=10, cache=None):
+    """
+    Espera hasta que algún candidato del selector tenga un elemento en `state`
+
+    Args:
+        driver: WebDriver instance
+        selector (str): Selector principal (clave de SELECTOR_FALLBACKS)
+        state (str): 'visible', 'clickable' o 'present'
+        timeout (float): Segundos de espera
+        cache (LocatorCache): Ganadores (por defecto el del proceso)
+
+    Returns:
+        WebElement: Elemento del candidato ganador
+
+    Raises:
+        TimeoutException: Si ningún candidato resolvió a tiempo
+    """
+    cache = cache or get_locator_cache()
+    candidates = candidates_for(selector)
+    cached = cache.winners(selector)
+
+    def attempt(driver):
+        result = driver.execute_script(RESOLVE_SCRIPT, candidates, cached, state)
+        return result if result and result['index'] >= 0 else False
+
+    try:
+        result = wait_until(
+            driver, attempt, timeout, message=f"ningún candidato de '{selector}' ({len(candidates)}) resolvió"
+        )
+    except Exception:
+        LOCATOR_RESOLUTIONS.labels('missing').inc()
+        raise
+    record_resolution(selector, result['fingerprint'], result['index'], cache)
+    return result['element']
+
+
+def record_resolution(selector, fingerprint, index, cache=None):
+    """
+    Registra qué candidato resolvió en un script propio (p. ej. extracción masiva)
+
+    Args:
+        selector (str): Selector principal
+        fingerprint (str): Huella de la página (location.host + location.pathname)
+        index (int): Posición del ganador en candidates_for(selector)
+
+    Returns:
+        str: Selector ganador
+    """
+    cache = cache or get_locator_cache()
+    winner = candidates_for(selector)[index]
+    drifted = cache.record(selector, fingerprint, winner)
+    LOCATOR_RESOLUTIONS.labels('fallback' if drifted else 'primary').inc()
+    return winner
+
+
+def log_locator_drift():
+    """
+    Registra en el log los selectores que resolvieron con una alternativa
+    """
+    if _cache is None:
+        return
+    for selector, fingerprint, winner in _cache.drift():
+        logger.warning(f"Selector a actualizar en utils/selectors.py: '{selector}' -> '{winner}' ({fingerprint})")
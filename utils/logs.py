@@ -0,0 +1,237 @@
+"""
+Logging estructurado y no bloqueante
+Los hilos de trabajo solo encolan registros (QueueHandler); un hilo de fondo
+(QueueListener) los formatea y escribe. Incluye líneas JSON con contexto de
+ejecución/tarea/worker y limitación de mensajes repetitivos por plantilla.
+
+Configuración por entorno (ver setup_logging):
+    LOG_FORMAT=text|json   LOG_ASYNC=1   LOG_RATE_LIMIT=5   LOG_FILE=rpa.log
+"""
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.timing import current_task
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_log_context = contextvars.ContextVar('rpa_log_context', default={})
+_listener = None
+
+
+def bind_context(**fields):
+    """
+    Agrega campos (run_id, worker, ...) al contexto de log del hilo actual
+
+    Returns:
+        Token para restaurar el contexto anterior con unbind_context
+    """
+    return _log_context.set({**_log_context.get(), **fields})
+
+
+def unbind_context(token):
+    _log_context.reset(token)
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Contexto de log temporal para un bloque
+    """
+    token = bind_context(**fields)
+    try:
+        yield
+    finally:
+        unbind_context(token)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Copia al registro el contexto del hilo que loguea (run_id, worker, tarea activa)
+
+    Debe ejecutarse en el hilo productor: los contextvars no viajan por la cola.
+    """
+
+    def filter(self, record):
+        record.context = dict(_log_context.get())
+        timings = current_task()
+        if timings is not None:
+            record.context.setdefault('task', timings.task_name)
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limita mensajes repetitivos: como máximo `rate` por segundo por plantilla
+
+    La plantilla es record.msg sin formatear (logger.info("Fila %s", x) comparte
+    plantilla entre filas). Los errores nunca se descartan. El siguiente mensaje
+    que pasa lleva en record.suppressed la cantidad descartada.
+    """
+
+    def __init__(self, rate=5.0, burst=None):
+        super().__init__()
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR or self.rate <= 0:
+            return True
+        key = (record.name, record.msg if isinstance(record.msg, str) else id(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            tokens, last, suppressed = self._buckets.get(key, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[key] = (tokens - 1, now, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que no formatea en el hilo productor
+
+    El QueueHandler estándar formatea el mensaje al encolar; aquí msg y args
+    viajan intactos y el formateo ocurre en el hilo del listener. Los
+    argumentos deben ser valores que no cambien después de loguear.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Una línea JSON por registro: ts, level, logger, msg, contexto y excepción
+    """
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        entry.update(getattr(record, 'context', None) or {})
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            entry['suppressed'] = suppressed
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Formato de texto habitual, con el aviso de mensajes suprimidos
+    """
+
+    def format(self, record):
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            text += f' [+{suppressed} similares suprimidos]'
+        return text
+
+
+def configure_logging(level=logging.INFO, fmt='text', use_queue=False, rate_limit=0, filename=None):
+    """
+    Configura el logger raíz
+
+    Args:
+        level (int): Nivel mínimo
+        fmt (str): 'text' o 'json'
+        use_queue (bool): Escribir desde un hilo de fondo (QueueListener)
+        rate_limit (float): Mensajes por segundo por plantilla (0 sin límite)
+        filename (str): Archivo de salida (por defecto stderr)
+
+    Returns:
+        QueueListener: Listener iniciado (None en modo síncrono)
+    """
+    global _listener
+    stop_logging()
+
+    if fmt == 'json':
+        formatter = JsonFormatter()
+    elif fmt == 'text':
+        formatter = TextFormatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+    else:
+        raise ValueError(f"Formato de log desconocido: '{fmt}'")
+
+    output = logging.FileHandler(filename, encoding='utf-8') if filename else logging.StreamHandler()
+    output.setFormatter(formatter)
+
+    handler = output
+    if use_queue:
+        handler = LazyQueueHandler(queue.SimpleQueue())
+        _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+        _listener.start()
+
+    # Los filtros van en el handler del productor: el contexto se toma del hilo
+    # que loguea y los mensajes descartados nunca llegan a la cola
+    if rate_limit:
+        handler.addFilter(RateLimitFilter(rate_limit))
+    handler.addFilter(ContextFilter())
+
+    # Reconfigurar reemplaza solo los handlers instalados aquí (no los de pytest, etc.)
+    handler._rpa_handler = True
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if getattr(existing, '_rpa_handler', False):
+            root.removeHandler(existing)
+            existing.close()
+    root.addHandler(handler)
+    root.setLevel(level)
+    return _listener
+
+
+def stop_logging():
+    """
+    Detiene el listener de fondo vaciando la cola (se registra con atexit)
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def setup_logging(level=logging.INFO):
+    """
+    Configura el sistema de logging
+    
+    Por defecto texto síncrono a stderr. Variables de entorno:
+        LOG_FORMAT: 'text' o 'json' (una línea JSON con run_id/task/worker)
+        LOG_ASYNC: '1' escribe desde un hilo de fondo (QueueListener)
+        LOG_RATE_LIMIT: Mensajes por segundo por plantilla (0 sin límite)
+        LOG_FILE: Archivo de salida en lugar de stderr
+    
+    Returns:
+        QueueListener: Listener de fondo o None en modo síncrono
+    """
+    return configure_logging(
+        level,
+        fmt=os.getenv('LOG_FORMAT', 'text').strip().lower(),
+        use_queue=os.getenv('LOG_ASYNC', '0').strip().lower() in ('1', 'true', 'yes'),
+        rate_limit=float(os.getenv('LOG_RATE_LIMIT') or 0),
+        filename=os.getenv('LOG_FILE') or None
+    )
@@ -0,0 +1,397 @@
+"""
+Métricas de rendimiento: contadores, gauges e histogramas de latencia
+Exportación en formato de texto Prometheus (endpoint HTTP o archivo textfile)
+"""
+import abc
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(abc.ABC):
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children = {}
+
+    def labels(self, *values, **kwargs):
+        """
+        Retorna el hijo asociado a los valores de etiquetas (se cachea)
+        """
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        # Ruta rápida: etiquetas str ya registradas (sin reconstruir la clave)
+        child = self._children.get(values)
+        if child is not None:
+            return child
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: se esperaban etiquetas {self.labelnames}")
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child()
+                    self._children[key] = child
+        return child
+
+    def _default(self):
+        return self.labels()
+
+    def _family_name(self):
+        return self.name
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """
+        Returns:
+            Hijo nuevo (valores de una combinación de etiquetas)
+        """
+
+    @abc.abstractmethod
+    def _collect_child(self, key, child):
+        """
+        Returns:
+            list: Líneas de texto Prometheus del hijo con etiquetas `key`
+        """
+
+    def collect(self):
+        """
+        Returns:
+            list: Líneas en formato de texto Prometheus
+        """
+        family = self._family_name()
+        lines = [
+            f'# HELP {family} {self.documentation}',
+            f'# TYPE {family} {self.kind}',
+        ]
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in sorted(children):
+            lines.extend(self._collect_child(key, child))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def _family_name(self):
+        return f'{self.name}_total'
+
+    def inc(self, amount=1):
+        self._default().inc(amount)
+
+    def _collect_child(self, key, child):
+        return [f'{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(child.value)}']
+
+
+class _GaugeChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default().set(value)
+
+    def inc(self, amount=1):
+        self._default().inc(amount)
+
+    def dec(self, amount=1):
+        self._default().dec(amount)
+
+    def _collect_child(self, key, child):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}']
+
+
+class _HistogramChild:
+    __slots__ = ('upper_bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, upper_bounds):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+    def _collect_child(self, key, child):
+        with child._lock:
+            counts = list(child.counts)
+            total = child.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+        lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class Registry:
+    """
+    Registro de métricas; render() produce el formato de texto Prometheus
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _register(self, cls, name, documentation, labelnames=(), **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"La métrica '{name}' ya existe con otro tipo")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# Métricas de la aplicación
+TASK_RUNS = REGISTRY.counter('rpa_task_runs', 'Ejecuciones de tareas por resultado', ('task', 'status'))
+TASK_DURATION = REGISTRY.histogram(
+    'rpa_task_duration_seconds', 'Duración de las tareas', ('task',),
+    buckets=(1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+)
+WEBDRIVER_COMMANDS = REGISTRY.histogram(
+    'rpa_webdriver_command_seconds', 'Latencia de comandos WebDriver', ('command',)
+)
+WEBDRIVER_ERRORS = REGISTRY.counter('rpa_webdriver_command_errors', 'Comandos WebDriver fallidos', ('command',))
+WAIT_DURATION = REGISTRY.histogram('rpa_wait_seconds', 'Duración de esperas explícitas', ('kind', 'outcome'))
+RETRY_ATTEMPTS = REGISTRY.counter('rpa_retry_attempts', 'Intentos de retry_on_failure', ('outcome',))
+DB_WRITE_DURATION = REGISTRY.histogram('rpa_db_write_seconds', 'Latencia de escrituras en BD', ('backend', 'op'))
+DB_ROWS_WRITTEN = REGISTRY.counter('rpa_db_rows_written', 'Filas escritas en BD', ('backend',))
+DB_CONNECTIONS = REGISTRY.gauge('rpa_db_connections_in_use', 'Conexiones de BD abiertas', ('backend',))
+BROWSERS_ACTIVE = REGISTRY.gauge('rpa_browsers_active', 'Sesiones de navegador activas')
+WORKER_JOBS = REGISTRY.counter('rpa_worker_jobs', 'Trabajos procesados por el worker', ('task', 'status'))
+BROWSER_RECYCLES = REGISTRY.counter('rpa_browser_recycles', 'Reciclajes del navegador del worker', ('reason',))
+BROWSER_RSS_PEAK = REGISTRY.gauge('rpa_browser_rss_peak_bytes', 'RSS pico del navegador en la última tarea', ('task',))
+BROWSER_THREADS_PEAK = REGISTRY.gauge('rpa_browser_threads_peak', 'Hilos pico del navegador en la última tarea', ('task',))
+BROWSER_CPU_SECONDS = REGISTRY.counter('rpa_browser_cpu_seconds', 'CPU consumida por el navegador', ('task',))
+NODE_SESSIONS = REGISTRY.gauge('rpa_webdriver_node_sessions', 'Sesiones activas por nodo WebDriver remoto', ('node',))
+NODE_HEALTHY = REGISTRY.gauge('rpa_webdriver_node_healthy', 'Salud de cada nodo WebDriver remoto (1 sano)', ('node',))
+DRAG_DURATION = REGISTRY.histogram(
+    'rpa_drag_seconds', 'Latencia de drag & drop hasta la confirmación', ('strategy', 'outcome'),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5)
+)
+LOADGEN_ITERATIONS = REGISTRY.counter('rpa_loadgen_iterations', 'Iteraciones de usuarios virtuales', ('outcome',))
+LOADGEN_LATENCY = REGISTRY.histogram(
+    'rpa_loadgen_iteration_seconds', 'Latencia por iteración de usuario virtual',
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+)
+LOADGEN_USERS = REGISTRY.gauge('rpa_loadgen_users', 'Usuarios virtuales activos')
+VISUAL_CHECKS = REGISTRY.counter('rpa_visual_checks', 'Controles visuales por resultado', ('status',))
+RATE_LIMIT_REQUESTS = REGISTRY.counter(
+    'rpa_rate_limit_requests', 'Peticiones pasadas por el limitador por host', ('host', 'outcome')
+)
+RATE_LIMIT_WAIT = REGISTRY.histogram(
+    'rpa_rate_limit_wait_seconds', 'Espera en el limitador antes de cada petición', ('host',),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10)
+)
+LOCATOR_RESOLUTIONS = REGISTRY.counter(
+    'rpa_locator_resolutions', 'Resoluciones de selectores con alternativas por candidato ganador', ('outcome',)
+)
+RATE_LIMIT_SCALE = REGISTRY.gauge('rpa_rate_limit_scale', 'Fracción de la tasa configurada tras ralentizar', ('host',))
+
+
+def instrument_driver(driver):
+    """
+    Envuelve driver.execute para medir cada comando WebDriver
+
+    Args:
+        driver: WebDriver instance
+
+    Returns:
+        WebDriver: El mismo driver instrumentado
+    """
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        child = WEBDRIVER_COMMANDS.labels(driver_command)
+        start = time.perf_counter()
+        try:
+            return original_execute(driver_command, params)
+        except Exception:
+            WEBDRIVER_ERRORS.labels(driver_command).inc()
+            raise
+        finally:
+            child.observe(time.perf_counter() - start)
+
+    driver.execute = execute
+    return driver
+
+
+def write_textfile(path, registry=REGISTRY):
+    """
+    Escribe las métricas en un archivo (formato textfile del node_exporter)
+    La escritura es atómica: archivo temporal + rename
+    """
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.metrics-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(registry.render())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    logger.info(f"Métricas escritas en: {path}")
+
+
+def start_http_server(port, addr=None, registry=REGISTRY):
+    """
+    Expone /metrics en un hilo de fondo (modos de larga duración)
+
+    Args:
+        port (int): Puerto (0 elige uno libre)
+        addr (str): Interfaz de escucha; por defecto METRICS_ADDR o 127.0.0.1
+            (las métricas incluyen tareas y metadatos: exponerlas a la red es opt-in)
+
+    Returns:
+        ThreadingHTTPServer: Servidor iniciado (usar shutdown() para detenerlo)
+    """
+    # http.server arrastra email/html/mimetypes: solo se importa si se expone el endpoint
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    addr = addr or os.getenv('METRICS_ADDR', '').strip() or '127.0.0.1'
+    server = ThreadingHTTPServer((addr, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True)
+    thread.start()
+    logger.info(f"Endpoint de métricas en http://{addr}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,213 @@
+"""
+Lectura de procesos desde /proc (Linux)
+Árbol de procesos de una sesión (geckodriver + Firefox), memoria, CPU e hilos,
+muestreo periódico durante una tarea y sugerencia de cantidad de workers
+"""
+import math
+import os
+import threading
+import time
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def process_tree(pid):
+    """
+    Returns:
+        list: pid y todos sus descendientes (según /proc/<pid>/task/*/children)
+    """
+    pids = [pid]
+    index = 0
+    while index < len(pids):
+        current = pids[index]
+        index += 1
+        task_dir = f'/proc/{current}/task'
+        try:
+            for tid in os.listdir(task_dir):
+                with open(f'{task_dir}/{tid}/children') as f:
+                    pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return pids
+
+
+def process_rss_bytes(pid):
+    """
+    Returns:
+        int: RSS del proceso en bytes (0 si ya no existe)
+    """
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def tree_rss_mb(pid):
+    """
+    Returns:
+        float: RSS total del árbol de procesos en MB
+    """
+    return sum(process_rss_bytes(child) for child in process_tree(pid)) / (1024 * 1024)
+
+
+def driver_pid(driver):
+    """
+    Returns:
+        int: pid del driver (geckodriver o chromedriver) de una sesión local, None si no aplica
+    """
+    service = getattr(driver, 'service', None)
+    process = getattr(service, 'process', None)
+    return getattr(process, 'pid', None)
+
+
+def process_stats(pid):
+    """
+    Lee /proc/<pid>/stat en una sola lectura
+
+    Returns:
+        tuple: (rss_bytes, cpu_seconds, threads) o None si el proceso ya no existe
+    """
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            data = f.read()
+    except OSError:
+        return None
+    # El nombre del proceso va entre paréntesis y puede contener espacios
+    fields = data[data.rfind(')') + 2:].split()
+    try:
+        utime, stime = int(fields[11]), int(fields[12])
+        threads = int(fields[17])
+        rss_pages = int(fields[21])
+    except (IndexError, ValueError):
+        return None
+    return rss_pages * PAGE_SIZE, (utime + stime) / CLOCK_TICKS, threads
+
+
+def memory_available_mb():
+    """
+    Returns:
+        float: MemAvailable de /proc/meminfo en MB (None si no está disponible)
+    """
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class ResourceSampler:
+    """
+    Muestrea RSS, tiempo de CPU e hilos del árbol de procesos de una sesión
+
+    Args:
+        pid_provider (callable): Retorna el pid raíz (geckodriver) o None si
+            el navegador aún no arrancó; se evalúa en cada muestra
+        interval (float): Segundos entre muestras
+    """
+
+    def __init__(self, pid_provider, interval=0.5):
+        self.pid_provider = pid_provider
+        self.interval = interval
+        self.samples = 0
+        self.rss_peak = 0
+        self.rss_total = 0
+        self.threads_peak = 0
+        self.threads_total = 0
+        self._cpu_first = {}
+        self._cpu_last = {}
+        self._started = None
+        self._elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        """
+        Toma una muestra del árbol completo
+        """
+        pid = self.pid_provider()
+        if not pid:
+            return
+        rss = threads = 0
+        for child in process_tree(pid):
+            stats = process_stats(child)
+            if stats is None:
+                continue
+            child_rss, cpu, child_threads = stats
+            rss += child_rss
+            threads += child_threads
+            self._cpu_first.setdefault(child, cpu)
+            self._cpu_last[child] = cpu
+        self.samples += 1
+        self.rss_total += rss
+        self.rss_peak = max(self.rss_peak, rss)
+        self.threads_total += threads
+        self.threads_peak = max(self.threads_peak, threads)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name='resource-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+        self._elapsed = time.perf_counter() - self._started
+        return False
+
+    def summary(self):
+        """
+        Returns:
+            dict: Pico y media de RSS (MB) e hilos, CPU consumida (s) y núcleos medios
+                usados; None si no hubo muestras (la tarea no usó navegador)
+        """
+        if not self.samples:
+            return None
+        cpu_seconds = sum(self._cpu_last[p] - self._cpu_first[p] for p in self._cpu_last)
+        return {
+            'samples': self.samples,
+            'rss_peak_mb': self.rss_peak / (1024 * 1024),
+            'rss_mean_mb': self.rss_total / self.samples / (1024 * 1024),
+            'threads_peak': self.threads_peak,
+            'threads_mean': self.threads_total / self.samples,
+            'cpu_seconds': cpu_seconds,
+            'cpu_cores_mean': cpu_seconds / self._elapsed if self._elapsed > 0 else 0.0,
+        }
+
+
+def recommend_workers(rss_peak_mb, cpu_cores_mean, memory_mb=None, cpus=None,
+                      memory_headroom=0.8, cpu_headroom=0.9, max_workers=None):
+    """
+    Cantidad de workers que caben en la máquina según el perfil de una sesión
+
+    Args:
+        rss_peak_mb (float): RSS pico del navegador por sesión
+        cpu_cores_mean (float): Núcleos medios que consume una sesión
+        memory_mb (float): Memoria disponible (por defecto MemAvailable)
+        cpus (int): Núcleos disponibles (por defecto os.cpu_count())
+
+    Returns:
+        int: Workers recomendados (al menos 1)
+    """
+    memory_mb = memory_mb if memory_mb is not None else (memory_available_mb() or 0)
+    cpus = cpus or os.cpu_count() or 1
+
+    limits = []
+    if rss_peak_mb > 0 and memory_mb > 0:
+        limits.append(math.floor(memory_mb * memory_headroom / rss_peak_mb))
+    # Piso de 0.1 núcleos: sesiones casi ociosas no deben disparar el límite
+    limits.append(math.floor(cpus * cpu_headroom / max(cpu_cores_mean, 0.1)))
+    if max_workers:
+        limits.append(max_workers)
+    return max(1, min(limits))
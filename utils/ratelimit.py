@@ -0,0 +1,294 @@
+"""
+Limitador de peticiones por host
+Cubos de tokens por host (compartido por todos los workers) y por worker,
+coordinados entre hilos y procesos con un archivo SQLite local (BEGIN
+IMMEDIATE, como la cola de trabajos). Cada driver.get y cada descarga del
+nivel HTTP pasan por acquire(); las respuestas de error (429/5xx, timeouts,
+conexiones rechazadas) o lentas reducen la tasa del host para todos los
+procesos, y las respuestas sanas la recuperan poco a poco (AIMD).
+
+Configuración:
+    RATE_LIMIT_HOST_RPS     peticiones/s por host entre todos los workers (vacío = sin límite)
+    RATE_LIMIT_WORKER_RPS   peticiones/s por host de cada worker (proceso)
+    RATE_LIMIT_BURST        ráfaga admitida por cubo
+    RATE_LIMIT_PATH         estado compartido (por defecto .ratelimit.db)
+    RATE_LIMIT_SLOW_SECONDS respuesta considerada lenta
+    RATE_LIMIT_MIN_SCALE    tasa mínima tras ralentizar (fracción de la configurada)
+"""
+import contextlib
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+from utils.metrics import RATE_LIMIT_REQUESTS, RATE_LIMIT_SCALE, RATE_LIMIT_WAIT
+
+logger = logging.getLogger(__name__)
+
+# Estados HTTP que indican que el servidor nos está frenando
+THROTTLE_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class RateLimiter:
+    """
+    Cubos de tokens con estado compartido y ralentización adaptativa
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS hosts (host TEXT PRIMARY KEY, scale REAL NOT NULL, updated REAL NOT NULL)",
+    )
+
+    def __init__(self, path, host_rate=None, worker_rate=None, burst=2, worker_id=None, slow_seconds=8.0,
+                 min_scale=0.1, backoff=0.5, recovery=0.05, clock=time.time, sleep=time.sleep):
+        """
+        Args:
+            path (str): Archivo SQLite compartido (':memory:' = solo este proceso)
+            host_rate (float): Peticiones/s por host entre todos los workers (None = sin límite)
+            worker_rate (float): Peticiones/s por host de este worker (None = sin límite)
+            burst (float): Tokens máximos por cubo
+            worker_id (str): Identidad del worker (por defecto host:pid, como worker.py)
+            slow_seconds (float): Latencia a partir de la cual una respuesta cuenta como lenta
+            min_scale (float): Fracción mínima de la tasa configurada
+            backoff (float): Factor aplicado a la tasa ante un error o una respuesta lenta
+            recovery (float): Fracción recuperada por cada respuesta sana
+            clock (callable): Reloj de pared compartido entre procesos
+            sleep (callable): Espera (sustituible en tests)
+        """
+        self.path = path
+        self.host_rate = host_rate or None
+        self.worker_rate = worker_rate or None
+        self.burst = max(1.0, float(burst))
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.slow_seconds = slow_seconds
+        self.min_scale = min_scale
+        self.backoff = backoff
+        self.recovery = recovery
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        if path != ':memory:':
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = OFF")
+        for statement in self.SCHEMA:
+            self._connection.execute(statement)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def _scale(self, connection, host):
+        row = connection.execute("SELECT scale FROM hosts WHERE host = ?", (host,)).fetchone()
+        return row[0] if row else 1.0
+
+    def _buckets(self, host):
+        buckets = []
+        if self.host_rate:
+            buckets.append((f'host:{host}', self.host_rate))
+        if self.worker_rate:
+            buckets.append((f'worker:{self.worker_id}:{host}', self.worker_rate))
+        return buckets
+
+    def reserve(self, host):
+        """
+        Toma un token de cada cubo del host (reservando a futuro si no hay)
+
+        Returns:
+            float: Segundos a esperar antes de hacer la petición
+        """
+        buckets = self._buckets(host)
+        if not buckets:
+            return 0.0
+        now = self._clock()
+        wait = 0.0
+        with self._transaction() as connection:
+            scale = self._scale(connection, host)
+            for key, rate in buckets:
+                rate *= scale
+                row = connection.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens, updated = row if row else (self.burst, now)
+                tokens = min(self.burst, tokens + max(0.0, now - updated) * rate) - 1
+                if tokens < 0:
+                    wait = max(wait, -tokens / rate)
+                connection.execute(
+                    "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                    (key, tokens, now)
+                )
+        return wait
+
+    def acquire(self, url):
+        """
+        Espera el turno de una petición a `url` (las URLs sin host, p. ej. file://, pasan directo)
+
+        Returns:
+            float: Segundos esperados
+        """
+        host = urlsplit(url).hostname
+        if not host:
+            return 0.0
+        wait = self.reserve(host)
+        if wait > 0:
+            self._sleep(wait)
+        RATE_LIMIT_WAIT.labels(host).observe(wait)
+        with self._stats_lock:
+            stats = self._stats.setdefault(host, {'requests': 0, 'throttled': 0, 'waited': 0.0,
+                                                  'first': self._clock()})
+            stats['requests'] += 1
+            stats['waited'] += wait
+        return wait
+
+    def record(self, url, elapsed, status=None, error=False):
+        """
+        Ajusta la tasa del host según la respuesta
+
+        Args:
+            url (str): URL pedida
+            elapsed (float): Segundos de la petición
+            status (int): Estado HTTP si se conoce
+            error (bool): La petición lanzó una excepción
+
+        Returns:
+            bool: True si la respuesta provocó una ralentización
+        """
+        host = urlsplit(url).hostname
+        if not host:
+            return False
+        throttled = status in THROTTLE_STATUSES or (error and status is None) or elapsed > self.slow_seconds
+        RATE_LIMIT_REQUESTS.labels(host, 'throttled' if throttled else 'ok').inc()
+        if not self._buckets(host):
+            return throttled
+        if not throttled:
+            # Camino común: tasa completa, sin transacción de escritura
+            with self._lock:
+                if self._scale(self._connection, host) >= 1.0:
+                    return False
+        with self._transaction() as connection:
+            scale = self._scale(connection, host)
+            if throttled:
+                new_scale = max(self.min_scale, scale * self.backoff)
+            else:
+                new_scale = min(1.0, scale + self.recovery)
+            if new_scale != scale:
+                connection.execute(
+                    "INSERT INTO hosts (host, scale, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(host) DO UPDATE SET scale = excluded.scale, updated = excluded.updated",
+                    (host, new_scale, self._clock())
+                )
+        RATE_LIMIT_SCALE.labels(host).set(new_scale)
+        if throttled:
+            reason = f"HTTP {status}" if status else ('error' if error else f"{elapsed:.1f}s")
+            logger.warning(f"⚠ Ralentizando {host} ({reason}): tasa al {new_scale:.0%}")
+            with self._stats_lock:
+                if host in self._stats:
+                    self._stats[host]['throttled'] += 1
+        return throttled
+
+    @contextlib.contextmanager
+    def request(self, url):
+        """
+        acquire() + record() alrededor de una petición
+        """
+        self.acquire(url)
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.record(url, time.monotonic() - start, status=getattr(e, 'code', None), error=True)
+            raise
+        self.record(url, time.monotonic() - start)
+
+    def stats(self):
+        """
+        Returns:
+            dict: {host: requests, throttled, waited (s), rate (peticiones/s efectivas)}
+        """
+        now = self._clock()
+        with self._stats_lock:
+            return {
+                host: dict(requests=s['requests'], throttled=s['throttled'], waited=s['waited'],
+                           rate=s['requests'] / (now - s['first']) if now > s['first'] else 0.0)
+                for host, s in self._stats.items()
+            }
+
+    def close(self):
+        self._connection.close()
+
+
+def rate_limit_driver(driver, limiter):
+    """
+    Envuelve driver.execute para que cada navegación (comando 'get') pase por el limitador
+
+    Returns:
+        WebDriver: El mismo driver
+    """
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        if driver_command != 'get':
+            return original_execute(driver_command, params)
+        with limiter.request(params['url']):
+            return original_execute(driver_command, params)
+
+    driver.execute = execute
+    return driver
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def _rate(name):
+    value = os.getenv(name, '').strip()
+    return float(value) if value else None
+
+
+def get_rate_limiter():
+    """
+    Limitador del proceso según RATE_LIMIT_*
+
+    Returns:
+        RateLimiter: Limitador o None si no hay tasas configuradas
+    """
+    global _limiter
+    host_rate, worker_rate = _rate('RATE_LIMIT_HOST_RPS'), _rate('RATE_LIMIT_WORKER_RPS')
+    if not host_rate and not worker_rate:
+        return None
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(
+                os.getenv('RATE_LIMIT_PATH', '.ratelimit.db'),
+                host_rate=host_rate,
+                worker_rate=worker_rate,
+                burst=float(os.getenv('RATE_LIMIT_BURST', '2')),
+                slow_seconds=float(os.getenv('RATE_LIMIT_SLOW_SECONDS', '8')),
+                min_scale=float(os.getenv('RATE_LIMIT_MIN_SCALE', '0.1')),
+            )
+            logger.info(f"Limitador de peticiones: host {host_rate or '-'}/s, worker {worker_rate or '-'}/s")
+        return _limiter
+
+
+def log_rate_limit_stats():
+    """
+    Registra en el log la tasa efectiva y la espera por host (si hay limitador)
+    """
+    if _limiter is None:
+        return
+    for host, stats in _limiter.stats().items():
+        logger.info(
+            f"Limitador {host}: {stats['requests']} peticiones a {stats['rate']:.2f}/s efectivas, "
+            f"espera {stats['waited']:.2f}s, ralentizaciones {stats['throttled']}"
+        )
@@ -0,0 +1,262 @@
+"""
+Nodos WebDriver remotos (Selenium Grid o geckodriver sueltos)
+Coloca cada sesión en el nodo sano menos cargado, lleva la capacidad y la
+salud de cada nodo y reintenta en otro nodo si uno no responde
+
+Configuración: WEBDRIVER_NODES="http://host-a:4444=4,http://host-b:4444=2"
+(URL=capacidad; sin capacidad se asume 1, lo que admite un geckodriver suelto)
+"""
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from selenium import webdriver
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+from utils.metrics import NODE_HEALTHY, NODE_SESSIONS
+
+logger = logging.getLogger(__name__)
+
+
+class NoNodeAvailable(RuntimeError):
+    """
+    Ningún nodo sano con capacidad libre
+    """
+
+
+class Node:
+    """
+    Endpoint WebDriver con su capacidad y estado
+    """
+
+    def __init__(self, url, capacity=1):
+        self.url = url.rstrip('/')
+        self.capacity = capacity
+        self.active = 0
+        self.healthy = True
+        self.failures = 0
+        self.last_check = 0.0
+
+    @property
+    def load(self):
+        return self.active / self.capacity
+
+    @property
+    def has_capacity(self):
+        return self.active < self.capacity
+
+    def __repr__(self):
+        return f'Node({self.url}, {self.active}/{self.capacity}, {"sano" if self.healthy else "caído"})'
+
+
+def parse_nodes(spec):
+    """
+    Args:
+        spec (str): "url[=capacidad],url[=capacidad],..."
+
+    Returns:
+        list: Nodos configurados
+    """
+    nodes = []
+    for item in (part.strip() for part in (spec or '').split(',')):
+        if not item:
+            continue
+        url, _, capacity = item.partition('=')
+        nodes.append(Node(url.strip(), int(capacity) if capacity else 1))
+    return nodes
+
+
+def probe_node(url, timeout=2.0):
+    """
+    Consulta GET /status (W3C)
+
+    Returns:
+        bool: True si el endpoint responde; un geckodriver ocupado responde
+            ready=false pero sigue vivo, así que solo cuenta la respuesta
+    """
+    try:
+        with urllib.request.urlopen(f'{url}/status', timeout=timeout) as response:
+            json.loads(response.read() or b'{}')
+        return True
+    except (OSError, ValueError, urllib.error.URLError):
+        return False
+
+
+def _is_connection_error(error):
+    return isinstance(error, (ConnectionError, Urllib3HTTPError, urllib.error.URLError))
+
+
+class NodePool:
+    """
+    Reparto de sesiones entre nodos remotos
+    """
+
+    def __init__(self, nodes, recheck_interval=30.0, probe=probe_node, session_factory=None):
+        """
+        Args:
+            nodes (list): Nodos (ver parse_nodes)
+            recheck_interval (float): Segundos antes de volver a probar un nodo caído
+            probe (callable): Chequeo de salud (url) -> bool
+            session_factory (callable): (url, options) -> WebDriver (por defecto webdriver.Remote)
+        """
+        if not nodes:
+            raise ValueError("NodePool necesita al menos un nodo")
+        self.nodes = nodes
+        self.recheck_interval = recheck_interval
+        self._probe = probe
+        self._session_factory = session_factory or _remote_session
+        self._lock = threading.Lock()
+        for node in nodes:
+            self._publish(node)
+
+    def _publish(self, node):
+        NODE_SESSIONS.labels(node.url).set(node.active)
+        NODE_HEALTHY.labels(node.url).set(1 if node.healthy else 0)
+
+    def check_health(self, force=False):
+        """
+        Prueba los nodos caídos cuyo último chequeo venció (todos si force)
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                node for node in self.nodes
+                if force or (not node.healthy and now - node.last_check >= self.recheck_interval)
+            ]
+        for node in due:
+            healthy = self._probe(node.url)
+            with self._lock:
+                node.last_check = time.monotonic()
+                if healthy and not node.healthy:
+                    logger.info(f"Nodo recuperado: {node.url}")
+                node.healthy = healthy
+                if healthy:
+                    node.failures = 0
+                self._publish(node)
+
+    def acquire(self, exclude=()):
+        """
+        Reserva un lugar en el nodo sano menos cargado
+
+        Returns:
+            Node: Nodo reservado (liberar con release)
+
+        Raises:
+            NoNodeAvailable: Si no hay nodos sanos con capacidad libre
+        """
+        self.check_health()
+        with self._lock:
+            candidates = [n for n in self.nodes if n.healthy and n.has_capacity and n not in exclude]
+            if not candidates:
+                raise NoNodeAvailable(f"Sin nodos WebDriver disponibles: {self.nodes}")
+            node = min(candidates, key=lambda n: (n.load, n.active))
+            node.active += 1
+            self._publish(node)
+            return node
+
+    def release(self, node):
+        with self._lock:
+            node.active = max(0, node.active - 1)
+            self._publish(node)
+
+    def mark_failed(self, node, error=None):
+        with self._lock:
+            node.failures += 1
+            node.last_check = time.monotonic()
+            if node.healthy:
+                logger.warning(f"Nodo marcado como caído: {node.url} ({error})")
+            node.healthy = False
+            self._publish(node)
+
+    def create_session(self, options):
+        """
+        Crea una sesión remota en el nodo menos cargado, pasando al siguiente si
+        uno no responde
+
+        Returns:
+            WebDriver: Sesión remota; quit() libera el lugar en el nodo
+
+        Raises:
+            NoNodeAvailable: Si ningún nodo pudo crear la sesión
+        """
+        tried = []
+        while True:
+            try:
+                node = self.acquire(exclude=tried)
+            except NoNodeAvailable:
+                if tried:
+                    raise NoNodeAvailable(f"Ningún nodo pudo crear la sesión: {[n.url for n in tried]}")
+                raise
+            tried.append(node)
+            try:
+                driver = self._session_factory(node.url, options)
+            except Exception as e:
+                self.release(node)
+                if _is_connection_error(e):
+                    self.mark_failed(node, e)
+                else:
+                    # Nodo vivo que rechazó la sesión (p. ej. geckodriver ya ocupado)
+                    logger.warning(f"El nodo {node.url} rechazó la sesión: {e}")
+                continue
+            logger.info(f"Sesión remota en {node.url} ({node.active}/{node.capacity})")
+            return self._bind(driver, node)
+
+    def _bind(self, driver, node):
+        """
+        Envuelve execute (un error de conexión marca el nodo como caído) y quit
+        (libera el lugar una sola vez)
+        """
+        original_execute = driver.execute
+        original_quit = driver.quit
+        released = threading.Event()
+
+        def execute(driver_command, params=None):
+            try:
+                return original_execute(driver_command, params)
+            except Exception as e:
+                if _is_connection_error(e):
+                    self.mark_failed(node, e)
+                raise
+
+        def quit_and_release():
+            try:
+                original_quit()
+            finally:
+                if not released.is_set():
+                    released.set()
+                    self.release(node)
+
+        driver.execute = execute
+        driver.quit = quit_and_release
+        driver.node_url = node.url
+        return driver
+
+
+def _remote_session(url, options):
+    return webdriver.Remote(command_executor=url, options=options)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_node_pool(spec=None):
+    """
+    Pool compartido del proceso según WEBDRIVER_NODES
+
+    Returns:
+        NodePool: Pool o None si no hay nodos configurados (sesiones locales)
+    """
+    global _pool
+    spec = spec if spec is not None else os.getenv('WEBDRIVER_NODES', '')
+    if not spec.strip():
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = NodePool(parse_nodes(spec))
+            logger.info(f"Nodos WebDriver remotos: {', '.join(n.url for n in _pool.nodes)}")
+        return _pool
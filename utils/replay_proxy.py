@@ -0,0 +1,372 @@
+"""
+Proxy HTTP local de grabación/reproducción
+Modos:
+    record: reenvía al origen y guarda cada respuesta en disco
+    replay: sirve solo desde disco, sin red (lo no grabado responde 504)
+    auto:   sirve desde disco y graba lo que falte
+
+HTTPS se atiende terminando el túnel CONNECT con un certificado autofirmado
+propio (generado con openssl); Firefox lo acepta con acceptInsecureCerts.
+
+Configuración por entorno: HTTP_CACHE_MODE (off|record|replay|auto),
+HTTP_CACHE_DIR (.http_cache), HTTP_CACHE_IGNORE_PARAMS (parámetros de query
+que no forman parte de la clave, separados por comas)
+"""
+import atexit
+import hashlib
+import http.client
+import json
+import logging
+import os
+import ssl
+import subprocess
+import threading
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+MODES = ('record', 'replay', 'auto')
+
+HTTP_CACHE_REQUESTS = REGISTRY.counter(
+    'rpa_http_cache_requests', 'Peticiones del navegador atendidas por el proxy de caché', ('result',)
+)
+
+# Cabeceras que no se reenvían ni se guardan (RFC 7230, 6.1)
+HOP_BY_HOP = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'proxy-connection',
+    'te', 'trailer', 'transfer-encoding', 'upgrade', 'content-length',
+}
+
+
+class ResponseStore:
+    """
+    Respuestas en disco: <clave>.json (metadatos) + <clave>.body (cuerpo crudo)
+    """
+
+    def __init__(self, directory, ignore_params=()):
+        self.directory = directory
+        self.ignore_params = set(ignore_params)
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, method, url, body=b''):
+        """
+        Returns:
+            str: sha256 de método, URL normalizada y cuerpo de la petición
+        """
+        parts = urllib.parse.urlsplit(url)
+        query = [
+            (name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+            if name not in self.ignore_params
+        ]
+        normalized = urllib.parse.urlunsplit(
+            (parts.scheme, parts.netloc.lower(), parts.path or '/', urllib.parse.urlencode(sorted(query)), '')
+        )
+        digest = hashlib.sha256(f'{method.upper()} {normalized}\n'.encode())
+        digest.update(body or b'')
+        return digest.hexdigest()
+
+    def _path(self, key, ext):
+        return os.path.join(self.directory, key[:2], f'{key}.{ext}')
+
+    def get(self, key):
+        """
+        Returns:
+            tuple: (status, headers, body) o None si no está grabada
+        """
+        try:
+            with open(self._path(key, 'json'), encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(self._path(key, 'body'), 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return meta['status'], [tuple(h) for h in meta['headers']], body
+
+    def put(self, key, method, url, status, headers, body):
+        """
+        Guarda una respuesta; los metadatos se escriben al final para que una
+        entrada a medio escribir nunca se lea como válida
+        """
+        os.makedirs(os.path.dirname(self._path(key, 'json')), exist_ok=True)
+        meta = {'method': method, 'url': url, 'status': status, 'headers': headers}
+        for ext, data, mode in (('body', body, 'wb'), ('json', json.dumps(meta), 'w')):
+            path = self._path(key, ext)
+            with open(path + '.tmp', mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+                f.write(data)
+            os.replace(path + '.tmp', path)
+
+
+def ensure_certificate(cert_dir):
+    """
+    Certificado autofirmado para terminar TLS (se reutiliza si ya existe)
+
+    Returns:
+        tuple: (certfile, keyfile)
+
+    Raises:
+        RuntimeError: Si openssl no está disponible
+    """
+    certfile = os.path.join(cert_dir, 'proxy-cert.pem')
+    keyfile = os.path.join(cert_dir, 'proxy-key.pem')
+    if os.path.exists(certfile) and os.path.exists(keyfile):
+        return certfile, keyfile
+    os.makedirs(cert_dir, exist_ok=True)
+    try:
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '3650',
+             '-subj', '/CN=rpa-replay-proxy', '-keyout', keyfile, '-out', certfile],
+            check=True, capture_output=True, timeout=60
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        raise RuntimeError(f"No se pudo generar el certificado del proxy con openssl: {e}") from e
+    return certfile, keyfile
+
+
+class ReplayProxy:
+    """
+    Proxy de grabación/reproducción en un hilo de fondo
+    """
+
+    def __init__(self, store_dir, mode='replay', host='127.0.0.1', port=0,
+                 ignore_params=(), upstream_timeout=30):
+        if mode not in MODES:
+            raise ValueError(f"Modo de caché HTTP desconocido: '{mode}' (opciones: {', '.join(MODES)})")
+        self.mode = mode
+        self.store = ResponseStore(store_dir, ignore_params)
+        self.host = host
+        self.port = port
+        self.upstream_timeout = upstream_timeout
+        self._server = None
+        self._stats = {'hit': 0, 'miss': 0, 'recorded': 0, 'error': 0}
+        self._lock = threading.Lock()
+
+        certfile, keyfile = ensure_certificate(os.path.join(store_dir, '_tls'))
+        self.tls_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.tls_context.load_cert_chain(certfile, keyfile)
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.port}'
+
+    def start(self):
+        """
+        Returns:
+            ReplayProxy: El proxy iniciado (port queda con el puerto real)
+        """
+        self._server = _ProxyServer((self.host, self.port), _make_handler(self))
+        self.port = self._server.server_address[1]
+        thread = threading.Thread(target=self._server.serve_forever, name='replay-proxy', daemon=True)
+        thread.start()
+        logger.info(f"Proxy de caché HTTP en modo {self.mode}: {self.url} ({self.store.directory})")
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _count(self, result):
+        with self._lock:
+            self._stats[result] += 1
+        HTTP_CACHE_REQUESTS.labels(result).inc()
+
+    def stats(self):
+        """
+        Returns:
+            dict: hit, miss, recorded, error y hit_ratio (aciertos / peticiones)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        total = stats['hit'] + stats['miss'] + stats['recorded'] + stats['error']
+        stats['hit_ratio'] = stats['hit'] / total if total else 0.0
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = dict.fromkeys(self._stats, 0)
+
+    def fetch(self, method, url, headers, body):
+        """
+        Resuelve una petición según el modo
+
+        Returns:
+            tuple: (status, headers, body)
+        """
+        key = self.store.key(method, url, body)
+        if self.mode != 'record':
+            cached = self.store.get(key)
+            if cached is not None:
+                self._count('hit')
+                return cached
+            if self.mode == 'replay':
+                self._count('miss')
+                logger.debug(f"Sin grabación para {method} {url}")
+                return 504, [('Content-Type', 'text/plain')], b'No grabado (modo replay)'
+
+        try:
+            status, response_headers, response_body = self._upstream(method, url, headers, body)
+        except (OSError, http.client.HTTPException) as e:
+            self._count('error')
+            logger.debug(f"Error del origen para {method} {url}: {e}")
+            return 502, [('Content-Type', 'text/plain')], str(e).encode()
+        self.store.put(key, method, url, status, response_headers, response_body)
+        self._count('recorded')
+        return status, response_headers, response_body
+
+    def _upstream(self, method, url, headers, body):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme == 'https':
+            connection = http.client.HTTPSConnection(
+                parts.hostname, parts.port or 443, timeout=self.upstream_timeout,
+                context=ssl.create_default_context()
+            )
+        else:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=self.upstream_timeout)
+        path = urllib.parse.urlunsplit(('', '', parts.path or '/', parts.query, ''))
+        forward = {name: value for name, value in headers.items() if name.lower() not in HOP_BY_HOP}
+        try:
+            connection.request(method, path, body=body or None, headers=forward)
+            response = connection.getresponse()
+            payload = response.read()
+            return response.status, [
+                (name, value) for name, value in response.getheaders() if name.lower() not in HOP_BY_HOP
+            ], payload
+        finally:
+            connection.close()
+
+    def firefox_prefs(self):
+        """
+        Returns:
+            dict: Preferencias de Firefox para usar el proxy en HTTP y HTTPS
+        """
+        return {
+            'network.proxy.type': 1,
+            'network.proxy.http': self.host,
+            'network.proxy.http_port': self.port,
+            'network.proxy.ssl': self.host,
+            'network.proxy.ssl_port': self.port,
+            'network.proxy.share_proxy_settings': True,
+            # Las páginas locales (fixtures) no pasan por el proxy
+            'network.proxy.allow_hijacking_localhost': False,
+        }
+
+    def urllib_opener(self):
+        """
+        Returns:
+            OpenerDirector: Cliente urllib que pasa por el proxy (nivel HTTP de las tareas)
+        """
+        insecure = ssl.create_default_context()
+        insecure.check_hostname = False
+        insecure.verify_mode = ssl.CERT_NONE
+        return urllib.request.build_opener(
+            urllib.request.ProxyHandler({'http': self.url, 'https': self.url}),
+            urllib.request.HTTPSHandler(context=insecure),
+        )
+
+
+class _ProxyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # El navegador corta túneles y conexiones a menudo: no es un error del proxy
+        logger.debug(f"Conexión del proxy interrumpida: {client_address}")
+
+
+def _make_handler(proxy):
+    class ProxyHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        origin = None
+
+        def do_CONNECT(self):
+            host, _, port = self.path.partition(':')
+            port = int(port or 443)
+            self.send_response_only(200, 'Connection Established')
+            self.end_headers()
+            self.wfile.flush()
+            # A partir de aquí las peticiones llegan descifradas por el mismo socket
+            self.connection = proxy.tls_context.wrap_socket(self.connection, server_side=True)
+            self.rfile = self.connection.makefile('rb')
+            self.wfile = self.connection.makefile('wb')
+            self.origin = f'https://{host}' + ('' if port == 443 else f':{port}')
+            self.close_connection = False
+
+        def _relay(self):
+            if self.origin:
+                url = self.origin + self.path
+            elif self.path.startswith(('http://', 'https://')):
+                url = self.path
+            else:
+                self.send_error(400, 'Se esperaba una URL absoluta')
+                return
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+
+            status, headers, payload = proxy.fetch(self.command, url, self.headers, body)
+            self.send_response_only(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(payload)
+
+        do_GET = do_POST = do_HEAD = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _relay
+
+        def log_message(self, format, *args):
+            pass
+
+    return ProxyHandler
+
+
+_active_proxy = None
+_active_lock = threading.Lock()
+
+
+def get_replay_proxy():
+    """
+    Proxy compartido del proceso según HTTP_CACHE_MODE (se inicia en el primer uso)
+
+    Returns:
+        ReplayProxy: Proxy activo o None si la caché está desactivada
+    """
+    global _active_proxy
+    mode = os.getenv('HTTP_CACHE_MODE', 'off').strip().lower()
+    if mode in ('', 'off', '0', 'none'):
+        return None
+    with _active_lock:
+        if _active_proxy is None:
+            ignore = [p.strip() for p in os.getenv('HTTP_CACHE_IGNORE_PARAMS', '').split(',') if p.strip()]
+            _active_proxy = ReplayProxy(
+                os.getenv('HTTP_CACHE_DIR', '.http_cache'), mode=mode, ignore_params=ignore
+            ).start()
+            atexit.register(_active_proxy.stop)
+        return _active_proxy
+
+
+def reset_replay_proxy():
+    """
+    Detiene el proxy compartido; el siguiente get_replay_proxy() relee HTTP_CACHE_MODE
+    """
+    global _active_proxy
+    with _active_lock:
+        if _active_proxy is not None:
+            _active_proxy.stop()
+            _active_proxy = None
+
+
+def log_cache_stats():
+    """
+    Registra en el log la tasa de aciertos del proxy activo (si hay uno)
+    """
+    if _active_proxy is None:
+        return
+    stats = _active_proxy.stats()
+    logger.info(
+        f"Caché HTTP ({_active_proxy.mode}): aciertos {stats['hit']}, sin grabar {stats['miss']}, "
+        f"grabadas {stats['recorded']}, errores {stats['error']} - tasa de aciertos {stats['hit_ratio']:.1%}"
+    )
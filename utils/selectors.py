@@ -56,4 +56,30 @@ DROPPABLE_SELECTORS = {
     'draggable': '#draggable',
     'droppable': '#droppable',
     'droppable_text': '#droppable p'
-}
\ No newline at end of file
+}
+
+# ALTERNATIVAS
+SELECTOR_FALLBACKS = {
+    # IDs autogenerados por react-select: cambian con el orden de montaje
+    FORM_SELECTORS['state_option']: (
+        '#state [id^="react-select-"][id$="-option-0"]',
+        '//div[starts-with(@id, "react-select-")][normalize-space()="NCR"]',
+    ),
+    FORM_SELECTORS['city_option']: (
+        '#city [id^="react-select-"][id$="-option-0"]',
+        '//div[starts-with(@id, "react-select-")][normalize-space()="Delhi"]',
+    ),
+    FORM_SELECTORS['modal_title']: ('.modal-title', '[role="dialog"] .modal-header > div'),
+    FORM_SELECTORS['modal_content']: ('[role="dialog"] table',),
+    FORM_SELECTORS['close_modal']: ('.modal-footer button', '//button[normalize-space()="Close"]'),
+    BUTTON_SELECTORS['dynamic_click']: (
+        '//button[normalize-space()="Click Me"]',
+        'button.btn-primary:not(#doubleClickBtn):not(#rightClickBtn)',
+    ),
+    # Celdas posicionales: mismas columnas por rol ARIA si cambian las clases
+    WEBTABLE_SELECTORS['rows']: ('.rt-tbody [role="rowgroup"]', '[role="grid"] [role="rowgroup"]'),
+    **{
+        WEBTABLE_SELECTORS[field]: (f'[role="gridcell"]:nth-child({column})', f'.rt-td:nth-of-type({column})')
+        for column, field in enumerate(('first_name', 'last_name', 'age', 'email', 'salary', 'department'), 1)
+    },
+}
@@ -0,0 +1,139 @@
+"""
+Multiplexación de pestañas: varias tareas en un solo proceso de navegador
+Cada tarea recibe su propia pestaña y un driver "vista" que, antes de cada
+comando WebDriver, cambia a su pestaña bajo un lock compartido
+"""
+import contextvars
+import copy
+import logging
+import threading
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.switch_to import SwitchTo
+
+from utils.metrics import instrument_driver
+from utils.ratelimit import get_rate_limiter, rate_limit_driver
+
+logger = logging.getLogger(__name__)
+
+
+class TabMultiplexer:
+    """
+    Reparte un WebDriver entre varias pestañas de forma segura
+
+    Los comandos se serializan con un lock (una sesión WebDriver solo atiende
+    un comando a la vez); las tareas se intercalan entre comandos, en sus
+    esperas y sleeps, que ocurren fuera del lock.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._lock = threading.Lock()
+        self._base_execute = type(driver).execute
+        self._active_handle = None
+        self._tabs = []
+
+    def _execute_in_tab(self, tab, handle, driver_command, params=None):
+        with self._lock:
+            if self._active_handle != handle:
+                self._base_execute(self.driver, Command.SWITCH_TO_WINDOW, {'handle': handle})
+                self._active_handle = handle
+            # Ejecutar con la vista como self: los WebElement creados quedan ligados a ella
+            return self._base_execute(tab, driver_command, params)
+
+    def open_tab(self, reuse_current=False):
+        """
+        Abre una pestaña nueva y retorna su driver vista
+
+        Args:
+            reuse_current (bool): Usar la pestaña actual en vez de abrir otra
+
+        Returns:
+            WebDriver: Vista del driver ligada a la pestaña
+        """
+        with self._lock:
+            if reuse_current:
+                handle = self._base_execute(self.driver, Command.W3C_GET_CURRENT_WINDOW_HANDLE)['value']
+            else:
+                handle = self._base_execute(self.driver, Command.NEW_WINDOW, {'type': 'tab'})['value']['handle']
+
+        tab = copy.copy(self.driver)
+        tab.window_handle = handle
+
+        def execute(driver_command, params=None):
+            return self._execute_in_tab(tab, handle, driver_command, params)
+
+        def close_tab():
+            try:
+                tab.execute(Command.CLOSE)
+            finally:
+                with self._lock:
+                    if self._active_handle == handle:
+                        self._active_handle = None
+
+        tab.execute = execute
+        tab.quit = close_tab
+        tab._switch_to = SwitchTo(tab)
+        instrument_driver(tab)
+        # La vista no pasa por el execute envuelto del driver original
+        limiter = get_rate_limiter()
+        if limiter is not None:
+            rate_limit_driver(tab, limiter)
+
+        self._tabs.append(tab)
+        logger.info(f"Pestaña abierta: {handle}")
+        return tab
+
+    def close_all(self, keep_one=True):
+        """
+        Cierra las pestañas abiertas (deja una para que la sesión siga viva)
+        """
+        tabs = self._tabs[1:] if keep_one else self._tabs
+        for tab in tabs:
+            try:
+                tab.quit()
+            except Exception as e:
+                logger.warning(f"No se pudo cerrar la pestaña {tab.window_handle}: {e}")
+        self._tabs = self._tabs[:1] if keep_one else []
+
+
+def run_in_tabs(driver, tasks):
+    """
+    Ejecuta cada tarea en su propia pestaña, en paralelo dentro de un navegador
+
+    Args:
+        driver: WebDriver instance (real, no LazyDriver)
+        tasks (list): Lista de (nombre, callable que recibe el driver de la pestaña)
+
+    Returns:
+        dict: {nombre: resultado} (False si la tarea lanzó una excepción)
+    """
+    multiplexer = TabMultiplexer(driver)
+    # La primera tarea reutiliza la pestaña inicial
+    tabs = [multiplexer.open_tab(reuse_current=(i == 0)) for i in range(len(tasks))]
+    results = {}
+    results_lock = threading.Lock()
+
+    def worker(name, func, tab):
+        try:
+            result = func(tab)
+        except Exception as e:
+            logger.error(f"<<< {name}: ✗ ERROR en pestaña - {e}")
+            result = False
+        with results_lock:
+            results[name] = result
+
+    # Cada hilo hereda el contexto actual (p. ej. el contexto de log de la ejecución)
+    threads = [
+        threading.Thread(
+            target=contextvars.copy_context().run, args=(worker, name, func, tab), name=f'tab-{name}'
+        )
+        for (name, func), tab in zip(tasks, tabs)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    multiplexer.close_all(keep_one=True)
+    return {name: results.get(name, False) for name, _ in tasks}
@@ -0,0 +1,220 @@
+"""
+Extracción por niveles (tiers)
+Primero HTTP + parser HTML, Selenium solo cuando el nivel ligero no alcanza
+"""
+import contextlib
+import json
+import logging
+import threading
+import time
+import urllib.request
+
+from utils.ratelimit import get_rate_limiter
+from utils.replay_proxy import get_replay_proxy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0'
+
+
+class TierStats:
+    """
+    Estadísticas por nivel: intentos, aciertos, fallos y latencia
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers = {}
+
+    def record(self, tier, outcome, elapsed):
+        """
+        Registra el resultado de un nivel
+
+        Args:
+            tier (str): Nombre del nivel
+            outcome (str): 'hit', 'miss' (vacío o inválido) o 'error'
+            elapsed (float): Segundos empleados
+        """
+        with self._lock:
+            stats = self._tiers.setdefault(
+                tier, {'attempts': 0, 'hit': 0, 'miss': 0, 'error': 0, 'latency_total': 0.0}
+            )
+            stats['attempts'] += 1
+            stats[outcome] += 1
+            stats['latency_total'] += elapsed
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {tier: {attempts, hit, miss, error, hit_rate, avg_latency}}
+        """
+        with self._lock:
+            result = {}
+            for tier, stats in self._tiers.items():
+                attempts = stats['attempts']
+                result[tier] = dict(
+                    stats,
+                    hit_rate=stats['hit'] / attempts if attempts else 0.0,
+                    avg_latency=stats['latency_total'] / attempts if attempts else 0.0,
+                )
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._tiers = {}
+
+
+def run_tiers(tiers, validate, stats=None):
+    """
+    Ejecuta los niveles en orden hasta que uno retorne datos válidos
+
+    Args:
+        tiers (list): Lista de tuplas (nombre, callable sin argumentos)
+        validate (callable): Recibe el resultado y retorna True si es válido
+        stats (TierStats): Acumulador de estadísticas (opcional)
+
+    Returns:
+        tuple: (nombre del nivel que resolvió, resultado)
+
+    Raises:
+        Exception: El error del último nivel si ninguno tuvo éxito
+    """
+    last_error = None
+    last_result = None
+
+    for tier_name, tier_func in tiers:
+        start = time.perf_counter()
+        try:
+            result = tier_func()
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            if stats:
+                stats.record(tier_name, 'error', elapsed)
+            logger.warning(f"Nivel '{tier_name}' falló en {elapsed:.3f}s: {e}")
+            last_error = e
+            continue
+
+        elapsed = time.perf_counter() - start
+        if result and validate(result):
+            if stats:
+                stats.record(tier_name, 'hit', elapsed)
+            logger.info(f"✓ Nivel '{tier_name}' resolvió la extracción en {elapsed:.3f}s")
+            return tier_name, result
+
+        if stats:
+            stats.record(tier_name, 'miss', elapsed)
+        logger.info(f"Nivel '{tier_name}' sin datos válidos ({elapsed:.3f}s), probando siguiente")
+        last_result = result
+
+    if last_error is not None and not last_result:
+        raise last_error
+    return None, last_result
+
+
+def fetch_html(url, timeout=10, user_agent=DEFAULT_USER_AGENT):
+    """
+    Descarga una página con un cliente HTTP simple (también acepta file://)
+    Con la caché HTTP activa (HTTP_CACHE_MODE) la petición pasa por el proxy
+    y con RATE_LIMIT_* por el limitador del host
+
+    Returns:
+        str: HTML de la respuesta
+    """
+    request = urllib.request.Request(url, headers={'User-Agent': user_agent})
+    replay_proxy = get_replay_proxy() if url.startswith(('http://', 'https://')) else None
+    opener = replay_proxy.urllib_opener() if replay_proxy else urllib.request.build_opener()
+    limiter = get_rate_limiter()
+    with limiter.request(url) if limiter else contextlib.nullcontext():
+        with opener.open(request, timeout=timeout) as response:
+            charset = response.headers.get_content_charset() or 'utf-8'
+            return response.read().decode(charset, errors='replace')
+
+
+def select_rows_text(html, row_selector, cell_selectors, indices=None):
+    """
+    Extrae el texto de las celdas de cada fila usando selectores CSS
+
+    Args:
+        html (str): HTML de la página
+        row_selector (str): Selector CSS de las filas
+        cell_selectors (dict): {campo: selector CSS relativo a la fila}
+        indices (list): Índices de filas a extraer (todas si es None)
+
+    Returns:
+        list: Lista de diccionarios {campo: texto} (None para celdas ausentes)
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = soup.select(row_selector)
+    if indices is None:
+        indices = range(len(rows))
+
+    extracted = []
+    for index in indices:
+        if index >= len(rows):
+            continue
+        row = rows[index]
+        values = {}
+        for field, selector in cell_selectors.items():
+            cell = row.select_one(selector)
+            values[field] = cell.get_text(strip=True) if cell is not None else None
+        extracted.append(values)
+    return extracted
+
+
+def _normalize_key(key):
+    return str(key).replace('_', '').replace('-', '').lower()
+
+
+def _find_record_lists(node, required):
+    if isinstance(node, list):
+        if node and all(isinstance(item, dict) for item in node):
+            keys = {_normalize_key(k) for k in node[0]}
+            if required <= keys:
+                yield node
+                return
+        for item in node:
+            yield from _find_record_lists(item, required)
+    elif isinstance(node, dict):
+        for value in node.values():
+            yield from _find_record_lists(value, required)
+
+
+def find_json_records(html, fields):
+    """
+    Busca registros en payloads JSON embebidos (<script type="application/json">)
+
+    Las claves se comparan sin guiones ni mayúsculas (firstName == first_name).
+
+    Args:
+        html (str): HTML de la página
+        fields (list): Campos que deben existir en cada registro
+
+    Returns:
+        list: Lista de diccionarios {campo: texto} de la primera lista encontrada
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    wanted = {_normalize_key(f): f for f in fields}
+
+    for script in soup.find_all('script'):
+        script_type = (script.get('type') or '').lower()
+        if 'json' not in script_type and script.get('id') != '__NEXT_DATA__':
+            continue
+        try:
+            payload = json.loads(script.string or '')
+        except ValueError:
+            continue
+
+        for records in _find_record_lists(payload, set(wanted)):
+            result = []
+            for record in records:
+                normalized = {_normalize_key(k): v for k, v in record.items()}
+                result.append({
+                    field: None if normalized.get(key) is None else str(normalized[key]).strip()
+                    for key, field in wanted.items()
+                })
+            return result
+    return []
@@ -0,0 +1,184 @@
+"""
+Presupuestos de tiempo por tarea
+Sin espera implícita en el driver: cada espera explícita toma su plazo del
+presupuesto total de la tarea activa y, si el historial tiene suficientes
+muestras, del p99 aprendido para su selector. Una página rota falla en
+pocos segundos en lugar de agotar 10s por cada elemento ausente. El p99 se
+aprende solo de ejecuciones con el mismo navegador, modo de caché HTTP y
+modo headless (ver set_wait_environment).
+
+Variables de entorno:
+    TASK_BUDGET:        Segundos por tarea (todas); TASK_BUDGET_<TAREA> para una sola
+    WAIT_P99_FACTOR:    Plazo = p99 aprendido x factor (3 por defecto)
+    WAIT_MIN_TIMEOUT:   Plazo mínimo con p99 aprendido (1s por defecto)
+    WAIT_LEARNING:      '0' ignora el historial (plazos fijos dentro del presupuesto)
+"""
+import logging
+import os
+import threading
+
+from selenium.common.exceptions import TimeoutException
+
+from utils.clock import get_clock
+from utils.timing import current_task
+
+logger = logging.getLogger(__name__)
+
+# Presupuesto total por tarea (segundos) si no se define TASK_BUDGET[_<TAREA>]
+DEFAULT_BUDGETS = {
+    'form': 60.0,
+    'webtables': 45.0,
+    'buttons': 30.0,
+    'droppable': 30.0,
+}
+DEFAULT_BUDGET = 60.0
+
+
+class BudgetExceeded(TimeoutException):
+    """
+    La tarea agotó su presupuesto de tiempo
+    """
+
+
+def _env_float(name, default):
+    value = os.getenv(name, '').strip()
+    return float(value) if value else default
+
+
+def task_budget_seconds(task_name):
+    """
+    Returns:
+        float: Presupuesto total de la tarea en segundos
+    """
+    specific = os.getenv(f'TASK_BUDGET_{task_name.upper()}', '').strip()
+    if specific:
+        return float(specific)
+    return _env_float('TASK_BUDGET', DEFAULT_BUDGETS.get(task_name, DEFAULT_BUDGET))
+
+
+_profile = None
+_profile_lock = threading.Lock()
+_environment = None
+
+
+def set_wait_environment(browser=None, http_cache=None, headless=None):
+    """
+    Condiciones de la ejecución actual: el p99 se aprende solo de ejecuciones
+    iguales (None = cualquiera). Descarta el perfil ya cargado.
+    """
+    global _environment, _profile
+    with _profile_lock:
+        _environment = {'browser': browser, 'http_cache': http_cache, 'headless': headless}
+        _profile = None
+
+
+def wait_environment():
+    """
+    Returns:
+        dict: browser, http_cache y headless de la ejecución (por defecto según el entorno)
+    """
+    if _environment is not None:
+        return dict(_environment)
+    return {
+        'browser': os.getenv('BROWSER') or 'firefox',
+        'http_cache': os.getenv('HTTP_CACHE_MODE', 'off'),
+        'headless': None,
+    }
+
+
+def get_wait_profile():
+    """
+    p99 de aparición por selector según el historial (se carga una vez por proceso)
+
+    Returns:
+        dict: {selector: segundos}; vacío sin historial o con WAIT_LEARNING=0
+    """
+    global _profile
+    with _profile_lock:
+        if _profile is None:
+            _profile = {}
+            if os.getenv('WAIT_LEARNING', '1').strip() != '0':
+                try:
+                    from app.history import create_history_store
+                    _profile = create_history_store().wait_latencies(environment=wait_environment())
+                except Exception as e:
+                    logger.warning(f"No se pudieron cargar las latencias de espera: {e}")
+                if _profile:
+                    logger.info(f"Plazos de espera aprendidos para {len(_profile)} selectores")
+        return _profile
+
+
+def reset_wait_profile():
+    global _profile
+    with _profile_lock:
+        _profile = None
+
+
+class TaskBudget:
+    """
+    Presupuesto de tiempo de una tarea, repartido entre sus esperas
+    """
+
+    def __init__(self, task_name, total, latencies=None, factor=None, min_timeout=None, clock=None):
+        """
+        Args:
+            task_name (str): Nombre de la tarea
+            total (float): Segundos disponibles para toda la tarea
+            latencies (dict): {selector: p99 en segundos}
+            factor (float): Margen sobre el p99 (por defecto WAIT_P99_FACTOR)
+            min_timeout (float): Plazo mínimo con p99 aprendido (por defecto WAIT_MIN_TIMEOUT)
+            clock (callable): Reloj monotónico (por defecto el reloj activo, ver utils/clock.py)
+        """
+        self.task_name = task_name
+        self.total = total
+        self.latencies = latencies or {}
+        self.factor = factor if factor is not None else _env_float('WAIT_P99_FACTOR', 3.0)
+        self.min_timeout = min_timeout if min_timeout is not None else _env_float('WAIT_MIN_TIMEOUT', 1.0)
+        self._clock = clock or get_clock().monotonic
+        self.deadline = self._clock() + total
+
+    def remaining(self):
+        return self.deadline - self._clock()
+
+    def timeout_for(self, selector, default=10):
+        """
+        Plazo de una espera: p99 aprendido x factor (o `default`), acotado al
+        tiempo que le queda a la tarea
+
+        Raises:
+            BudgetExceeded: Si la tarea ya no tiene tiempo
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise BudgetExceeded(f"Tarea '{self.task_name}' sin presupuesto ({self.total:.0f}s) antes de esperar: {selector}")
+        learned = self.latencies.get(selector)
+        timeout = default if learned is None else min(default, max(self.min_timeout, learned * self.factor))
+        return min(timeout, remaining)
+
+
+def start_budget(task_name):
+    """
+    Returns:
+        TaskBudget: Presupuesto de la tarea con los plazos aprendidos
+    """
+    return TaskBudget(task_name, task_budget_seconds(task_name), get_wait_profile())
+
+
+def wait_timeout(selector, default=10):
+    """
+    Plazo para esperar `selector` en la tarea activa (`default` fuera de una tarea)
+    """
+    timings = current_task()
+    budget = getattr(timings, 'budget', None)
+    if budget is None:
+        return default
+    return budget.timeout_for(selector, default)
+
+
+def record_wait(selector, seconds, ok):
+    """
+    Registra la latencia de una espera en la tarea activa (alimenta el p99 aprendido)
+    """
+    timings = current_task()
+    if timings is not None:
+        timings.add_wait(selector, seconds, ok)
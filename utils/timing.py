@@ -0,0 +1,92 @@
+"""
+Medición de duración por tarea y por paso
+Los pasos se registran en la tarea activa (contextvars, seguro entre hilos)
+"""
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+
+_current_task = contextvars.ContextVar('rpa_current_task', default=None)
+
+
+class TaskTimings:
+    """
+    Duraciones acumuladas de una tarea y sus pasos
+    """
+
+    def __init__(self, task_name):
+        self.task_name = task_name
+        self.steps = []
+        self.duration = None
+        # Consumo del navegador (ver utils.procfs.ResourceSampler.summary)
+        self.resources = None
+        # Presupuesto de tiempo y esperas por selector (ver utils.timeouts)
+        self.budget = None
+        self.waits = []
+
+    def add_step(self, step_name, seconds, ok=True):
+        self.steps.append({'step': step_name, 'duration': seconds, 'ok': ok})
+
+    def add_wait(self, selector, seconds, ok=True):
+        self.waits.append({'selector': selector, 'duration': seconds, 'ok': ok})
+
+
+def current_task():
+    """
+    Returns:
+        TaskTimings: Tarea activa en este contexto o None
+    """
+    return _current_task.get()
+
+
+@contextmanager
+def task_timer(task_name):
+    """
+    Activa un TaskTimings para la tarea mientras dura el bloque
+
+    Yields:
+        TaskTimings: Acumulador de pasos (duration se completa al salir)
+    """
+    timings = TaskTimings(task_name)
+    token = _current_task.set(timings)
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings.duration = time.perf_counter() - start
+        _current_task.reset(token)
+
+
+@contextmanager
+def step(step_name):
+    """
+    Mide un paso y lo agrega a la tarea activa (no-op si no hay tarea activa)
+    """
+    timings = _current_task.get()
+    start = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        if timings is not None:
+            timings.add_step(step_name, time.perf_counter() - start, ok)
+
+
+def timed_step(step_name=None):
+    """
+    Decorador: mide la función como paso de la tarea activa
+
+    Args:
+        step_name (str): Nombre del paso (por defecto el nombre de la función)
+    """
+    def decorator(func):
+        name = step_name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with step(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
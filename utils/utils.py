@@ -4,15 +4,19 @@ Esperas, validaciones y helpers
 """
 import logging
 import os
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException
+from utils.clock import get_clock, wait_until
+from utils.locators import is_healable, resolve
+from utils.metrics import WAIT_DURATION, RETRY_ATTEMPTS
+from utils.timeouts import record_wait, wait_timeout
+from utils.logs import setup_logging  # noqa: F401 (compatibilidad: vive en utils.logs)
 
 logger = logging.getLogger(__name__)
 
 
-def wait_for_element(driver, selector, by=By.CSS_SELECTOR, timeout=10):
+def wait_for_element(driver, selector, by=By.CSS_SELECTOR, timeout=None):
     """
     Espera explícita hasta que un elemento sea visible
     
@@ -20,33 +24,42 @@ def wait_for_element(driver, selector, by=By.CSS_SELECTOR, timeout=10):
         driver: WebDriver instance
         selector (str): Selector del elemento
         by: Tipo de selector (By.CSS_SELECTOR, By.XPATH, etc.)
-        timeout (int): Tiempo máximo de espera
+        timeout (int): Tiempo máximo de espera (por defecto el plazo del
+            presupuesto de la tarea, ver utils/timeouts.py)
     
     Returns:
         WebElement: Elemento encontrado
     """
-    try:
-        element = WebDriverWait(driver, timeout).until(
-            EC.visibility_of_element_located((by, selector))
-        )
-        return element
-    except TimeoutException:
-        logger.error(f"Timeout esperando elemento: {selector}")
-        raise
+    return _wait(driver, selector, EC.visibility_of_element_located((by, selector)), 'visible', timeout)
 
 
-def wait_for_clickable(driver, selector, by=By.CSS_SELECTOR, timeout=10):
+def wait_for_clickable(driver, selector, by=By.CSS_SELECTOR, timeout=None):
     """
     Espera explícita hasta que un elemento sea clickeable
     """
+    return _wait(driver, selector, EC.element_to_be_clickable((by, selector)), 'clickable', timeout)
+
+
+def _wait(driver, selector, condition, kind, timeout):
+    timeout = wait_timeout(selector) if timeout is None else timeout
+    clock = get_clock()
+    start = clock.monotonic()
     try:
-        element = WebDriverWait(driver, timeout).until(
-            EC.element_to_be_clickable((by, selector))
-        )
-        return element
+        if is_healable(selector):
+            # Todos los candidatos en un script por sondeo (ver utils/locators.py)
+            element = resolve(driver, selector, kind, timeout)
+        else:
+            element = wait_until(driver, condition, timeout)
     except TimeoutException:
-        logger.error(f"Timeout esperando elemento clickeable: {selector}")
+        elapsed = clock.monotonic() - start
+        WAIT_DURATION.labels(kind, 'timeout').observe(elapsed)
+        record_wait(selector, elapsed, ok=False)
+        logger.error(f"Timeout esperando elemento ({kind}, {timeout:.1f}s): {selector}")
         raise
+    elapsed = clock.monotonic() - start
+    WAIT_DURATION.labels(kind, 'ok').observe(elapsed)
+    record_wait(selector, elapsed, ok=True)
+    return element
 
 
 def scroll_to_element(driver, element):
@@ -82,17 +95,6 @@ def create_test_image(filename='test_image.png'):
         return img_path
 
 
-def setup_logging(level=logging.INFO):
-    """
-    Configura el sistema de logging
-    """
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-
-
 def take_screenshot(driver, filename='error_screenshot.png'):
     """
     Toma una captura de pantalla
@@ -108,6 +110,28 @@ def take_screenshot(driver, filename='error_screenshot.png'):
     except Exception as e:
         logger.error(f"Error al tomar screenshot: {e}")
 
+
+def visual_checkpoint(driver, name, element=None, masks=()):
+    """
+    Punto de control visual: compara la captura con su línea base (ver utils.visual)
+    Con VISUAL_MODE=off (por defecto) no captura nada
+    
+    Args:
+        driver: WebDriver instance
+        name (str): Nombre del punto de control
+        element: WebElement a capturar (None = viewport)
+        masks (iterable): Selectores CSS o rectángulos (x, y, ancho, alto) a ignorar
+    
+    Returns:
+        bool: True si coincide con la línea base (o si el control está desactivado)
+    """
+    if os.getenv('VISUAL_MODE', 'off').strip().lower() == 'off':
+        return True
+    from utils.visual import get_visual_store
+    
+    return get_visual_store().check(driver, name, element=element, masks=masks)['ok']
+
+
 def retry_on_failure(func, max_retries=3, delay=2):
     """
     Reintentar función si falla con exponential backoff
@@ -129,18 +153,19 @@ def retry_on_failure(func, max_retries=3, delay=2):
         >>> 
         >>> element = retry_on_failure(fetch_data, max_retries=3, delay=2)
     """
-    import time
-    
     for attempt in range(max_retries):
         try:
-            logger.info(f"Intento {attempt + 1} de {max_retries}")
+            logger.debug("Intento %d de %d", attempt + 1, max_retries)
             result = func()
-            logger.info(f"Éxito en intento {attempt + 1}")
+            RETRY_ATTEMPTS.labels('success').inc()
+            if attempt:
+                logger.info("Éxito en intento %d", attempt + 1)
             return result
         except Exception as e:
+            RETRY_ATTEMPTS.labels('failure').inc()
             if attempt == max_retries - 1:
-                logger.error(f"Falló después de {max_retries} intentos: {e}")
+                logger.error("Falló después de %d intentos: %s", max_retries, e)
                 raise
             wait_time = delay * (attempt + 1)  # Exponential backoff
-            logger.warning(f"Intento {attempt + 1} falló: {e}. Esperando {wait_time}s antes de reintentar...")
-            time.sleep(wait_time)
\ No newline at end of file
+            logger.warning("Intento %d falló: %s. Esperando %ss antes de reintentar...", attempt + 1, e, wait_time)
+            get_clock().sleep(wait_time)
\ No newline at end of file
@@ -0,0 +1,337 @@
+"""
+Puntos de control visuales
+Captura de elemento o viewport en pasos elegidos y comparación contra una
+línea base guardada, con regiones enmascaradas y tolerancias
+
+Comparación en tres niveles, del más barato al más caro:
+    1. Hash exacto de los píxeles (con máscaras): igual a la línea base ->
+       'identical' sin decodificar la línea base ni calcular el diff
+    2. Hash perceptual (pHash 64 bits): distancia > phash_threshold ->
+       'changed' sin diff completo (solo si las máscaras coinciden con las
+       de la línea base; si no, se pasa directamente al diff)
+    3. Diff vectorizado con NumPy: proporción de píxeles cuya diferencia en
+       algún canal supera pixel_tolerance; 'match' si no pasa de max_diff_ratio
+
+Modos (VISUAL_MODE): off (por defecto) | check | update (reemplaza las líneas base)
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+from PIL import Image
+
+from utils.metrics import VISUAL_CHECKS
+
+logger = logging.getLogger(__name__)
+
+MODES = ('off', 'check', 'update')
+
+# Rectángulos de las máscaras en píxeles del screenshot (incluye devicePixelRatio)
+MASK_RECTS_SCRIPT = """
+const [selectors, origin] = arguments;
+const ratio = window.devicePixelRatio || 1;
+const base = origin ? origin.getBoundingClientRect() : {left: 0, top: 0};
+const rects = [];
+for (const selector of selectors) {
+    for (const el of document.querySelectorAll(selector)) {
+        const r = el.getBoundingClientRect();
+        rects.push([(r.left - base.left) * ratio, (r.top - base.top) * ratio, r.width * ratio, r.height * ratio]);
+    }
+}
+return rects;
+"""
+
+_DCT_SIZE = 32
+_DCT_MATRIX = np.cos(
+    np.pi / _DCT_SIZE * (np.arange(_DCT_SIZE)[:, None]) * (np.arange(_DCT_SIZE)[None, :] + 0.5)
+)
+
+
+def decode_png(data):
+    """
+    Returns:
+        np.ndarray: Píxeles RGB (alto, ancho, 3) uint8
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert('RGB'))
+
+
+def load_image(path):
+    with Image.open(path) as image:
+        return np.asarray(image.convert('RGB'))
+
+
+def save_image(pixels, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    Image.fromarray(pixels).save(path, optimize=False)
+
+
+def _clip(rect, width, height):
+    x, y, w, h = rect
+    x0, y0 = max(0, int(x)), max(0, int(y))
+    x1, y1 = min(width, int(np.ceil(x + w))), min(height, int(np.ceil(y + h)))
+    return (x0, y0, x1, y1) if x1 > x0 and y1 > y0 else None
+
+
+def mask_array(shape, rects):
+    """
+    Returns:
+        np.ndarray: bool (alto, ancho), True en los píxeles que se comparan
+    """
+    height, width = shape[:2]
+    keep = np.ones((height, width), dtype=bool)
+    for box in filter(None, (_clip(rect, width, height) for rect in rects)):
+        x0, y0, x1, y1 = box
+        keep[y0:y1, x0:x1] = False
+    return keep
+
+
+def apply_masks(pixels, rects):
+    """
+    Copia con las regiones enmascaradas en negro (por rebanadas, sin recorrer la imagen)
+    """
+    if not rects:
+        return pixels
+    height, width = pixels.shape[:2]
+    masked = pixels.copy()
+    for box in filter(None, (_clip(rect, width, height) for rect in rects)):
+        x0, y0, x1, y1 = box
+        masked[y0:y1, x0:x1] = 0
+    return masked
+
+
+def content_hash(pixels):
+    """
+    Hash exacto de los píxeles (aplicar antes apply_masks)
+    """
+    digest = hashlib.blake2b(np.ascontiguousarray(pixels).data, digest_size=16)
+    digest.update(str(pixels.shape).encode())
+    return digest.hexdigest()
+
+
+def perceptual_hash(pixels):
+    """
+    pHash: DCT 32x32 de la imagen en grises, bits de las 8x8 frecuencias bajas
+    contra su mediana (aplicar antes apply_masks)
+
+    Returns:
+        int: Hash de 64 bits
+    """
+    small = np.asarray(
+        Image.fromarray(pixels).convert('L').resize((_DCT_SIZE, _DCT_SIZE), Image.BILINEAR),
+        dtype=np.float32
+    )
+    low = (_DCT_MATRIX @ small @ _DCT_MATRIX.T)[:8, :8].ravel()
+    bits = low > np.median(low[1:])
+    return int(np.packbits(bits).view('>u8')[0])
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def diff_pixels(actual, baseline, keep=None, pixel_tolerance=8):
+    """
+    Diff vectorizado: |a - b| por canal en uint8 (max - min, sin promover a
+    int16) y el máximo de los tres canales
+
+    Returns:
+        tuple: (np.ndarray bool de píxeles distintos, proporción sobre los píxeles comparados)
+    """
+    delta = np.maximum(actual, baseline)
+    delta -= np.minimum(actual, baseline)
+    channel_max = np.maximum(np.maximum(delta[..., 0], delta[..., 1]), delta[..., 2])
+    changed = channel_max > pixel_tolerance
+    if keep is not None:
+        changed &= keep
+        total = int(np.count_nonzero(keep))
+    else:
+        total = changed.size
+    return changed, (int(np.count_nonzero(changed)) / total if total else 0.0)
+
+
+def diff_overlay(actual, changed):
+    """
+    Imagen de diff: la captura atenuada con los píxeles distintos en rojo
+    """
+    overlay = (actual // 3 + 170).astype(np.uint8)
+    overlay[changed] = (255, 0, 0)
+    return overlay
+
+
+class VisualStore:
+    """
+    Líneas base (PNG + JSON con hashes y máscaras) y resultados de comparación
+    """
+
+    def __init__(self, baseline_dir, output_dir, mode='check', pixel_tolerance=8, max_diff_ratio=0.001,
+                 phash_threshold=12):
+        """
+        Args:
+            baseline_dir (str): Directorio de las líneas base
+            output_dir (str): Capturas y diffs de las comparaciones fallidas
+            mode (str): 'check' o 'update'
+            pixel_tolerance (int): Diferencia máxima por canal (0-255) considerada igual
+            max_diff_ratio (float): Proporción de píxeles distintos tolerada
+            phash_threshold (int): Bits de pHash por encima de los cuales se descarta sin diff
+        """
+        self.baseline_dir = baseline_dir
+        self.output_dir = output_dir
+        self.mode = mode
+        self.pixel_tolerance = pixel_tolerance
+        self.max_diff_ratio = max_diff_ratio
+        self.phash_threshold = phash_threshold
+        self._meta_cache = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, name):
+        base = os.path.join(self.baseline_dir, name)
+        return base + '.png', base + '.json'
+
+    def _meta(self, name):
+        with self._lock:
+            if name not in self._meta_cache:
+                try:
+                    with open(self._paths(name)[1], encoding='utf-8') as f:
+                        self._meta_cache[name] = json.load(f)
+                except (OSError, ValueError):
+                    self._meta_cache[name] = None
+            return self._meta_cache[name]
+
+    def save_baseline(self, name, pixels, rects=()):
+        masked = apply_masks(pixels, rects)
+        meta = {
+            'sha': content_hash(masked),
+            'phash': f'{perceptual_hash(masked):016x}',
+            'width': int(pixels.shape[1]),
+            'height': int(pixels.shape[0]),
+            'masks': [list(map(float, rect)) for rect in rects],
+        }
+        png_path, meta_path = self._paths(name)
+        save_image(pixels, png_path)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        with self._lock:
+            self._meta_cache[name] = meta
+        return meta
+
+    def compare(self, name, pixels, rects=()):
+        """
+        Compara una captura con su línea base (la crea si no existe o en modo update)
+
+        Returns:
+            dict: name, status ('identical', 'match', 'changed', 'size', 'new'),
+                ok, diff_ratio, phash_distance y diff_path
+        """
+        result = {'name': name, 'status': None, 'ok': True, 'diff_ratio': None,
+                  'phash_distance': None, 'diff_path': None}
+        meta = self._meta(name)
+        if meta is None or self.mode == 'update':
+            self.save_baseline(name, pixels, rects)
+            result['status'] = 'new'
+            return self._finish(result)
+
+        if (pixels.shape[1], pixels.shape[0]) != (meta['width'], meta['height']):
+            result.update(status='size', ok=False)
+            self._write_actual(name, pixels)
+            return self._finish(result)
+
+        # Nivel 1: hash exacto, sin tocar la línea base
+        if content_hash(apply_masks(pixels, rects)) == meta['sha']:
+            result.update(status='identical', diff_ratio=0.0, phash_distance=0)
+            return self._finish(result)
+
+        # Las máscaras de ambas capturas se excluyen de las comparaciones siguientes
+        all_rects = list(rects) + [tuple(rect) for rect in meta['masks']]
+
+        # Nivel 2: pHash, descarte sin diff completo. El de la línea base se
+        # calculó con sus máscaras: solo es comparable si coinciden con las actuales
+        if sorted(tuple(map(float, rect)) for rect in rects) == sorted(map(tuple, meta['masks'])):
+            distance = hamming(perceptual_hash(apply_masks(pixels, rects)), int(meta['phash'], 16))
+            result['phash_distance'] = distance
+            if distance > self.phash_threshold:
+                result.update(status='changed', ok=False)
+                self._write_actual(name, pixels)
+                return self._finish(result)
+
+        # Nivel 3: diff por píxel
+        baseline = load_image(self._paths(name)[0])
+        keep = mask_array(pixels.shape, all_rects) if all_rects else None
+        changed, ratio = diff_pixels(pixels, baseline, keep, self.pixel_tolerance)
+        result['diff_ratio'] = ratio
+        if ratio <= self.max_diff_ratio:
+            result['status'] = 'match'
+        else:
+            result.update(status='changed', ok=False)
+            self._write_actual(name, pixels)
+            result['diff_path'] = os.path.join(self.output_dir, f'{name}.diff.png')
+            save_image(diff_overlay(pixels, changed), result['diff_path'])
+        return self._finish(result)
+
+    def _write_actual(self, name, pixels):
+        save_image(pixels, os.path.join(self.output_dir, f'{name}.actual.png'))
+
+    def _finish(self, result):
+        VISUAL_CHECKS.labels(result['status']).inc()
+        if result['ok']:
+            logger.info(f"✓ Control visual '{result['name']}': {result['status']}")
+        else:
+            detail = f"{result['diff_ratio']:.2%} píxeles" if result['diff_ratio'] is not None \
+                else f"pHash a {result['phash_distance']} bits" if result['phash_distance'] is not None else 'tamaño distinto'
+            logger.warning(f"✗ Control visual '{result['name']}': {result['status']} ({detail})")
+        return result
+
+    def check(self, driver, name, element=None, masks=()):
+        """
+        Captura el elemento (o el viewport) y la compara con la línea base
+
+        Args:
+            driver: WebDriver instance
+            name (str): Nombre del punto de control (archivo de la línea base)
+            element: WebElement a capturar (None = viewport)
+            masks (iterable): Selectores CSS o rectángulos (x, y, ancho, alto) a ignorar
+
+        Returns:
+            dict: Ver compare()
+        """
+        png = element.screenshot_as_png if element is not None else driver.get_screenshot_as_png()
+        selectors = [m for m in masks if isinstance(m, str)]
+        rects = [tuple(m) for m in masks if not isinstance(m, str)]
+        if selectors:
+            rects += [tuple(r) for r in driver.execute_script(MASK_RECTS_SCRIPT, selectors, element)]
+        return self.compare(name, decode_png(png), rects)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_visual_store():
+    """
+    Almacén del proceso según VISUAL_MODE, VISUAL_BASELINE_DIR, VISUAL_OUTPUT_DIR,
+    VISUAL_PIXEL_TOLERANCE, VISUAL_MAX_DIFF y VISUAL_PHASH_THRESHOLD
+
+    Returns:
+        VisualStore: Almacén o None con VISUAL_MODE=off
+    """
+    global _store
+    mode = os.getenv('VISUAL_MODE', 'off').strip().lower()
+    if mode not in MODES:
+        raise ValueError(f"VISUAL_MODE desconocido: '{mode}' (opciones: {', '.join(MODES)})")
+    if mode == 'off':
+        return None
+    with _store_lock:
+        if _store is None or _store.mode != mode:
+            _store = VisualStore(
+                os.getenv('VISUAL_BASELINE_DIR', 'visual/baselines'),
+                os.getenv('VISUAL_OUTPUT_DIR', 'visual/output'),
+                mode=mode,
+                pixel_tolerance=int(os.getenv('VISUAL_PIXEL_TOLERANCE', '8')),
+                max_diff_ratio=float(os.getenv('VISUAL_MAX_DIFF', '0.001')),
+                phash_threshold=int(os.getenv('VISUAL_PHASH_THRESHOLD', '12')),
+            )
+        return _store
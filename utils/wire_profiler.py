@@ -0,0 +1,217 @@
+"""
+Perfilador de comandos WebDriver (wire protocol)
+Intercepta RemoteConnection.execute, la capa que envía cada comando HTTP al
+driver, y acumula cantidad y tiempo por comando, por tarea/función que lo
+originó y por selector. Genera un reporte de puntos calientes y un archivo de
+pilas colapsadas compatible con flamegraph.pl / speedscope.
+
+Uso:
+    python main.py --task all --profile-wire              # wire_profile.folded
+    flamegraph.pl wire_profile.folded > wire_profile.svg
+"""
+import collections
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from utils.timing import current_task
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Envoltorios de infraestructura: no aportan a "quién" originó el comando
+SKIPPED_FILES = {
+    os.path.join(ROOT, 'utils', name) for name in ('wire_profiler.py', 'metrics.py', 'tabs.py', 'ratelimit.py')
+}
+# Envoltorios del driver en main.py (create_driver y LazyDriver)
+SKIPPED_FUNCTIONS = {
+    (os.path.join(ROOT, 'main.py'), name) for name in ('quit_and_cleanup', '_get_driver', '__getattr__', 'quit')
+}
+# Un entorno virtual dentro del repo (env/, ver README) no es código del proyecto
+ENV_PREFIXES = tuple(
+    os.path.join(prefix, '') for prefix in {sys.prefix, sys.exec_prefix, sys.base_prefix}
+    if not os.path.join(ROOT, '').startswith(os.path.join(prefix, ''))
+)
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+FIND_COMMANDS = {'findElement', 'findElements', 'findChildElement', 'findChildElements'}
+MAX_TRACKED_ELEMENTS = 100000
+
+
+@functools.lru_cache(maxsize=None)
+def _is_project_file(filename):
+    if not filename.startswith(ROOT) or filename in SKIPPED_FILES or filename.startswith(ENV_PREFIXES):
+        return False
+    parts = filename.split(os.sep)
+    return 'site-packages' not in parts and 'dist-packages' not in parts
+
+
+class _Totals:
+    __slots__ = ('count', 'seconds')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.seconds += seconds
+
+
+class WireProfiler:
+    """
+    Acumula comandos WebDriver mientras está instalado
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._original_execute = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.by_command = collections.defaultdict(_Totals)
+            self.by_function = collections.defaultdict(_Totals)
+            self.by_selector = collections.defaultdict(_Totals)
+            self.by_task = collections.defaultdict(_Totals)
+            self.stacks = collections.defaultdict(_Totals)
+            # id de elemento -> selector con el que se encontró
+            self._element_selectors = {}
+
+    @property
+    def installed(self):
+        return self._original_execute is not None
+
+    def install(self):
+        """
+        Intercepta RemoteConnection.execute (todas las sesiones del proceso)
+        """
+        if self.installed:
+            return self
+        original_execute = RemoteConnection.execute
+        profiler = self
+
+        def execute(connection, command, params):
+            # execute() consume 'id' de params al armar la URL: leerlo antes
+            element_id = params.get('id') if isinstance(params, dict) else None
+            selector = profiler._selector_for(command, params, element_id)
+            start = time.perf_counter()
+            try:
+                response = original_execute(connection, command, params)
+            finally:
+                profiler._record(command, selector, time.perf_counter() - start, sys._getframe(1))
+            if command in FIND_COMMANDS and selector:
+                profiler._remember_elements(response, selector)
+            return response
+
+        self._original_execute = original_execute
+        RemoteConnection.execute = execute
+        logger.info("Perfilador de comandos WebDriver activado")
+        return self
+
+    def uninstall(self):
+        if self.installed:
+            RemoteConnection.execute = self._original_execute
+            self._original_execute = None
+
+    def _selector_for(self, command, params, element_id):
+        if command in FIND_COMMANDS and isinstance(params, dict):
+            return f"{params.get('using')}={params.get('value')}"
+        if element_id is not None:
+            return self._element_selectors.get(element_id)
+        return None
+
+    def _remember_elements(self, response, selector):
+        value = response.get('value') if isinstance(response, dict) else None
+        elements = value if isinstance(value, list) else [value]
+        with self._lock:
+            if len(self._element_selectors) > MAX_TRACKED_ELEMENTS:
+                self._element_selectors.clear()
+            for element in elements:
+                if isinstance(element, dict) and ELEMENT_KEY in element:
+                    self._element_selectors[element[ELEMENT_KEY]] = selector
+
+    @staticmethod
+    def _project_frames(frame):
+        """
+        Returns:
+            list: 'modulo.funcion' de los frames del proyecto, del más externo al más interno
+        """
+        frames = []
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if _is_project_file(filename) and (filename, frame.f_code.co_name) not in SKIPPED_FUNCTIONS:
+                # co_qualname solo existe desde Python 3.11
+                name = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+                frames.append(f"{frame.f_globals.get('__name__', '?')}.{name}")
+            frame = frame.f_back
+        frames.reverse()
+        return frames
+
+    def _record(self, command, selector, seconds, frame):
+        frames = self._project_frames(frame)
+        timings = current_task()
+        task = timings.task_name if timings is not None else '(sin tarea)'
+        function = frames[-1] if frames else '(externo)'
+        stack = ';'.join([task] + frames + [command])
+        with self._lock:
+            self.by_command[command].add(seconds)
+            self.by_function[function].add(seconds)
+            self.by_task[task].add(seconds)
+            self.stacks[stack].add(seconds)
+            if selector:
+                self.by_selector[selector].add(seconds)
+
+    def hot_spots(self, group='command', top=15):
+        """
+        Args:
+            group (str): 'command', 'function', 'selector' o 'task'
+
+        Returns:
+            list: (clave, cantidad, segundos totales) ordenado por tiempo total
+        """
+        table = getattr(self, f'by_{group}')
+        with self._lock:
+            rows = [(key, totals.count, totals.seconds) for key, totals in table.items()]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:top]
+
+    def report(self, top=15):
+        """
+        Returns:
+            str: Reporte de puntos calientes por comando, función, selector y tarea
+        """
+        with self._lock:
+            total_count = sum(t.count for t in self.by_command.values())
+            total_seconds = sum(t.seconds for t in self.by_command.values())
+        lines = [f"Comandos WebDriver: {total_count} en {total_seconds:.2f}s"]
+        titles = {'command': 'comando', 'function': 'función', 'selector': 'selector', 'task': 'tarea'}
+        for group, title in titles.items():
+            rows = self.hot_spots(group, top)
+            if not rows:
+                continue
+            lines.append(f"\n--- Por {title} ---")
+            lines.append(f"{'cant.':>6} {'total ms':>10} {'media ms':>9} {'%':>6}  {title}")
+            for key, count, seconds in rows:
+                share = seconds / total_seconds * 100 if total_seconds else 0.0
+                lines.append(f"{count:>6} {seconds * 1000:>10.1f} {seconds / count * 1000:>9.1f} {share:>5.1f}%  {key}")
+        return '\n'.join(lines)
+
+    def write_folded(self, path):
+        """
+        Escribe pilas colapsadas ('tarea;modulo.funcion;...;comando microsegundos')
+        """
+        with self._lock:
+            stacks = sorted(self.stacks.items())
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, totals in stacks:
+                f.write(f"{stack} {max(1, round(totals.seconds * 1e6))}\n")
+        logger.info(f"Pilas de comandos WebDriver escritas en: {path}")
@@ -0,0 +1,352 @@
+"""
+Worker de larga duración
+Toma trabajos de una cola durable y reutiliza navegador y backend de BD entre
+trabajos; recicla el navegador tras N trabajos o si su RSS supera un umbral.
+Con --workers N (o 'auto') lanza N procesos worker sobre la misma cola
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from main import LazyDriver, create_driver, run_measured_task
+from app.job_queue import JobQueue
+from app.history import create_history_store
+from functions.registry import get_task, task_names
+from utils.logs import bind_context, log_context
+from utils.metrics import WORKER_JOBS, BROWSER_RECYCLES, start_http_server, write_textfile
+from utils.procfs import driver_pid, recommend_workers, tree_rss_mb
+from utils.locators import log_locator_drift
+from utils.ratelimit import log_rate_limit_stats
+from utils.timeouts import set_wait_environment
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """
+    Bucle de trabajo con reciclaje del navegador y apagado ordenado
+    """
+
+    def __init__(self, queue, headless=True, profile_template=None,
+                 max_jobs_per_browser=50, max_rss_mb=1500, idle_sleep=1.0):
+        self.queue = queue
+        self.headless = headless
+        self.profile_template = profile_template
+        self.max_jobs_per_browser = max_jobs_per_browser
+        self.max_rss_mb = max_rss_mb
+        self.idle_sleep = idle_sleep
+        self.host = socket.gethostname()
+        self.worker_id = f'{self.host}:{os.getpid()}'
+
+        self.driver = None
+        self.jobs_on_browser = 0
+        self.stats = {'done': 0, 'warning': 0, 'failed': 0, 'recycles': 0}
+        self._stopping = False
+
+    def install_signal_handlers(self):
+        """
+        SIGTERM/SIGINT: terminar el trabajo actual y salir; una segunda señal fuerza la salida
+        """
+        def handle(signum, frame):
+            if self._stopping:
+                logger.warning("Segunda señal recibida: salida inmediata")
+                raise KeyboardInterrupt
+            logger.info(f"Señal {signal.Signals(signum).name} recibida: se detendrá tras el trabajo actual")
+            self._stopping = True
+
+        signal.signal(signal.SIGTERM, handle)
+        signal.signal(signal.SIGINT, handle)
+
+    def stop(self):
+        self._stopping = True
+
+    def _get_driver(self):
+        if self.driver is None:
+            self.driver = LazyDriver(lambda: create_driver(self.headless, self.profile_template))
+            self.jobs_on_browser = 0
+        return self.driver
+
+    def _browser_rss_mb(self):
+        if self.driver is None or not self.driver.started:
+            return 0.0
+        pid = driver_pid(self.driver.unwrap())
+        return tree_rss_mb(pid) if pid else 0.0
+
+    def recycle_browser(self, reason):
+        """
+        Cierra el navegador; el siguiente trabajo abrirá uno nuevo
+        """
+        if self.driver is None:
+            return
+        if self.driver.started:
+            logger.info(f"Reciclando navegador ({reason}) tras {self.jobs_on_browser} trabajos")
+            BROWSER_RECYCLES.labels(reason).inc()
+            self.stats['recycles'] += 1
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error cerrando el navegador: {e}")
+        self.driver = None
+
+    def _check_recycle(self):
+        if self.driver is None:
+            return
+        if self.jobs_on_browser >= self.max_jobs_per_browser:
+            self.recycle_browser('max_jobs')
+            return
+        rss = self._browser_rss_mb()
+        if self.max_rss_mb and rss > self.max_rss_mb:
+            logger.info(f"RSS del navegador {rss:.0f} MB > {self.max_rss_mb} MB")
+            self.recycle_browser('max_rss')
+
+    def process(self, job):
+        """
+        Ejecuta un trabajo y registra su resultado en la cola
+        """
+        try:
+            spec = get_task(job['task'])
+        except KeyError as e:
+            # Tarea que ya no está registrada: reintentar no la va a encontrar
+            logger.error(f"<<< Trabajo {job['id']}: ✗ ERROR - {e}")
+            self.queue.fail(job['id'], e, max_attempts=0)
+            self.stats['failed'] += 1
+            WORKER_JOBS.labels(job['task'], 'failed').inc()
+            return
+        logger.info(f">>> Trabajo {job['id']}: {spec.label} (intento {job['attempts']})")
+        driver = self._get_driver()
+        try:
+            result = run_measured_task(spec.name, spec.load(), driver)
+        except Exception as e:
+            logger.error(f"<<< Trabajo {job['id']}: ✗ ERROR - {e}")
+            self.queue.fail(job['id'], e)
+            self.stats['failed'] += 1
+            WORKER_JOBS.labels(spec.name, 'failed').inc()
+            # Tras un error el estado del navegador es dudoso
+            self.recycle_browser('error')
+            return
+        finally:
+            self.jobs_on_browser += 1
+
+        self.queue.complete(job['id'])
+        status = 'done' if result else 'warning'
+        self.stats[status] += 1
+        WORKER_JOBS.labels(spec.name, status).inc()
+        logger.info(f"<<< Trabajo {job['id']}: {'✓ COMPLETADO' if result else '⚠ COMPLETADO CON ADVERTENCIAS'}")
+
+    def run(self, max_jobs=None, exit_when_empty=False):
+        """
+        Bucle principal
+
+        Args:
+            max_jobs (int): Terminar tras procesar esta cantidad de trabajos
+            exit_when_empty (bool): Terminar cuando la cola quede vacía
+
+        Returns:
+            dict: Estadísticas (done, warning, failed, recycles, elapsed, jobs_per_hour)
+        """
+        bind_context(worker=self.worker_id)
+        self.queue.requeue_stale(float(os.getenv('JOB_STALE_SECONDS', '3600')))
+        self.queue.requeue_orphaned(self.host, own_id=self.worker_id)
+        started = time.perf_counter()
+        processed = 0
+        logger.info(f"Worker {self.worker_id} iniciado")
+
+        try:
+            while not self._stopping:
+                if max_jobs is not None and processed >= max_jobs:
+                    break
+                job = self.queue.claim(self.worker_id)
+                if job is None:
+                    if exit_when_empty:
+                        break
+                    # Con la cola vacía, recuperar trabajos de workers del host que murieron
+                    self.queue.requeue_orphaned(self.host, own_id=self.worker_id)
+                    time.sleep(self.idle_sleep)
+                    continue
+                with log_context(job=job['id']):
+                    self.process(job)
+                processed += 1
+                self._check_recycle()
+        finally:
+            self.recycle_browser('shutdown')
+
+        elapsed = time.perf_counter() - started
+        self.stats['elapsed'] = elapsed
+        self.stats['jobs_per_hour'] = processed / elapsed * 3600 if elapsed > 0 else 0.0
+        logger.info(
+            f"Worker detenido: {processed} trabajos en {elapsed:.1f}s "
+            f"({self.stats['jobs_per_hour']:.0f} trabajos/hora), "
+            f"fallidos: {self.stats['failed']}, reciclajes: {self.stats['recycles']}"
+        )
+        return self.stats
+
+
+def resolve_worker_count(value, task=None):
+    """
+    Cantidad de procesos worker: un entero o 'auto'
+
+    'auto' usa el perfil de recursos del historial (RSS pico y núcleos medios
+    del navegador por tarea) contra la memoria disponible y los núcleos.
+
+    Returns:
+        int: Cantidad de workers (al menos 1)
+    """
+    if value != 'auto':
+        return max(1, int(value))
+    try:
+        profile = create_history_store().resource_profile(task=task)
+    except Exception as e:
+        logger.warning(f"No se pudo leer el perfil de recursos: {e}")
+        profile = None
+    if profile is None:
+        logger.warning("Sin mediciones de recursos en el historial: se usa 1 worker")
+        return 1
+    count = recommend_workers(profile['rss_peak_mb'], profile['cpu_cores_mean'])
+    logger.info(
+        f"Workers automáticos: {count} (RSS pico {profile['rss_peak_mb']:.0f} MB, "
+        f"{profile['cpu_cores_mean']:.2f} núcleos por sesión, {profile['samples']} muestras)"
+    )
+    return count
+
+
+def _strip_option(argv, option):
+    """
+    Quita '--opcion valor' y '--opcion=valor' de una lista de argumentos
+    """
+    result = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg == option:
+            skip = True
+        elif not arg.startswith(option + '='):
+            result.append(arg)
+    return result
+
+
+def run_pool(count, argv):
+    """
+    Lanza `count` procesos worker con los mismos argumentos y espera a que terminen
+
+    Cada proceso recibe WORKER_INDEX para separar su puerto y archivo de métricas.
+    Los procesos corren en su propia sesión (un Ctrl-C o un SIGTERM al grupo no
+    les llega directamente) y SIGTERM/SIGINT se les reenvía una sola vez: una
+    segunda señal abortaría el trabajo en curso en vez de terminarlo.
+
+    Returns:
+        int: Mayor código de salida de los procesos
+    """
+    child_argv = [sys.executable, os.path.abspath(__file__)] + _strip_option(argv, '--workers')
+    children = [
+        subprocess.Popen(child_argv, env={**os.environ, 'WORKER_INDEX': str(index)}, start_new_session=True)
+        for index in range(count)
+    ]
+    logger.info(f"{count} workers iniciados: {', '.join(str(c.pid) for c in children)}")
+
+    def forward(signum, frame):
+        for child in children:
+            if child.poll() is None:
+                child.send_signal(signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    return max(child.wait() for child in children)
+
+
+def _indexed_path(path, index):
+    root, ext = os.path.splitext(path)
+    return f'{root}-{index}{ext}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Worker RPA con cola durable',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python worker.py enqueue webtables --count 20   # Encolar trabajos
+  python worker.py run --headless                 # Procesar trabajos
+  python worker.py run --headless --workers auto  # Workers según el perfil de recursos
+  python worker.py status                         # Estado de la cola
+        """
+    )
+    parser.add_argument('--queue', default=None, help='Archivo de la cola (JOB_QUEUE_PATH, por defecto jobs.db)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='Encolar trabajos')
+    enqueue_parser.add_argument('task', choices=task_names())
+    enqueue_parser.add_argument('--count', type=int, default=1)
+
+    subparsers.add_parser('status', help='Mostrar el estado de la cola')
+
+    run_parser = subparsers.add_parser('run', help='Procesar trabajos')
+    run_parser.add_argument('--headless', action='store_true')
+    run_parser.add_argument('--profile-template', default=None)
+    run_parser.add_argument('--max-jobs-per-browser', type=int, default=50)
+    run_parser.add_argument('--max-rss-mb', type=float, default=1500)
+    run_parser.add_argument('--max-jobs', type=int, default=None)
+    run_parser.add_argument('--exit-when-empty', action='store_true')
+    run_parser.add_argument('--metrics-port', type=int, default=None)
+    run_parser.add_argument('--metrics-file', default=None)
+    run_parser.add_argument('--workers', default='1',
+                            help="Procesos worker: entero o 'auto' según el perfil de recursos")
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = parser.parse_args(argv)
+    queue = JobQueue(args.queue)
+
+    try:
+        if args.command == 'enqueue':
+            queue.enqueue(args.task, count=args.count)
+            logger.info(f"Encolados {args.count} trabajos '{args.task}'")
+            return 0
+
+        if args.command == 'status':
+            for status, total in sorted(queue.counts().items()):
+                print(f"{status:<10} {total}")
+            return 0
+
+        workers = resolve_worker_count(args.workers)
+        if workers > 1:
+            return run_pool(workers, argv)
+
+        index = os.getenv('WORKER_INDEX')
+        if index is not None:
+            if args.metrics_port:
+                args.metrics_port += int(index)
+            if args.metrics_file:
+                args.metrics_file = _indexed_path(args.metrics_file, index)
+
+        set_wait_environment(browser=os.getenv('BROWSER') or 'firefox',
+                             http_cache=os.getenv('HTTP_CACHE_MODE', 'off'), headless=args.headless)
+        metrics_server = start_http_server(args.metrics_port) if args.metrics_port else None
+        worker = Worker(
+            queue,
+            headless=args.headless,
+            profile_template=args.profile_template,
+            max_jobs_per_browser=args.max_jobs_per_browser,
+            max_rss_mb=args.max_rss_mb,
+        )
+        worker.install_signal_handlers()
+        try:
+            worker.run(max_jobs=args.max_jobs, exit_when_empty=args.exit_when_empty)
+        finally:
+            log_rate_limit_stats()
+            log_locator_drift()
+            if args.metrics_file:
+                write_textfile(args.metrics_file)
+            if metrics_server:
+                metrics_server.shutdown()
+        return 0
+    finally:
+        queue.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())